@@ -3,6 +3,9 @@
 from qcelemental import periodictable as pt
 from automol import dict_
 
+# when on, trusted constructions are checked as thoroughly as `from_data`
+_STATE = {'validate': False}
+
 
 def from_data(atom_symbols, bond_keys, atom_implicit_hydrogen_valences=None,
               atom_stereo_parities=None, bond_orders=None,
@@ -136,3 +139,68 @@ def from_atoms_and_bonds(atoms, bonds):
     bnd_keys = set(bnd_dct.keys())
     assert all(bnd_key <= atm_keys for bnd_key in bnd_keys)
     return (atm_dct, bnd_dct)
+
+
+def from_trusted_atoms_and_bonds(atoms, bonds):
+    """ construct a molecular graph from atom and bond dictionaries that are
+    already known to be valid
+
+    (for graph operations that build their dictionaries from other graphs;
+    the dictionaries are used as they are, without normalizing or checking
+    them, unless validation has been turned on with `enable_validation()`)
+
+    :param atoms: atom dictionary
+    :type atoms: dict
+    :param bonds: bond dictionary
+    :type bonds: dict
+    """
+    if _STATE['validate']:
+        validate(atoms, bonds)
+    return (atoms, bonds)
+
+
+def validate(atoms, bonds):
+    """ assert that atom and bond dictionaries are valid and normalized
+
+    :param atoms: atom dictionary
+    :type atoms: dict
+    :param bonds: bond dictionary
+    :type bonds: dict
+    """
+    assert all(isinstance(atm_val, tuple) and len(atm_val) == 3
+               for atm_val in atoms.values())
+    assert all(isinstance(bnd_val, tuple) and len(bnd_val) == 2
+               for bnd_val in bonds.values())
+    assert all(isinstance(bnd_key, frozenset) for bnd_key in bonds)
+
+    syms, vlcs, pars = zip(*atoms.values()) if atoms else ((), (), ())
+    assert atoms == atoms_from_data(
+        atom_symbols=dict(zip(atoms, syms)),
+        atom_implicit_hydrogen_valences=dict(zip(atoms, vlcs)),
+        atom_stereo_parities=dict(zip(atoms, pars)))
+
+    ords, pars = zip(*bonds.values()) if bonds else ((), ())
+    assert bonds == bonds_from_data(
+        bond_keys=bonds.keys(),
+        bond_orders=dict(zip(bonds, ords)),
+        bond_stereo_parities=dict(zip(bonds, pars)))
+
+    from_atoms_and_bonds(atoms, bonds)
+
+
+def enable_validation():
+    """ check graphs built by trusted constructions (for debugging)
+    """
+    _STATE['validate'] = True
+
+
+def disable_validation():
+    """ stop checking graphs built by trusted constructions (the default)
+    """
+    _STATE['validate'] = False
+
+
+def validation_enabled():
+    """ are graphs built by trusted constructions being checked?
+    """
+    return _STATE['validate']
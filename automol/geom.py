@@ -358,14 +358,15 @@ def rot_permutated_geoms(geo, saddle=False, frm_bnd_key=[], brk_bnd_key=[], form
     """
     gra = graph(geo, remove_stereo=True)
     term_atms = {}
-    all_hyds = []
+    all_hyds = set()
     neighbor_dct = automol.graph.atom_neighbor_keys(gra)
 
     # determine if atom is a part of a double bond
     unsat_atms = automol.graph.unsaturated_atom_keys(gra)
     if not saddle:
-        rad_atms = automol.graph.sing_res_dom_radical_atom_keys(gra)
-        res_rad_atms = automol.graph.resonance_dominant_radical_atom_keys(gra)
+        res_ana = automol.graph.resonance_analysis(gra)
+        rad_atms = res_ana.single_resonance_radical_atom_keys()
+        res_rad_atms = res_ana.radical_atom_keys()
         rad_atms = [atm for atm in rad_atms if atm not in res_rad_atms]
     else:
         rad_atms = []
@@ -373,7 +374,7 @@ def rot_permutated_geoms(geo, saddle=False, frm_bnd_key=[], brk_bnd_key=[], form
     gra = gra[0]
     for atm in gra:
         if gra[atm][0] == 'H':
-            all_hyds.append(atm)
+            all_hyds.add(atm)
     for atm in gra:
         if atm in unsat_atms and atm not in rad_atms:
             pass
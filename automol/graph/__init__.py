@@ -23,6 +23,8 @@ from automol.graph._graph import without_bond_orders
 from automol.graph._graph import without_stereo_parities
 from automol.graph._graph import add_atoms
 from automol.graph._graph import add_bonds
+# batched editing
+from automol.graph._edit import GraphEditor
 
 # graph theory library
 # # atom properties
@@ -37,10 +39,16 @@ from automol.graph._graph import bond_neighborhoods
 from automol.graph._graph import branch
 from automol.graph._graph import branch_atom_keys
 from automol.graph._graph import branch_bond_keys
+from automol.graph._graph import all_branches
 from automol.graph._graph import rings
 from automol.graph._graph import rings_bond_keys
+from automol.graph._graph import atom_ring_memberships
+from automol.graph._graph import bond_ring_memberships
+from automol.graph._graph import atom_smallest_ring_sizes
+from automol.graph._graph import bond_smallest_ring_sizes
 from automol.graph._graph import connected_components
 from automol.graph._graph import connected_components_atom_keys
+from automol.graph._comp import connected_components_batch
 from automol.graph._graph import union
 from automol.graph._graph import subgraph
 from automol.graph._graph import bond_induced_subgraph
@@ -65,6 +73,7 @@ from automol.graph._graph import full_isomorphism
 from automol.graph._graph import backbone_isomorphic
 from automol.graph._graph import backbone_isomorphism
 from automol.graph._graph import backbone_unique
+from automol.graph._graph import backbone_hash
 
 # chemistry library
 # # atom properties
@@ -82,6 +91,9 @@ from automol.graph._graph import possible_spin_multiplicities
 from automol.graph._graph import bond_symmetry_numbers
 
 # resonance graph library
+# # analysis
+from automol.graph._res import ResonanceAnalysis
+from automol.graph._res import resonance_analysis
 # # atom properties
 from automol.graph._res import atom_hybridizations
 from automol.graph._res import resonance_dominant_atom_hybridizations
@@ -100,23 +112,69 @@ from automol.graph._res import dominant_resonances
 from automol.graph._res import dominant_resonance
 from automol.graph._res import rotational_bond_keys
 
+# rotor library
+from automol.graph._rotor import Rotor
+from automol.graph._rotor import rotors
+from automol.graph._rotor import rotors_batch
+
 # stereo graph library
 from automol.graph._stereo import has_stereo
 from automol.graph._stereo import atom_stereo_keys
 from automol.graph._stereo import bond_stereo_keys
 from automol.graph._stereo import stereo_priority_vector
+from automol.graph._stereo import stereo_priority_ranks
 from automol.graph._stereo import stereogenic_atom_keys
 from automol.graph._stereo import stereogenic_bond_keys
 from automol.graph._stereo import stereomers
 from automol.graph._stereo import substereomers
+from automol.graph._stereo import iterate_stereomers
 from automol.graph._stereo import stereo_sorted_atom_neighbor_keys
 from automol.graph._stereo import set_stereo_from_atom_coordinates
+from automol.graph._conf import conformer_stereo_parities
 from automol.graph._stereo import heuristic_geometry
 from automol.graph._stereo import atom_stereo_coordinates
-from automol.graph._stereo import atom_longest_chains
+from automol.graph._chain import atom_longest_chains
+
+# distance geometry embedding
+from automol.graph._embed import distance_bounds_matrices
+from automol.graph._embed import embed_atom_coordinates
+
+# canonical hashing
+from automol.graph._canon import atom_classes
+from automol.graph._canon import canonical_hash
+
+# symmetry
+from automol.graph._symm import automorphism_generators
+from automol.graph._symm import automorphism_group_order
+from automol.graph._symm import atom_orbits
+from automol.graph._symm import bond_orbits
+from automol.graph._symm import symmetry_unique_atom_keys
+from automol.graph._symm import symmetry_unique_bond_keys
+
+# substructure search
+from automol.graph._substructure import FUNCTIONAL_GROUPS
+from automol.graph._substructure import pattern
+from automol.graph._substructure import substructure_matches
+from automol.graph._substructure import has_substructure
+from automol.graph._substructure import functional_groups
+from automol.graph._substructure import substructure_matches_batch
+
+# binary serialization
+from automol.graph._binary import dumps
+from automol.graph._binary import loads
+from automol.graph._binary import dump_file
+from automol.graph._binary import GraphFile
+
+# graph property cache
+from automol.graph._cache import enable_cache
+from automol.graph._cache import disable_cache
+from automol.graph._cache import clear_cache
+from automol.graph._cache import cache_enabled
+from automol.graph._cache import cache_info
 
 # submodules
 from automol.graph import trans
+from automol.graph import array
 
 # constructors
 import automol.create.graph
@@ -200,6 +258,8 @@ __all__ = [
     'without_stereo_parities',
     'add_atoms',
     'add_bonds',
+    # batched editing
+    'GraphEditor',
 
     # graph theory library
     # # atom properties
@@ -214,10 +274,16 @@ __all__ = [
     'branch',
     'branch_atom_keys',
     'branch_bond_keys',
+    'all_branches',
     'rings',
     'rings_bond_keys',
+    'atom_ring_memberships',
+    'bond_ring_memberships',
+    'atom_smallest_ring_sizes',
+    'bond_smallest_ring_sizes',
     'connected_components',
     'connected_components_atom_keys',
+    'connected_components_batch',
     'union',
     'subgraph',
     'bond_induced_subgraph',
@@ -242,6 +308,7 @@ __all__ = [
     'backbone_isomorphic',
     'backbone_isomorphism',
     'backbone_unique',
+    'backbone_hash',
 
     # chemistry library
     # # atom properties
@@ -256,6 +323,9 @@ __all__ = [
     'bond_symmetry_numbers',
 
     # resonance library
+    # # analysis
+    'ResonanceAnalysis',
+    'resonance_analysis',
     # # atom properties
     'atom_hybridizations',
     'resonance_dominant_atom_hybridizations',
@@ -274,25 +344,71 @@ __all__ = [
     'dominant_resonance',
     'rotational_bond_keys',
 
+    # rotor library
+    'Rotor',
+    'rotors',
+    'rotors_batch',
+
     # stereo graph library
     'has_stereo',
     'atom_stereo_keys',
     'bond_stereo_keys',
     'stereo_priority_vector',
+    'stereo_priority_ranks',
     'stereogenic_atom_keys',
     'stereogenic_bond_keys',
     'stereomers',
     'substereomers',
+    'iterate_stereomers',
     'stereo_sorted_atom_neighbor_keys',
     'set_stereo_from_atom_coordinates',
+    'conformer_stereo_parities',
     'heuristic_geometry',
     'atom_stereo_coordinates',
     'atom_longest_chains',
 
+    # distance geometry embedding
+    'distance_bounds_matrices',
+    'embed_atom_coordinates',
+
+    # canonical hashing
+    'atom_classes',
+    'canonical_hash',
+
+    # symmetry
+    'automorphism_generators',
+    'automorphism_group_order',
+    'atom_orbits',
+    'bond_orbits',
+    'symmetry_unique_atom_keys',
+    'symmetry_unique_bond_keys',
+
+    # substructure search
+    'FUNCTIONAL_GROUPS',
+    'pattern',
+    'substructure_matches',
+    'has_substructure',
+    'functional_groups',
+    'substructure_matches_batch',
+
+    # binary serialization
+    'dumps',
+    'loads',
+    'dump_file',
+    'GraphFile',
+
+    # graph property cache
+    'enable_cache',
+    'disable_cache',
+    'clear_cache',
+    'cache_enabled',
+    'cache_info',
+
     # conversions,
     'inchi',
     'formula',
 
     # submodules
     'trans',
+    'array',
 ]
@@ -0,0 +1,213 @@
+""" compact binary serialization of molecular graphs
+
+record format (little-endian):
+    header: magic (4 bytes), atom count (uint32), bond count (uint32)
+    atom keys (int64), bond atom index pairs (int32, 2 per bond),
+    atomic numbers (uint8), implicit hydrogen valences (uint8),
+    atom stereo parities (int8), bond orders (int8),
+    bond stereo parities (int8)
+
+    atoms are stored in order of their keys and bonds refer to them by index,
+    as for `graph.array`; stereo parities are stored as integer codes (-1 for
+    None, 0 for False, 1 for True)
+
+file format:
+    header: magic (4 bytes), graph count (uint64), table offset (uint64)
+    the records, back to back, followed by a table of record offsets (uint64,
+    one more than the number of graphs, so that record `idx` spans
+    `offsets[idx]:offsets[idx+1]`)
+
+    the table comes last so that graphs can be written as they come; files
+    are read through a memory map, so reading one graph only touches its
+    own record
+"""
+import mmap
+import struct
+import numpy
+from qcelemental import periodictable as pt
+from automol.graph.array import SYMBOLS as _SYMBOLS
+from automol.graph.array import ATOMIC_NUMBER_DCT as _ATOMIC_NUMBER_DCT
+import automol.create.graph as _create
+
+_RECORD_MAGIC = b'AGR1'
+_FILE_MAGIC = b'AGF1'
+_RECORD_HEADER = struct.Struct('<4sII')
+_FILE_HEADER = struct.Struct('<4sQQ')
+
+_KEY_DTYPE = numpy.dtype('<i8')
+_IDX_DTYPE = numpy.dtype('<i4')
+_NUM_DTYPE = numpy.dtype('u1')
+_VLC_DTYPE = numpy.dtype('u1')
+_ORD_DTYPE = numpy.dtype('i1')
+_PAR_DTYPE = numpy.dtype('i1')
+_PTR_DTYPE = numpy.dtype('<u8')
+
+_PAR_CODE_DCT = {None: -1, False: 0, True: 1}
+_PAR_VAL_DCT = {-1: None, 0: False, 1: True}
+
+
+def dumps(xgr):
+    """ serialize a molecular graph to a compact binary record
+
+    :rtype: bytes
+    """
+    atm_dct, bnd_dct = xgr
+    atm_keys = sorted(atm_dct)
+    atm_idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+    atm_vals = [atm_dct[atm_key] for atm_key in atm_keys]
+    bnd_keys = list(bnd_dct)
+    bnd_vals = [bnd_dct[bnd_key] for bnd_key in bnd_keys]
+
+    natms = len(atm_keys)
+    nbnds = len(bnd_keys)
+    arrs = (
+        _array(atm_keys, _KEY_DTYPE),
+        _array([atm_idx_dct[atm_key]
+                for bnd_key in bnd_keys for atm_key in sorted(bnd_key)],
+               _IDX_DTYPE),
+        _array([_atomic_number(sym) for sym, _, _ in atm_vals], _NUM_DTYPE),
+        _array([vlc for _, vlc, _ in atm_vals], _VLC_DTYPE),
+        _array([_PAR_CODE_DCT[par] for _, _, par in atm_vals], _PAR_DTYPE),
+        _array([bnd_ord for bnd_ord, _ in bnd_vals], _ORD_DTYPE),
+        _array([_PAR_CODE_DCT[par] for _, par in bnd_vals], _PAR_DTYPE))
+    return (_RECORD_HEADER.pack(_RECORD_MAGIC, natms, nbnds) +
+            b''.join(arr.tobytes() for arr in arrs))
+
+
+def loads(bts):
+    """ deserialize a molecular graph from a binary record
+
+    :param bts: a record written by `dumps`
+    :type bts: bytes (or any buffer)
+    """
+    return _load_record(bts, 0)
+
+
+def dump_file(xgrs, file_path):
+    """ write molecular graphs to a binary file, for random access with
+    `GraphFile`
+
+    :param xgrs: molecular graphs (any iterable; they are written as they
+        come)
+    :param file_path: path to the file
+    :type file_path: str
+    :returns: the number of graphs written
+    :rtype: int
+    """
+    with open(file_path, 'wb') as fobj:
+        fobj.write(_FILE_HEADER.pack(_FILE_MAGIC, 0, 0))
+        ptrs = [_FILE_HEADER.size]
+        for xgr in xgrs:
+            fobj.write(dumps(xgr))
+            ptrs.append(fobj.tell())
+
+        ngrs = len(ptrs) - 1
+        fobj.write(_array(ptrs, _PTR_DTYPE).tobytes())
+        fobj.seek(0)
+        fobj.write(_FILE_HEADER.pack(_FILE_MAGIC, ngrs, ptrs[-1]))
+    return ngrs
+
+
+class GraphFile():
+    """ random access to the molecular graphs in a binary file
+
+    the file is memory-mapped, so indexing it only reads the record for that
+    graph
+
+    usage:
+        with GraphFile(file_path) as gfl:
+            xgr = gfl[73112]
+    """
+
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as fobj:
+            self._buf = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, ngrs, tbl_ptr = _FILE_HEADER.unpack_from(self._buf, 0)
+        assert magic == _FILE_MAGIC, (
+            "{} is not a molecular graph file".format(file_path))
+        self._ptrs = numpy.frombuffer(self._buf, dtype=_PTR_DTYPE,
+                                      count=ngrs+1, offset=tbl_ptr)
+
+    def __len__(self):
+        return len(self._ptrs) - 1
+
+    def __getitem__(self, idx):
+        ngrs = len(self)
+        if idx < 0:
+            idx += ngrs
+        if not 0 <= idx < ngrs:
+            raise IndexError("graph index out of range")
+        return _load_record(self._buf, int(self._ptrs[idx]))
+
+    def __iter__(self):
+        for ptr in self._ptrs[:-1].tolist():
+            yield _load_record(self._buf, ptr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ close the memory map
+        """
+        # drop the view of the table first, since it holds on to the map
+        self._ptrs = None
+        self._buf.close()
+
+
+def _load_record(buf, ptr):
+    """ read the graph record starting at this offset in a buffer
+    """
+    magic, natms, nbnds = _RECORD_HEADER.unpack_from(buf, ptr)
+    assert magic == _RECORD_MAGIC, "not a molecular graph record"
+    ptr += _RECORD_HEADER.size
+
+    vals = struct.unpack_from(
+        '<{0}q{1}i{0}B{0}B{0}b{2}b{2}b'.format(natms, 2 * nbnds, nbnds),
+        buf, ptr)
+    cnts = (natms, 2 * nbnds, natms, natms, natms, nbnds, nbnds)
+    arrs = []
+    for cnt in cnts:
+        arrs.append(vals[:cnt])
+        vals = vals[cnt:]
+    (atm_keys, bnd_idxs, atm_nums, atm_vlcs, atm_pars, bnd_ords,
+     bnd_pars) = arrs
+
+    atm_dct = dict(zip(atm_keys, zip(
+        map(_SYMBOLS.__getitem__, atm_nums), atm_vlcs,
+        map(_PAR_VAL_DCT.__getitem__, atm_pars))))
+    bnd_keys = list(map(frozenset, zip(
+        map(atm_keys.__getitem__, bnd_idxs[0::2]),
+        map(atm_keys.__getitem__, bnd_idxs[1::2]))))
+    bnd_dct = dict(zip(bnd_keys, zip(
+        bnd_ords, map(_PAR_VAL_DCT.__getitem__, bnd_pars))))
+    return _create.from_trusted_atoms_and_bonds(atm_dct, bnd_dct)
+
+
+def _atomic_number(sym):
+    """ the atomic number for a symbol, checking that it loads back as the
+    same symbol (isotope symbols, for example, would come back as their
+    element)
+    """
+    num = (_ATOMIC_NUMBER_DCT[sym] if sym in _ATOMIC_NUMBER_DCT else
+           pt.to_Z(sym))
+    assert _SYMBOLS[num] == sym, (
+        "{} can't be stored in binary graph records".format(sym))
+    return num
+
+
+def _array(vals, dtype):
+    """ a packed array, checking that the values are integers that fit the
+    field
+    """
+    vals = list(vals)
+    arr = numpy.array(vals, dtype=numpy.int64)
+    assert numpy.array_equal(arr, numpy.array(vals)), (
+        "non-integer values can't be stored in binary graph records")
+    info = numpy.iinfo(dtype)
+    assert numpy.all((arr >= info.min) & (arr <= info.max)), (
+        "{} values out of range for binary graph records".format(dtype))
+    return arr.astype(dtype)
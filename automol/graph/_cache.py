@@ -0,0 +1,121 @@
+""" opt-in memoization of graph-derived properties
+
+graphs are immutable values, so a property derived from a graph can be
+cached by the graph's contents; the cache is bounded (least-recently-used
+entries are evicted first) and is turned off by default
+"""
+import collections
+import functools
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_CACHE = collections.OrderedDict()
+_STATE = {'enabled': False, 'maxsize': 1024, 'hits': 0, 'misses': 0}
+
+
+def enable_cache(maxsize=1024):
+    """ turn on the graph property cache
+
+    (calling this again with a different size resizes the cache)
+
+    :param maxsize: the maximum number of cached values
+    :type maxsize: int
+    """
+    assert maxsize > 0
+    _STATE['enabled'] = True
+    _STATE['maxsize'] = int(maxsize)
+    _evict()
+
+
+def disable_cache():
+    """ turn off the graph property cache and empty it
+    """
+    _STATE['enabled'] = False
+    clear_cache()
+
+
+def clear_cache():
+    """ empty the graph property cache and reset its statistics
+    """
+    _CACHE.clear()
+    _STATE['hits'] = 0
+    _STATE['misses'] = 0
+
+
+def cache_enabled():
+    """ is the graph property cache turned on?
+    """
+    return _STATE['enabled']
+
+
+def cache_info():
+    """ hit/miss statistics for the graph property cache
+    """
+    return CacheInfo(hits=_STATE['hits'], misses=_STATE['misses'],
+                     maxsize=_STATE['maxsize'], currsize=len(_CACHE))
+
+
+def graph_key(xgr):
+    """ a hashable key identifying the contents of a graph
+
+    (two graphs have equal keys if and only if they are equal)
+    """
+    atm_dct, bnd_dct = xgr
+    return (frozenset(atm_dct.items()), frozenset(bnd_dct.items()))
+
+
+def connectivity_key(xgr):
+    """ a hashable key identifying the connectivity of a graph
+
+    (atom and bond keys only, ignoring symbols, hydrogens, bond orders and
+    stereo parities)
+    """
+    atm_dct, bnd_dct = xgr
+    return (frozenset(atm_dct), frozenset(bnd_dct))
+
+
+def memoized(func=None, key=graph_key):
+    """ decorator caching a graph function by the value of its graph argument
+
+    the graph must be the first argument; any other arguments must be
+    hashable; dictionaries are copied on the way out, so that callers can't
+    corrupt the cached values
+
+    :param key: a function mapping the graph onto its cache key (defaults to
+        the full graph contents; pass something coarser for properties that
+        only depend on part of the graph)
+    """
+    if func is None:
+        return functools.partial(memoized, key=key)
+
+    @functools.wraps(func)
+    def _memoized(xgr, *args, **kwargs):
+        if not _STATE['enabled']:
+            return func(xgr, *args, **kwargs)
+
+        try:
+            cache_key = (func.__module__, func.__qualname__, key(xgr), args,
+                         frozenset(kwargs.items()))
+            hash(cache_key)
+        except TypeError:
+            return func(xgr, *args, **kwargs)
+
+        if cache_key in _CACHE:
+            _STATE['hits'] += 1
+            _CACHE.move_to_end(cache_key)
+            val = _CACHE[cache_key]
+        else:
+            _STATE['misses'] += 1
+            val = func(xgr, *args, **kwargs)
+            _CACHE[cache_key] = val
+            _evict()
+
+        return dict(val) if isinstance(val, dict) else val
+
+    return _memoized
+
+
+def _evict():
+    while len(_CACHE) > _STATE['maxsize']:
+        _CACHE.popitem(last=False)
@@ -0,0 +1,102 @@
+""" canonical hashing of molecular graphs
+
+atoms are partitioned into classes by color refinement: starting from their
+own properties, atoms are repeatedly split by the classes of their neighbors
+(and the bonds to them) until the partition stops changing; the hash digests
+the sorted invariants from every round of refinement, so it doesn't depend on
+how the atoms are keyed
+
+equal hashes are necessary but not sufficient for isomorphism -- rare, highly
+symmetric graphs can't be told apart by refinement alone -- so the hash is
+meant for bucketing, with a full isomorphism check within each bucket
+"""
+import hashlib
+
+_PAR_CODE_DCT = {None: -1, False: 0, True: 1}
+
+
+def atom_classes(xgr, stereo=True):
+    """ refinement classes, by atom
+
+    the class indices are ordered by atom invariants, so they are the same for
+    isomorphic graphs; atoms in different classes are never equivalent
+
+    :param stereo: distinguish atoms and bonds by their stereo parities?
+    :type stereo: bool
+    """
+    cls_dct, _ = refinement(xgr, stereo=stereo)
+    return cls_dct
+
+
+def canonical_hash(xgr, stereo=True):
+    """ a hash of the graph that is invariant to relabeling its atoms
+
+    (covers atomic symbols, implicit hydrogen valences, bond orders and,
+    optionally, stereo parities)
+
+    :param stereo: include stereo parities in the hash?
+    :type stereo: bool
+    :returns: a hexadecimal digest
+    :rtype: str
+    """
+    _, invs = refinement(xgr, stereo=stereo)
+    return hashlib.sha256(repr(invs).encode()).hexdigest()
+
+
+def refinement(xgr, stereo=True, atm_col_dct=None):
+    """ refine atom classes to a stable partition
+
+    returns the final classes and the sorted invariants from each round; two
+    graphs with equal invariants have consistently numbered classes, so that
+    an isomorphism can only map atoms onto atoms of the same class
+
+    :param atm_col_dct: extra integer colors, by atom, to start from (atoms
+        left out get color 0); used to individualize atoms
+    :type atm_col_dct: dict
+    """
+    atm_dct, bnd_dct = xgr
+
+    def _par(par):
+        return _PAR_CODE_DCT[par] if stereo else -1
+
+    atm_ngb_invs_dct = {atm_key: [] for atm_key in atm_dct}
+    for bnd_key, (bnd_ord, bnd_par) in bnd_dct.items():
+        atm1_key, atm2_key = bnd_key
+        bnd_inv = (float(bnd_ord), _par(bnd_par))
+        atm_ngb_invs_dct[atm1_key].append((bnd_inv, atm2_key))
+        atm_ngb_invs_dct[atm2_key].append((bnd_inv, atm1_key))
+
+    inv_dct = {atm_key: (str(sym), int(imp_hyd_vlc), _par(par))
+               for atm_key, (sym, imp_hyd_vlc, par) in atm_dct.items()}
+    if atm_col_dct is not None:
+        inv_dct = {atm_key: (atm_col_dct.get(atm_key, 0),) + inv
+                   for atm_key, inv in inv_dct.items()}
+    cls_dct, nclss = _classes(inv_dct)
+    invs = [sorted(inv_dct.values())]
+    while True:
+        inv_dct = {
+            atm_key: (cls_dct[atm_key],
+                      tuple(sorted((bnd_inv, cls_dct[ngb_key])
+                                   for bnd_inv, ngb_key in ngb_invs)))
+            for atm_key, ngb_invs in atm_ngb_invs_dct.items()}
+        prev_nclss = nclss
+        cls_dct, nclss = _classes(inv_dct)
+        invs.append(sorted(inv_dct.values()))
+        if nclss == prev_nclss:
+            break
+
+    bnd_invs = sorted(
+        (tuple(sorted(map(cls_dct.__getitem__, bnd_key))),
+         float(bnd_ord), _par(bnd_par))
+        for bnd_key, (bnd_ord, bnd_par) in bnd_dct.items())
+    invs.append(bnd_invs)
+    return cls_dct, invs
+
+
+def _classes(inv_dct):
+    """ class indices by key, numbered in order of the invariants
+    """
+    srt_invs = sorted(set(inv_dct.values()))
+    cls_idx_dct = {inv: idx for idx, inv in enumerate(srt_invs)}
+    cls_dct = {key: cls_idx_dct[inv] for key, inv in inv_dct.items()}
+    return cls_dct, len(srt_invs)
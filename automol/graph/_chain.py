@@ -0,0 +1,209 @@
+""" longest chains
+"""
+from automol.graph._cache import memoized as _memoized
+from automol.graph._graph import atom_keys as _atom_keys
+from automol.graph._graph import atom_neighbor_keys as _atom_neighbor_keys
+
+
+def longest_chain(xgr):
+    """ longest chain in the graph
+    """
+    atm_keys = _atom_keys(xgr)
+    long_chain_dct = atom_longest_chains(xgr)
+
+    max_chain = max((long_chain_dct[atm_key] for atm_key in atm_keys),
+                    key=len)
+    return max_chain
+
+
+@_memoized
+def atom_longest_chains(xgr):
+    """ longest chains, by atom
+
+    each chain is the first of the longest simple paths from the atom, with
+    the first step taken in neighbor order and later steps in key order;
+    acyclic components are handled in linear time from the heights of their
+    branches, while components with rings get a depth-first search that is
+    cut off once a path can't outgrow the longest one found so far
+    """
+    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
+
+    long_chain_dct = {}
+    seen_keys = set()
+    for atm_key in sorted(atm_ngb_keys_dct):
+        if atm_key in seen_keys:
+            continue
+
+        cmp_keys = [atm_key]
+        seen_keys.add(atm_key)
+        for cmp_key in cmp_keys:
+            for ngb_key in atm_ngb_keys_dct[cmp_key]:
+                if ngb_key not in seen_keys:
+                    seen_keys.add(ngb_key)
+                    cmp_keys.append(ngb_key)
+
+        nbnds = sum(len(atm_ngb_keys_dct[k]) for k in cmp_keys) // 2
+        if nbnds == len(cmp_keys) - 1:
+            long_chain_dct.update(
+                _tree_longest_chains(atm_ngb_keys_dct, cmp_keys))
+        else:
+            hng_dct = _hanging_branches(atm_ngb_keys_dct, cmp_keys)
+            for cmp_key in cmp_keys:
+                long_chain_dct[cmp_key] = _longest_chain(
+                    atm_ngb_keys_dct, hng_dct, cmp_key, len(cmp_keys))
+
+    long_chain_dct = {atm_key: long_chain_dct[atm_key]
+                      for atm_key in _atom_keys(xgr)}
+    return long_chain_dct
+
+
+def _tree_longest_chains(atm_ngb_keys_dct, cmp_keys):
+    """ longest chains, by atom, for an acyclic component
+
+    the height of each branch, keyed by (atom, atom it branches off of), is
+    found for both directions of every bond in two passes over the tree; the
+    chain from each atom then follows the tallest branches
+    """
+    root_key = cmp_keys[0]
+    par_dct = {root_key: None}
+    ord_keys = [root_key]
+    for atm_key in ord_keys:
+        for ngb_key in atm_ngb_keys_dct[atm_key]:
+            if ngb_key not in par_dct:
+                par_dct[ngb_key] = atm_key
+                ord_keys.append(ngb_key)
+
+    def _height(atm_key, excl_key):
+        return 1 + max([hgt_dct[(ngb_key, atm_key)]
+                        for ngb_key in atm_ngb_keys_dct[atm_key]
+                        if ngb_key != excl_key] + [0])
+
+    # heights of branches away from the root, then towards it
+    hgt_dct = {}
+    for atm_key in reversed(ord_keys):
+        hgt_dct[(atm_key, par_dct[atm_key])] = _height(
+            atm_key, par_dct[atm_key])
+    for atm_key in ord_keys[1:]:
+        par_key = par_dct[atm_key]
+        hgt_dct[(par_key, atm_key)] = _height(par_key, atm_key)
+
+    long_chain_dct = {}
+    for atm_key in cmp_keys:
+        chain = [atm_key]
+        atm_ngb_keys = atm_ngb_keys_dct[atm_key]
+        if atm_ngb_keys:
+            # the first step breaks ties in neighbor order, the rest by key
+            chain.append(max(atm_ngb_keys,
+                             key=lambda k, a=atm_key: hgt_dct[(k, a)]))
+            while True:
+                prev_key, curr_key = chain[-2:]
+                next_keys = atm_ngb_keys_dct[curr_key] - {prev_key}
+                if not next_keys:
+                    break
+                chain.append(min(
+                    next_keys,
+                    key=lambda k, a=curr_key: (-hgt_dct[(k, a)], k)))
+        long_chain_dct[atm_key] = tuple(chain)
+    return long_chain_dct
+
+
+def _hanging_branches(atm_ngb_keys_dct, cmp_keys):
+    """ atoms in acyclic branches hanging off of the rings, with the atom
+    each one hangs from and the height of its branch
+
+    (found by repeatedly stripping off terminal atoms)
+    """
+    deg_dct = {k: len(atm_ngb_keys_dct[k]) for k in cmp_keys}
+    hng_dct = {}
+    queue = [k for k in cmp_keys if deg_dct[k] == 1]
+    while queue:
+        atm_key = queue.pop()
+        par_key, = (k for k in atm_ngb_keys_dct[atm_key]
+                    if k not in hng_dct)
+        hng_dct[atm_key] = (par_key, 1 + max(
+            [hng_dct[k][1] for k in atm_ngb_keys_dct[atm_key]
+             if k != par_key] + [0]))
+        deg_dct[par_key] -= 1
+        if deg_dct[par_key] == 1:
+            queue.append(par_key)
+    return hng_dct
+
+
+def _longest_chain(atm_ngb_keys_dct, hng_dct, atm_key, natms):
+    """ longest chain from an atom in a component with rings
+
+    (the paths are searched in the same order as for acyclic components, so
+    ties are broken the same way; a path entering a hanging branch is
+    finished along its tallest sub-branches, and a path is abandoned when
+    the atoms still reachable from its end can't make it longer than the
+    best one so far)
+    """
+    max_chain = (atm_key,)
+    chain = [atm_key]
+    chain_keys = {atm_key}
+    stack = [iter(list(atm_ngb_keys_dct[atm_key]))]
+    while stack and len(max_chain) < natms:
+        next_key = next(stack[-1], None)
+        if next_key is None:
+            stack.pop()
+            if stack:
+                chain_keys.remove(chain.pop())
+            continue
+
+        if next_key in chain_keys:
+            continue
+
+        if next_key in hng_dct and hng_dct[next_key][0] == chain[-1]:
+            if len(chain) + hng_dct[next_key][1] > len(max_chain):
+                max_chain = tuple(chain) + _hanging_branch_chain(
+                    atm_ngb_keys_dct, hng_dct, next_key)
+            continue
+
+        chain.append(next_key)
+        chain_keys.add(next_key)
+        if len(chain) > len(max_chain):
+            max_chain = tuple(chain)
+
+        nrch = _reachable_count(atm_ngb_keys_dct, hng_dct, next_key,
+                                chain_keys)
+        if len(chain) + nrch > len(max_chain):
+            stack.append(
+                iter(sorted(atm_ngb_keys_dct[next_key] - chain_keys)))
+        else:
+            chain_keys.remove(chain.pop())
+    return max_chain
+
+
+def _hanging_branch_chain(atm_ngb_keys_dct, hng_dct, atm_key):
+    """ the longest chain into a hanging branch, starting from its base
+    """
+    chain = [atm_key]
+    while True:
+        next_keys = [k for k in atm_ngb_keys_dct[chain[-1]]
+                     if k in hng_dct and hng_dct[k][0] == chain[-1]]
+        if not next_keys:
+            break
+        chain.append(min(next_keys, key=lambda k: (-hng_dct[k][1], k)))
+    return tuple(chain)
+
+
+def _reachable_count(atm_ngb_keys_dct, hng_dct, atm_key, excl_keys):
+    """ a bound on the number of atoms a path from this atom can add without
+    passing through the excluded atoms
+
+    (from a ring atom, a path can only enter one hanging branch, at its end,
+    so only the tallest of these counts)
+    """
+    seen_keys = {atm_key}
+    stack = [atm_key]
+    hng_hgt = 0
+    while stack:
+        for ngb_key in atm_ngb_keys_dct[stack.pop()]:
+            if ngb_key in seen_keys or ngb_key in excl_keys:
+                continue
+            if ngb_key in hng_dct and atm_key not in hng_dct:
+                hng_hgt = max(hng_hgt, hng_dct[ngb_key][1])
+            else:
+                seen_keys.add(ngb_key)
+                stack.append(ngb_key)
+    return len(seen_keys) - 1 + hng_hgt
@@ -0,0 +1,61 @@
+""" connected components
+
+atoms are sorted into components by a union-find over the bonds, so that the
+components of a graph come out of a single pass over its atoms and bonds
+"""
+import automol.create.graph as _create
+
+
+def connected_components_batch(xgrs):
+    """ connected components for each graph in a series
+
+    (each graph's atoms and bonds are sorted into their components in a
+    single pass, instead of building one subgraph at a time)
+    """
+    cmp_xgrs_lst = []
+    for xgr in xgrs:
+        atm_dct, bnd_dct = xgr
+        atm_cmp_idx_dct, ncmps = component_indices(xgr)
+        cmp_atm_dcts = [{} for _ in range(ncmps)]
+        cmp_bnd_dcts = [{} for _ in range(ncmps)]
+        for atm_key, cmp_idx in atm_cmp_idx_dct.items():
+            cmp_atm_dcts[cmp_idx][atm_key] = atm_dct[atm_key]
+        for bnd_key, bnd_val in bnd_dct.items():
+            cmp_idx = atm_cmp_idx_dct[next(iter(bnd_key))]
+            cmp_bnd_dcts[cmp_idx][bnd_key] = bnd_val
+        cmp_xgrs_lst.append(tuple(
+            _create.from_trusted_atoms_and_bonds(cmp_atm_dct, cmp_bnd_dct)
+            for cmp_atm_dct, cmp_bnd_dct in zip(cmp_atm_dcts, cmp_bnd_dcts)))
+    return tuple(cmp_xgrs_lst)
+
+
+def component_indices(xgr):
+    """ component indices by atom, from a union-find over the bonds
+
+    returns the indices and the number of components; components are numbered
+    in order of their first atom in the atom dictionary
+    """
+    atm_dct, bnd_dct = xgr
+    par_dct = {atm_key: atm_key for atm_key in atm_dct}
+
+    def _root(atm_key):
+        # path halving
+        while par_dct[atm_key] != atm_key:
+            par_dct[atm_key] = par_dct[par_dct[atm_key]]
+            atm_key = par_dct[atm_key]
+        return atm_key
+
+    for atm1_key, atm2_key in bnd_dct:
+        root1_key = _root(atm1_key)
+        root2_key = _root(atm2_key)
+        if root1_key != root2_key:
+            par_dct[root1_key] = root2_key
+
+    root_cmp_idx_dct = {}
+    atm_cmp_idx_dct = {}
+    for atm_key in par_dct:
+        root_key = _root(atm_key)
+        if root_key not in root_cmp_idx_dct:
+            root_cmp_idx_dct[root_key] = len(root_cmp_idx_dct)
+        atm_cmp_idx_dct[atm_key] = root_cmp_idx_dct[root_key]
+    return atm_cmp_idx_dct, len(root_cmp_idx_dct)
@@ -0,0 +1,165 @@
+""" stereo parities for stacks of conformers
+"""
+import numpy
+from automol.graph._graph import atoms as _atoms
+from automol.graph._graph import atom_stereo_parities as _atom_stereo_parities
+from automol.graph._graph import bond_stereo_parities as _bond_stereo_parities
+from automol.graph._graph import (set_atom_stereo_parities as
+                                  _set_atom_stereo_parities)
+from automol.graph._graph import (set_bond_stereo_parities as
+                                  _set_bond_stereo_parities)
+from automol.graph._graph import without_bond_orders as _without_bond_orders
+from automol.graph._graph import atom_neighbor_keys as _atom_neighbor_keys
+from automol.graph._graph import explicit as _explicit
+from automol.graph._graph import frozen as _frozen
+from automol.graph._stereo import (stereo_priority_ranks as
+                                   _stereo_priority_ranks)
+from automol.graph._stereo import (stereo_candidate_atom_keys as
+                                   _stereo_candidate_atom_keys)
+from automol.graph._stereo import (stereo_candidate_bond_keys as
+                                   _stereo_candidate_bond_keys)
+from automol.graph._stereo import is_stereogenic_atom as _is_stereogenic_atom
+from automol.graph._stereo import is_stereogenic_bond as _is_stereogenic_bond
+from automol.graph._stereo import (rank_sorted_atom_neighbor_keys as
+                                   _rank_sorted_atom_neighbor_keys)
+
+_PAR_CODE_DCT = {None: -1, False: 0, True: 1}
+
+
+def conformer_stereo_parities(xgr, xyzs):
+    """ atom and bond stereo parities for each of a stack of conformers
+
+    (gives the parities `set_stereo_from_atom_coordinates` would give for
+    each conformer, but evaluates each site's parity for all conformers at
+    once; conformers only go through the graph steps separately where their
+    assignments differ)
+
+    :param xgr: an explicit molecular graph
+    :param xyzs: atomic coordinates for each conformer, with the atoms in
+        order of their keys
+    :type xyzs: numpy array of shape (M, N, 3)
+    :returns: parities of the atoms and bonds that are assigned in any
+        conformer, by key, as arrays of M parity codes (-1 for None, 0 for
+        False, 1 for True)
+    :rtype: (dict, dict)
+    """
+    assert xgr == _explicit(xgr)
+    atm_keys = sorted(_atoms(xgr))
+    xyzs = numpy.asarray(xyzs, dtype=float)
+    assert xyzs.ndim == 3 and xyzs.shape[1:] == (len(atm_keys), 3)
+    nconfs = len(xyzs)
+    atm_idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+
+    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
+    cand_xgr = _without_bond_orders(xgr)
+    cand_atm_keys = _stereo_candidate_atom_keys(cand_xgr)
+    cand_bnd_keys = _stereo_candidate_bond_keys(cand_xgr)
+
+    atm_par_dct = {}
+    bnd_par_dct = {}
+
+    def _record(sgr, conf_idxs):
+        for dct, par_dct in ((atm_par_dct, _atom_stereo_parities(sgr)),
+                             (bnd_par_dct, _bond_stereo_parities(sgr))):
+            for key, par in par_dct.items():
+                if par is not None:
+                    if key not in dct:
+                        dct[key] = numpy.full(nconfs, -1, dtype=numpy.int8)
+                    dct[key][conf_idxs] = _PAR_CODE_DCT[par]
+
+    # each entry is a graph shared by a group of conformers, along with the
+    # sites found so far and the graphs gone through, for one round of
+    # `set_stereo_from_atom_coordinates`
+    queue = [(xgr, numpy.arange(nconfs), frozenset(), frozenset(),
+              frozenset({_frozen(xgr)}))]
+    while queue:
+        sgr, conf_idxs, ste_atm_keys, ste_bnd_keys, seen_sgrs = queue.pop()
+
+        # find sites that have become stereogenic
+        rnk_dct = _stereo_priority_ranks(_without_bond_orders(sgr))
+        ste_atm_keys |= frozenset(
+            atm_key for atm_key in cand_atm_keys - ste_atm_keys
+            if _is_stereogenic_atom(atm_key, atm_ngb_keys_dct, rnk_dct))
+        ste_bnd_keys |= frozenset(
+            bnd_key for bnd_key in cand_bnd_keys - ste_bnd_keys
+            if _is_stereogenic_bond(bnd_key, atm_ngb_keys_dct, rnk_dct))
+
+        # (re-)assign the atoms, then the bonds, splitting the conformers by
+        # their assignments
+        srt_atm_keys = sorted(ste_atm_keys)
+        srt_bnd_keys = sorted(ste_bnd_keys, key=sorted)
+        atm_pars = _atom_stereo_parities_from_coordinate_stack(
+            srt_atm_keys, atm_ngb_keys_dct, _stereo_priority_ranks(sgr),
+            xyzs[conf_idxs], atm_idx_dct)
+        for atm_par_row, atm_conf_idxs in _parity_groups(atm_pars,
+                                                         conf_idxs):
+            atm_sgr = _set_atom_stereo_parities(
+                sgr, dict(zip(srt_atm_keys, atm_par_row)))
+            bnd_pars = _bond_stereo_parities_from_coordinate_stack(
+                srt_bnd_keys, atm_ngb_keys_dct,
+                _stereo_priority_ranks(atm_sgr), xyzs[atm_conf_idxs],
+                atm_idx_dct)
+            for bnd_par_row, bnd_conf_idxs in _parity_groups(bnd_pars,
+                                                             atm_conf_idxs):
+                bnd_sgr = _set_bond_stereo_parities(
+                    atm_sgr, dict(zip(srt_bnd_keys, bnd_par_row)))
+                if bnd_sgr == sgr or _frozen(bnd_sgr) in seen_sgrs:
+                    _record(bnd_sgr, bnd_conf_idxs)
+                else:
+                    queue.append((bnd_sgr, bnd_conf_idxs, ste_atm_keys,
+                                  ste_bnd_keys,
+                                  seen_sgrs | {_frozen(bnd_sgr)}))
+
+    return atm_par_dct, bnd_par_dct
+
+
+def _atom_stereo_parities_from_coordinate_stack(atm_keys, atm_ngb_keys_dct,
+                                                rnk_dct, xyzs, atm_idx_dct):
+    """ atom stereo parities for a stack of conformers, as an array of shape
+    (M, number of atoms)
+    """
+    atm_ngb_idxs = numpy.array(
+        [[atm_idx_dct[atm_ngb_key] for atm_ngb_key
+          in _rank_sorted_atom_neighbor_keys(
+              atm_key, atm_ngb_keys_dct[atm_key], rnk_dct)]
+         for atm_key in atm_keys], dtype=int).reshape(-1, 4)
+    det_mats = numpy.ones((len(xyzs), len(atm_keys), 4, 4))
+    det_mats[..., :3] = xyzs[:, atm_ngb_idxs]
+    det_vals = numpy.linalg.det(det_mats)
+    assert numpy.all(det_vals != 0.)  # for now, assume no four-atom planes
+    return det_vals > 0.
+
+
+def _bond_stereo_parities_from_coordinate_stack(bnd_keys, atm_ngb_keys_dct,
+                                                rnk_dct, xyzs, atm_idx_dct):
+    """ bond stereo parities for a stack of conformers, as an array of shape
+    (M, number of bonds)
+    """
+    idxs_lst = []
+    for bnd_key in bnd_keys:
+        atm1_key, atm2_key = bnd_key
+        atm1_ngb_key = _rank_sorted_atom_neighbor_keys(
+            atm1_key, atm_ngb_keys_dct[atm1_key] - {atm2_key}, rnk_dct)[0]
+        atm2_ngb_key = _rank_sorted_atom_neighbor_keys(
+            atm2_key, atm_ngb_keys_dct[atm2_key] - {atm1_key}, rnk_dct)[0]
+        idxs_lst.append(list(map(atm_idx_dct.__getitem__, (
+            atm1_key, atm1_ngb_key, atm2_key, atm2_ngb_key))))
+    idxs = numpy.array(idxs_lst, dtype=int).reshape(-1, 4)
+
+    atm1_bnd_vecs = xyzs[:, idxs[:, 1]] - xyzs[:, idxs[:, 0]]
+    atm2_bnd_vecs = xyzs[:, idxs[:, 3]] - xyzs[:, idxs[:, 2]]
+    dot_vals = numpy.sum(atm1_bnd_vecs * atm2_bnd_vecs, axis=-1)
+    assert numpy.all(dot_vals != 0.)  # for now, assume no collinear
+    return dot_vals > 0.
+
+
+def _parity_groups(pars, conf_idxs):
+    """ group conformers by their rows of parities
+    """
+    if not pars.shape[1]:
+        return [((), conf_idxs)]
+
+    par_rows, inv = numpy.unique(pars, axis=0, return_inverse=True)
+    inv = numpy.ravel(inv)
+    return [(tuple(map(bool, par_row)), conf_idxs[inv == row_idx])
+            for row_idx, par_row in enumerate(par_rows)]
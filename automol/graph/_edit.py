@@ -0,0 +1,206 @@
+""" batched editing of molecular graphs
+
+graphs are immutable, so each graph operation builds a new graph; an editor
+instead collects many edits on a working copy and builds the edited graph
+once, so that a batch of edits costs time in proportion to the number of
+edits rather than the number of edits times the size of the graph
+
+usage:
+    edt = GraphEditor(xgr)
+    edt.add_atoms({10: 'H'})
+    edt.add_bonds([{0, 10}])
+    xgr = edt.graph()
+"""
+import automol.create.graph as _create
+
+
+class GraphEditor():
+    """ a mutable working copy of a molecular graph
+
+    the atom and bond dictionaries are only copied when they are first
+    edited (copy-on-write)
+    """
+
+    def __init__(self, xgr):
+        atm_dct, bnd_dct = xgr
+        self._atm_dct = atm_dct
+        self._bnd_dct = bnd_dct
+        self._atms_copied = False
+        self._bnds_copied = False
+        self._atms_added = False
+
+    def atoms(self):
+        """ the current atom dictionary (read-only)
+        """
+        return self._atm_dct
+
+    def bonds(self):
+        """ the current bond dictionary (read-only)
+        """
+        return self._bnd_dct
+
+    def graph(self):
+        """ the edited molecular graph
+
+        (as with `add_atoms`, the atoms are sorted by key if any were added)
+        """
+        if self._atms_added:
+            self._atm_dct = {atm_key: self._atm_dct[atm_key]
+                             for atm_key in sorted(self._atm_dct)}
+
+        # the graph takes over the working copy, so further edits copy again
+        self._atms_copied = self._bnds_copied = self._atms_added = False
+        return _create.from_trusted_atoms_and_bonds(self._atm_dct,
+                                                    self._bnd_dct)
+
+    # atoms
+    def add_atoms(self, sym_dct, imp_hyd_vlc_dct=None, ste_par_dct=None):
+        """ add atoms
+        """
+        keys = set(sym_dct.keys())
+        imp_hyd_vlc_dct = {} if imp_hyd_vlc_dct is None else imp_hyd_vlc_dct
+        ste_par_dct = {} if ste_par_dct is None else ste_par_dct
+        assert not any(key in self._atm_dct for key in keys)
+        assert set(imp_hyd_vlc_dct.keys()) <= keys
+        assert set(ste_par_dct.keys()) <= keys
+
+        self._writable_atoms().update(_create.atoms_from_data(
+            atom_symbols=sym_dct,
+            atom_implicit_hydrogen_valences=imp_hyd_vlc_dct,
+            atom_stereo_parities=ste_par_dct))
+        self._atms_added = True
+
+    def remove_atoms(self, atm_keys):
+        """ remove atoms, along with their bonds
+        """
+        atm_keys = set(atm_keys)
+        assert all(atm_key in self._atm_dct for atm_key in atm_keys)
+        if not atm_keys:
+            return
+
+        atm_dct = self._writable_atoms()
+        for atm_key in atm_keys:
+            del atm_dct[atm_key]
+        self.remove_bonds([bnd_key for bnd_key in self._bnd_dct
+                           if bnd_key & atm_keys])
+
+    def set_atom_implicit_hydrogen_valences(self, atm_imp_hyd_vlc_dct):
+        """ set atom implicit hydrogen valences
+        """
+        self._set_atom_values(atm_imp_hyd_vlc_dct, 1)
+
+    def add_atom_implicit_hydrogen_valences(self, inc_atm_imp_hyd_vlc_dct):
+        """ add atom implicit hydrogen valences
+
+        (increments can be positive or negative)
+        """
+        atm_dct = self._atm_dct
+        atm_imp_hyd_vlc_dct = {
+            atm_key: int(atm_dct[atm_key][1] + inc)
+            for atm_key, inc in inc_atm_imp_hyd_vlc_dct.items()}
+        assert all(vlc >= 0 for vlc in atm_imp_hyd_vlc_dct.values())
+        self._set_atom_values(atm_imp_hyd_vlc_dct, 1)
+
+    def set_atom_stereo_parities(self, atm_par_dct):
+        """ set atom stereo parities
+        """
+        self._set_atom_values(atm_par_dct, 2)
+
+    def add_atom_explicit_hydrogen_keys(self, atm_exp_hyd_keys_dct):
+        """ add explicit hydrogens by atom
+        """
+        assert all(atm_key in self._atm_dct
+                   for atm_key in atm_exp_hyd_keys_dct)
+        hyd_sym_dct = {}
+        hyd_bnd_keys = []
+        for atm_key, atm_exp_hyd_keys in atm_exp_hyd_keys_dct.items():
+            for atm_exp_hyd_key in atm_exp_hyd_keys:
+                assert atm_exp_hyd_key not in hyd_sym_dct
+                hyd_sym_dct[atm_exp_hyd_key] = 'H'
+                hyd_bnd_keys.append(frozenset({atm_key, atm_exp_hyd_key}))
+        self.add_atoms(hyd_sym_dct)
+        self.add_bonds(hyd_bnd_keys)
+
+    # bonds
+    def add_bonds(self, keys, ord_dct=None, ste_par_dct=None):
+        """ add bonds
+        """
+        keys = set(map(frozenset, keys))
+        ord_dct = {} if ord_dct is None else ord_dct
+        ste_par_dct = {} if ste_par_dct is None else ste_par_dct
+        assert not any(key in self._bnd_dct for key in keys)
+        assert set(ord_dct.keys()) <= keys
+        assert set(ste_par_dct.keys()) <= keys
+        assert all(atm_key in self._atm_dct for key in keys for atm_key in key)
+
+        self._writable_bonds().update(_create.bonds_from_data(
+            bond_keys=keys, bond_orders=ord_dct,
+            bond_stereo_parities=ste_par_dct))
+
+    def remove_bonds(self, bnd_keys):
+        """ remove bonds
+        """
+        bnd_keys = set(map(frozenset, bnd_keys))
+        assert all(bnd_key in self._bnd_dct for bnd_key in bnd_keys)
+        if not bnd_keys:
+            return
+
+        bnd_dct = self._writable_bonds()
+        for bnd_key in bnd_keys:
+            del bnd_dct[bnd_key]
+
+    def set_bond_orders(self, bnd_ord_dct):
+        """ set bond orders
+        """
+        self._set_bond_values(bnd_ord_dct, 0)
+
+    def increment_bond_orders(self, inc_bnd_ord_dct):
+        """ add to bond orders
+
+        (increments can be positive or negative)
+        """
+        bnd_dct = self._bnd_dct
+        bnd_ord_dct = {bnd_key: bnd_dct[frozenset(bnd_key)][0] + inc
+                       for bnd_key, inc in inc_bnd_ord_dct.items()}
+        self._set_bond_values(bnd_ord_dct, 0)
+
+    def set_bond_stereo_parities(self, bnd_par_dct):
+        """ set bond stereo parities
+        """
+        self._set_bond_values(bnd_par_dct, 1)
+
+    # helpers
+    def _writable_atoms(self):
+        if not self._atms_copied:
+            self._atm_dct = dict(self._atm_dct)
+            self._atms_copied = True
+        return self._atm_dct
+
+    def _writable_bonds(self):
+        if not self._bnds_copied:
+            self._bnd_dct = dict(self._bnd_dct)
+            self._bnds_copied = True
+        return self._bnd_dct
+
+    def _set_atom_values(self, dct, pos):
+        assert all(atm_key in self._atm_dct for atm_key in dct)
+        if not dct:
+            return
+
+        atm_dct = self._writable_atoms()
+        for atm_key, val in dct.items():
+            atm_val = list(atm_dct[atm_key])
+            atm_val[pos] = val
+            atm_dct[atm_key] = tuple(atm_val)
+
+    def _set_bond_values(self, dct, pos):
+        dct = {frozenset(bnd_key): val for bnd_key, val in dct.items()}
+        assert all(bnd_key in self._bnd_dct for bnd_key in dct)
+        if not dct:
+            return
+
+        bnd_dct = self._writable_bonds()
+        for bnd_key, val in dct.items():
+            bnd_val = list(bnd_dct[bnd_key])
+            bnd_val[pos] = val
+            bnd_dct[bnd_key] = tuple(bnd_val)
@@ -0,0 +1,543 @@
+""" distance geometry embedding of molecular graphs
+
+coordinates are generated in three steps:
+    1. lower and upper bounds on the interatomic distances are set from the
+       graph topology (bond distances, bond angles, and the cis/trans range
+       of dihedral angles for atoms up to three bonds apart, and contact
+       distances for atoms further apart), then smoothed with the triangle
+       inequality
+    2. a random distance matrix within the bounds is embedded from the
+       eigenvectors of its metric matrix
+    3. the coordinates are refined against the bounds, along with signed
+       volume constraints (for chirality and planarity), by minimizing an
+       error function
+
+this makes no assumptions about the ring structure, so it works for fused
+and bridged rings; the embedding is done in four dimensions and then
+squeezed down to three, which lets atoms pass through each other to reach
+the requested chirality
+
+volume constraints are given by tuples of four atom keys; the signed volume
+of four atoms is the determinant of their coordinates, padded with a column
+of ones (as for atom stereo parities)
+"""
+import itertools
+import functools
+import numpy
+from qcelemental import constants as qcc
+from automol.error import FailedGeometryGenerationError
+from automol.graph._res import (resonance_dominant_atom_hybridizations as
+                                _resonance_dominant_atom_hybridizations)
+from automol.graph._graph import atom_keys as _atom_keys
+from automol.graph._graph import atom_symbols as _atom_symbols
+from automol.graph._graph import atom_neighbor_keys as _atom_neighbor_keys
+from automol.graph._graph import (rings_sorted_atom_keys as
+                                  _rings_sorted_atom_keys)
+from automol.graph._graph import explicit as _explicit
+
+ANG2BOHR = qcc.conversion_factor('angstrom', 'bohr')
+DEG2RAD = qcc.conversion_factor('degree', 'radian')
+
+BOND_DISTANCE_TOL = 0.01 * ANG2BOHR
+BOND_ANGLE_TOL = 5. * DEG2RAD
+CIS_TRANS_TOL = 0.05 * ANG2BOHR
+MIN_CHIRAL_VOLUME = 2.
+VOLUME_WEIGHT = 1e-3
+MAX_ERROR_PER_ATOM = 1e-2
+
+
+def distance_bounds_matrices(xgr, dih_par_dct=None):
+    """ lower and upper bounds on the interatomic distances, from the graph
+    topology
+
+    (atoms are in order of their keys; distances are in bohr)
+
+    :param dih_par_dct: cis/trans constraints, as parities for tuples of
+        four atom keys (key1, key2, key3, key4), with key2 and key3 bonded;
+        the parity is True if key1 and key4 are on the same side of the bond
+    :type dih_par_dct: dict
+    :returns: the lower and upper bounds matrices
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    xgr = _explicit(xgr)
+    dih_par_dct = {} if dih_par_dct is None else dih_par_dct
+    atm_hyb_dct = _resonance_dominant_atom_hybridizations(xgr)
+    return _distance_bounds_matrices(xgr, atm_hyb_dct, dih_par_dct)
+
+
+def _distance_bounds_matrices(xgr, atm_hyb_dct, dih_par_dct):
+    atm_keys = sorted(_atom_keys(xgr))
+    atm_idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+    natms = len(atm_keys)
+
+    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
+    dmat = _topological_distance_matrix(atm_keys, atm_ngb_keys_dct)
+    dist_ = functools.partial(_bond_distance, _atom_symbols(xgr))
+    ang_ = functools.partial(_bond_angle, _ring_bond_angles(xgr), atm_hyb_dct)
+
+    def _nbonds(key1, key2):
+        return dmat[atm_idx_dct[key1], atm_idx_dct[key2]]
+
+    # contact distances for atoms more than three bonds apart
+    rads = numpy.array([1.2 if _atom_symbols(xgr)[atm_key] == 'H' else 1.7
+                        for atm_key in atm_keys])
+    lmat = 0.75 * ANG2BOHR * (rads[:, None] + rads[None, :])
+    umat = numpy.full((natms, natms), numpy.inf)
+
+    rngs = itertools.chain(
+        _bond_and_angle_ranges(atm_ngb_keys_dct, _nbonds, dist_, ang_),
+        _dihedral_ranges(atm_ngb_keys_dct, _nbonds, dist_, ang_),
+        _cis_trans_ranges(atm_ngb_keys_dct, dih_par_dct, dist_, ang_))
+    for key1, key2, low, upp in rngs:
+        idx1, idx2 = atm_idx_dct[key1], atm_idx_dct[key2]
+        # if there is more than one path, take the intersection of ranges
+        if numpy.isinf(umat[idx1, idx2]):
+            lmat[idx1, idx2] = low
+        else:
+            lmat[idx1, idx2] = max(lmat[idx1, idx2], low)
+        umat[idx1, idx2] = min(umat[idx1, idx2], upp)
+        lmat[idx2, idx1] = lmat[idx1, idx2]
+        umat[idx2, idx1] = umat[idx1, idx2]
+
+    numpy.fill_diagonal(lmat, 0.)
+    numpy.fill_diagonal(umat, 0.)
+    lmat, umat = _triangle_smooth(lmat, umat)
+    return lmat, umat
+
+
+def _bond_and_angle_ranges(atm_ngb_keys_dct, nbonds_, dist_, ang_):
+    """ distance ranges for bonded atoms and for the ends of bond angles
+    """
+    for key2 in sorted(atm_ngb_keys_dct):
+        ngb_keys = sorted(atm_ngb_keys_dct[key2])
+        for key3 in ngb_keys:
+            dist = dist_(key2, key3)
+            if key2 < key3:
+                yield (key2, key3, dist - BOND_DISTANCE_TOL,
+                       dist + BOND_DISTANCE_TOL)
+
+        for key1, key3 in itertools.combinations(ngb_keys, 2):
+            if nbonds_(key1, key3) != 2:
+                continue
+
+            dist1 = dist_(key1, key2)
+            dist2 = dist_(key2, key3)
+            ang = ang_(key1, key2, key3)
+            yield (key1, key3,
+                   _law_of_cosines(dist1, dist2, ang - BOND_ANGLE_TOL),
+                   _law_of_cosines(dist1, dist2, ang + BOND_ANGLE_TOL))
+
+
+def _dihedral_ranges(atm_ngb_keys_dct, nbonds_, dist_, ang_):
+    """ cis to trans distance ranges for the ends of dihedral angles
+    """
+    for key2, key3 in itertools.permutations(sorted(atm_ngb_keys_dct), 2):
+        if key2 > key3 or key3 not in atm_ngb_keys_dct[key2]:
+            continue
+
+        for key1 in atm_ngb_keys_dct[key2] - {key3}:
+            for key4 in atm_ngb_keys_dct[key3] - {key2, key1}:
+                if nbonds_(key1, key4) != 3:
+                    continue
+
+                dists = (dist_(key1, key2), dist_(key2, key3),
+                         dist_(key3, key4))
+                ang1 = ang_(key1, key2, key3)
+                ang2 = ang_(key2, key3, key4)
+                yield (key1, key4,
+                       _dihedral_distance(dists, ang1, ang2, 0.),
+                       _dihedral_distance(dists, ang1, ang2, numpy.pi))
+
+
+def _cis_trans_ranges(atm_ngb_keys_dct, dih_par_dct, dist_, ang_):
+    """ distance ranges for the ends of cis/trans constrained dihedrals
+    """
+    for (key1, key2, key3, key4), par in dih_par_dct.items():
+        assert key3 in atm_ngb_keys_dct[key2]
+        # the neighbors on each side of the bond alternate cis and trans
+        for key1_ in atm_ngb_keys_dct[key2] - {key3}:
+            for key4_ in atm_ngb_keys_dct[key3] - {key2}:
+                is_cis = ((key1_ == key1) == (key4_ == key4)) == par
+                dists = (dist_(key1_, key2), dist_(key2, key3),
+                         dist_(key3, key4_))
+                ang1 = ang_(key1_, key2, key3)
+                ang2 = ang_(key2, key3, key4_)
+                dist = _dihedral_distance(dists, ang1, ang2,
+                                          0. if is_cis else numpy.pi)
+                yield (key1_, key4_, dist - CIS_TRANS_TOL,
+                       dist + CIS_TRANS_TOL)
+
+
+def _bond_distance(atm_sym_dct, key1, key2):
+    if 'H' in (atm_sym_dct[key1], atm_sym_dct[key2]):
+        return 1.1 * ANG2BOHR
+    return 1.5 * ANG2BOHR
+
+
+def _bond_angle(rng_ang_dct, atm_hyb_dct, key1, key2, key3):
+    rng_key = (key2, frozenset({key1, key3}))
+    if rng_key in rng_ang_dct:
+        return rng_ang_dct[rng_key]
+    return {1: 180., 2: 120.}.get(atm_hyb_dct[key2], 109.5) * DEG2RAD
+
+
+def embed_atom_coordinates(xgr, vol_par_dct=None, dih_par_dct=None, seed=0,
+                           ntries=20):
+    """ atom coordinates for a connected molecular graph, by distance
+    geometry embedding
+
+    :param vol_par_dct: chirality constraints, as parities for tuples of
+        four atom keys; the parity is True if the signed volume of the four
+        atoms is positive
+    :type vol_par_dct: dict
+    :param dih_par_dct: cis/trans constraints (see
+        `distance_bounds_matrices`)
+    :type dih_par_dct: dict
+    :param seed: seed for the random distance matrices
+    :type seed: int
+    :param ntries: the number of embeddings to try before giving up
+    :type ntries: int
+    :returns: coordinates by atom key, in bohr
+    :rtype: dict
+    """
+    xgr = _explicit(xgr)
+    vol_par_dct = {} if vol_par_dct is None else vol_par_dct
+    dih_par_dct = {} if dih_par_dct is None else dih_par_dct
+    atm_keys = sorted(_atom_keys(xgr))
+    atm_idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+    natms = len(atm_keys)
+
+    atm_hyb_dct = _resonance_dominant_atom_hybridizations(xgr)
+    lmat, umat = _distance_bounds_matrices(xgr, atm_hyb_dct, dih_par_dct)
+    idxs1, idxs2 = numpy.triu_indices(natms, k=1)
+    lows = lmat[idxs1, idxs2]
+    upps = umat[idxs1, idxs2]
+
+    vol_keys = list(vol_par_dct)
+    vol_idxs = _index_array(vol_keys, atm_idx_dct)
+    vol_sgns = numpy.array([1. if vol_par_dct[keys] else -1.
+                            for keys in vol_keys])
+    dih_keys = list(dih_par_dct)
+    dih_idxs = _index_array(dih_keys, atm_idx_dct)
+    dih_sgns = numpy.array([1. if dih_par_dct[keys] else -1.
+                            for keys in dih_keys])
+    pln_idxs = _index_array(_planar_atom_keys(xgr, atm_hyb_dct), atm_idx_dct)
+
+    def _error(xyzs, wt4):
+        """ the error function and its gradient, for one set of weights
+        """
+        err, grad = _distance_error(xyzs, idxs1, idxs2, lows, upps)
+        vols, vol_grads = _signed_volumes(xyzs[:, :3], vol_idxs)
+        viols = numpy.maximum(MIN_CHIRAL_VOLUME - vol_sgns * vols, 0.)
+        err += VOLUME_WEIGHT * numpy.sum(viols ** 2)
+        _add_volume_gradient(
+            grad, vol_idxs, -2. * VOLUME_WEIGHT *
+            (viols * vol_sgns)[:, None, None] * vol_grads)
+        vols, vol_grads = _signed_volumes(xyzs[:, :3], pln_idxs)
+        err += VOLUME_WEIGHT * numpy.sum(vols ** 2)
+        _add_volume_gradient(grad, pln_idxs, 2. * VOLUME_WEIGHT *
+                             vols[:, None, None] * vol_grads)
+        if xyzs.shape[1] > 3:
+            err += wt4 * numpy.sum(xyzs[:, 3:] ** 2)
+            grad[:, 3:] += 2. * wt4 * xyzs[:, 3:]
+        return err, grad
+
+    rng = numpy.random.default_rng(seed)
+    best_err = None
+    best_xyzs = None
+    for _ in range(ntries):
+        xyzs = _metric_matrix_embedding(lmat, umat, rng, ndims=4)
+        if xyzs is None:
+            continue
+
+        # if most of the chiral centers are inverted, start from the mirror
+        # image
+        vols, _ = _signed_volumes(xyzs[:, :3], vol_idxs)
+        if numpy.sum(vol_sgns * vols < 0.) > len(vol_sgns) / 2.:
+            xyzs[:, 0] *= -1.
+
+        # refine in four dimensions, then squeeze out the fourth
+        xyzs = _minimize(lambda x: _error(x, 0.), xyzs)
+        xyzs = _minimize(lambda x: _error(x, 1.), xyzs)
+        xyzs = numpy.ascontiguousarray(xyzs[:, :3])
+
+        vols, _ = _signed_volumes(xyzs, vol_idxs)
+        dots = numpy.sum((xyzs[dih_idxs[:, 0]] - xyzs[dih_idxs[:, 1]]) *
+                         (xyzs[dih_idxs[:, 3]] - xyzs[dih_idxs[:, 2]]), axis=1)
+        if (numpy.all(vol_sgns * vols > 0.) and
+                numpy.all(dih_sgns * dots > 0.)):
+            err, _ = _error(xyzs, 0.)
+            if best_err is None or err < best_err:
+                best_err = err
+                best_xyzs = xyzs
+            # stop once the bounds are met, or nearly so (strained rings
+            # may not meet them at all)
+            if err < MAX_ERROR_PER_ATOM * natms:
+                break
+
+    if best_xyzs is None:
+        raise FailedGeometryGenerationError(
+            "Failed to embed coordinates satisfying the stereo constraints.")
+
+    return dict(zip(atm_keys, map(tuple, best_xyzs)))
+
+
+def _ring_bond_angles(xgr):
+    """ interior bond angles for three- to five-membered rings
+
+    (keyed by the vertex atom and the pair of end atoms; other rings just
+    use the hybridization angles)
+    """
+    rng_ang_dct = {}
+    for rng_atm_keys in sorted(_rings_sorted_atom_keys(xgr), key=len,
+                               reverse=True):
+        num = len(rng_atm_keys)
+        if num > 5:
+            continue
+
+        ang = numpy.pi * (num - 2) / num
+        for idx, key2 in enumerate(rng_atm_keys):
+            key1 = rng_atm_keys[idx - 1]
+            key3 = rng_atm_keys[(idx + 1) % num]
+            rng_ang_dct[(key2, frozenset({key1, key3}))] = ang
+    return rng_ang_dct
+
+
+def _planar_atom_keys(xgr, atm_hyb_dct):
+    """ four-atom tuples that should lie in a plane
+
+    (each sp2 atom with its three neighbors, and the ends of each bond
+    between sp2 atoms, which keeps double bonds and conjugated rings flat)
+    """
+    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
+    sp2_keys = sorted(atm_key for atm_key, hyb in atm_hyb_dct.items()
+                      if hyb == 2)
+
+    pln_keys_lst = []
+    for key2 in sp2_keys:
+        ngb_keys = sorted(atm_ngb_keys_dct[key2])
+        if len(ngb_keys) == 3:
+            pln_keys_lst.append(tuple([key2] + ngb_keys))
+
+        for key3 in ngb_keys:
+            if key3 < key2 or atm_hyb_dct[key3] != 2:
+                continue
+            for key1 in sorted(atm_ngb_keys_dct[key2] - {key3}):
+                for key4 in sorted(atm_ngb_keys_dct[key3] - {key2, key1}):
+                    pln_keys_lst.append((key1, key2, key3, key4))
+    return tuple(pln_keys_lst)
+
+
+def _index_array(keys_lst, atm_idx_dct):
+    """ atom indices for tuples of four atom keys, as an array
+    """
+    return numpy.array([list(map(atm_idx_dct.__getitem__, keys))
+                        for keys in keys_lst], dtype=int).reshape(-1, 4)
+
+
+def _topological_distance_matrix(atm_keys, atm_ngb_keys_dct):
+    """ the number of bonds between each pair of atoms (breadth-first)
+    """
+    atm_idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+    natms = len(atm_keys)
+    dmat = numpy.full((natms, natms), -1, dtype=int)
+    for idx, atm_key in enumerate(atm_keys):
+        dmat[idx, idx] = 0
+        shell = [atm_key]
+        dist = 0
+        while shell:
+            dist += 1
+            next_shell = []
+            for key in shell:
+                for ngb_key in atm_ngb_keys_dct[key]:
+                    ngb_idx = atm_idx_dct[ngb_key]
+                    if dmat[idx, ngb_idx] < 0:
+                        dmat[idx, ngb_idx] = dist
+                        next_shell.append(ngb_key)
+            shell = next_shell
+    return dmat
+
+
+def _law_of_cosines(dist1, dist2, ang):
+    return numpy.sqrt(dist1 ** 2 + dist2 ** 2 -
+                      2. * dist1 * dist2 * numpy.cos(ang))
+
+
+def _dihedral_distance(dists, ang1, ang2, dih):
+    """ the distance between the ends of a four-atom chain
+    """
+    dist1, dist2, dist3 = dists
+    xval = dist2 - dist1 * numpy.cos(ang1) - dist3 * numpy.cos(ang2)
+    yval = dist3 * numpy.sin(ang2) * numpy.cos(dih) - dist1 * numpy.sin(ang1)
+    zval = dist3 * numpy.sin(ang2) * numpy.sin(dih)
+    return numpy.sqrt(xval ** 2 + yval ** 2 + zval ** 2)
+
+
+def _triangle_smooth(lmat, umat):
+    """ tighten the bounds with the triangle inequality (Floyd-Warshall)
+    """
+    lmat = numpy.array(lmat)
+    umat = numpy.array(umat)
+    for idx in range(len(lmat)):
+        umat = numpy.minimum(umat, umat[:, idx, None] + umat[None, idx, :])
+        lmat = numpy.maximum(
+            lmat, numpy.maximum(lmat[:, idx, None] - umat[None, idx, :],
+                                lmat[None, idx, :] - umat[:, idx, None]))
+
+    # bounds from crude angles can clash in strained rings; let the upper
+    # bounds win and leave the rest to the refinement
+    lmat = numpy.minimum(lmat, umat)
+    return lmat, umat
+
+
+def _metric_matrix_embedding(lmat, umat, rng, ndims):
+    """ coordinates for a random distance matrix within the bounds
+    """
+    natms = len(lmat)
+    rands = rng.uniform(size=(natms, natms))
+    rands = numpy.triu(rands, k=1)
+    rands = rands + rands.T
+    dmat = lmat + rands * (umat - lmat)
+
+    # the metric matrix, relative to the centroid
+    dsqs = dmat ** 2
+    cdsqs = numpy.mean(dsqs, axis=1)
+    gmat = (cdsqs[:, None] + cdsqs[None, :] - dsqs - numpy.mean(cdsqs)) / 2.
+
+    vals, vecs = numpy.linalg.eigh(gmat)
+    vals = vals[::-1][:ndims]
+    vecs = vecs[:, ::-1][:, :ndims]
+    if not numpy.any(vals > 0.):
+        return None
+
+    xyzs = numpy.zeros((natms, ndims))
+    ncols = min(ndims, natms)
+    xyzs[:, :ncols] = vecs * numpy.sqrt(numpy.maximum(vals, 0.))
+    # break any remaining symmetry, so that the gradients are nonzero
+    xyzs += rng.uniform(-0.1, 0.1, size=xyzs.shape)
+    return xyzs
+
+
+def _distance_error(xyzs, idxs1, idxs2, lows, upps):
+    """ flat-bottomed distance error and its gradient
+
+    (violations are relative to the bounds, so short distances count as
+    much as long ones)
+    """
+    vecs = xyzs[idxs1] - xyzs[idxs2]
+    dists = numpy.sqrt(numpy.sum(vecs ** 2, axis=1))
+    overs = numpy.maximum(dists - upps, 0.) / upps
+    unders = numpy.maximum(lows - dists, 0.) / lows
+    err = numpy.sum(overs ** 2) + numpy.sum(unders ** 2)
+
+    coeffs = 2. * (overs / upps - unders / lows) / numpy.maximum(dists, 1e-8)
+    pair_grads = coeffs[:, None] * vecs
+    grad = numpy.zeros_like(xyzs)
+    natms = len(xyzs)
+    for dim in range(xyzs.shape[1]):
+        grad[:, dim] = (
+            numpy.bincount(idxs1, pair_grads[:, dim], minlength=natms) -
+            numpy.bincount(idxs2, pair_grads[:, dim], minlength=natms))
+    return err, grad
+
+
+def _signed_volumes(xyzs, idxs):
+    """ signed volumes of four-atom tuples and their gradients
+
+    (the determinant of the coordinates padded with a column of ones)
+    """
+    xyz1, xyz2, xyz3, xyz4 = (xyzs[idxs[:, pos]] for pos in range(4))
+    vec1 = xyz1 - xyz4
+    vec2 = xyz2 - xyz4
+    vec3 = xyz3 - xyz4
+    grads = numpy.zeros((len(idxs), 4, 3))
+    grads[:, 0] = _cross(vec2, vec3)
+    grads[:, 1] = _cross(vec3, vec1)
+    grads[:, 2] = _cross(vec1, vec2)
+    grads[:, 3] = -(grads[:, 0] + grads[:, 1] + grads[:, 2])
+    vols = numpy.einsum('ij,ij->i', vec1, grads[:, 0])
+    return vols, grads
+
+
+def _cross(vecs1, vecs2):
+    """ row-wise cross products
+
+    (`numpy.cross` has a lot of overhead for arrays this small)
+    """
+    xs1, ys1, zs1 = vecs1.T
+    xs2, ys2, zs2 = vecs2.T
+    return numpy.stack([ys1 * zs2 - zs1 * ys2,
+                        zs1 * xs2 - xs1 * zs2,
+                        xs1 * ys2 - ys1 * xs2], axis=1)
+
+
+def _add_volume_gradient(grad, idxs, vol_grads):
+    """ add the gradients of signed volumes to the atom gradients
+    """
+    natms = len(grad)
+    for pos in range(4):
+        for dim in range(3):
+            grad[:, dim] += numpy.bincount(
+                idxs[:, pos], vol_grads[:, pos, dim], minlength=natms)
+
+
+def _minimize(fun, xyzs, maxiter=1000, gtol=1e-4, nmem=8):
+    """ minimize an error function of the coordinates (limited-memory BFGS,
+    with a backtracking line search)
+    """
+    shape = xyzs.shape
+    xvec = numpy.ravel(xyzs)
+
+    def _fun(xvec):
+        err, grad = fun(numpy.reshape(xvec, shape))
+        return err, numpy.ravel(grad)
+
+    err, grad = _fun(xvec)
+    svecs = []
+    yvecs = []
+    for _ in range(maxiter):
+        if numpy.max(numpy.abs(grad)) < gtol:
+            break
+
+        # two-loop recursion for the search direction
+        qvec = grad.copy()
+        alphas = []
+        for svec, yvec in zip(reversed(svecs), reversed(yvecs)):
+            alpha = numpy.dot(svec, qvec) / numpy.dot(yvec, svec)
+            qvec -= alpha * yvec
+            alphas.append(alpha)
+        if svecs:
+            qvec *= (numpy.dot(svecs[-1], yvecs[-1]) /
+                     numpy.dot(yvecs[-1], yvecs[-1]))
+        for svec, yvec, alpha in zip(svecs, yvecs, reversed(alphas)):
+            beta = numpy.dot(yvec, qvec) / numpy.dot(yvec, svec)
+            qvec += (alpha - beta) * svec
+        dvec = -qvec
+
+        slope = numpy.dot(grad, dvec)
+        if slope >= 0.:
+            dvec = -grad
+            slope = numpy.dot(grad, dvec)
+            svecs, yvecs = [], []
+
+        stp = 1.
+        while True:
+            new_xvec = xvec + stp * dvec
+            new_err, new_grad = _fun(new_xvec)
+            if new_err <= err + 1e-4 * stp * slope:
+                break
+            stp *= 0.5
+            if stp < 1e-10:
+                return numpy.reshape(xvec, shape)
+
+        svec = new_xvec - xvec
+        yvec = new_grad - grad
+        if numpy.dot(svec, yvec) > 1e-10:
+            svecs.append(svec)
+            yvecs.append(yvec)
+            svecs = svecs[-nmem:]
+            yvecs = yvecs[-nmem:]
+
+        xvec, err, grad = new_xvec, new_err, new_grad
+
+    return numpy.reshape(xvec, shape)
@@ -2,11 +2,20 @@
 """
 import itertools
 import functools
+import collections
 import numpy
 import future.moves.itertools as fmit
 from qcelemental import periodictable as pt
 from automol import dict_
-from automol.graph import _networkx
+from automol.graph._cache import memoized as _memoized
+from automol.graph._cache import connectivity_key as _connectivity_key
+from automol.graph._canon import canonical_hash as _canonical_hash
+from automol.graph._edit import GraphEditor as _GraphEditor
+from automol.graph._iso import isomorphism as _isomorphism
+from automol.graph._ring import smallest_rings as _smallest_rings
+from automol.graph._comp import component_indices as _component_indices
+from automol.graph._comp import (connected_components_batch as
+                                 _connected_components_batch)
 import automol.dict_.multi as mdict
 import automol.create.graph as _create
 
@@ -101,7 +110,7 @@ def relabel(xgr, atm_key_dct):
 
     atm_dct = dict_.transform_keys(atoms(xgr), _relabel_atom_key)
     bnd_dct = dict_.transform_keys(bonds(xgr), _relabel_bond_key)
-    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+    return _create.from_trusted_atoms_and_bonds(atm_dct, bnd_dct)
 
 
 def standard_keys(xgr):
@@ -122,34 +131,33 @@ def transform_keys(xgr, atm_key_func):
 def set_atom_implicit_hydrogen_valences(xgr, atm_imp_hyd_vlc_dct):
     """ set atom implicit hydrogen valences
     """
-    atm_dct = mdict.set_by_key_by_position(atoms(xgr), atm_imp_hyd_vlc_dct,
-                                           ATM_IMP_HYD_VLC_POS)
-    bnd_dct = bonds(xgr)
-    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+    edt = _GraphEditor(xgr)
+    edt.set_atom_implicit_hydrogen_valences(atm_imp_hyd_vlc_dct)
+    return edt.graph()
 
 
 def set_atom_stereo_parities(sgr, atm_par_dct):
     """ set atom parities
     """
-    atm_dct = mdict.set_by_key_by_position(atoms(sgr), atm_par_dct,
-                                           ATM_STE_PAR_POS)
-    return _create.from_atoms_and_bonds(atm_dct, bonds(sgr))
+    edt = _GraphEditor(sgr)
+    edt.set_atom_stereo_parities(atm_par_dct)
+    return edt.graph()
 
 
 def set_bond_orders(rgr, bnd_ord_dct):
     """ set bond orders
     """
-    bnd_dct = mdict.set_by_key_by_position(bonds(rgr), bnd_ord_dct,
-                                           BND_ORD_POS)
-    return _create.from_atoms_and_bonds(atoms(rgr), bnd_dct)
+    edt = _GraphEditor(rgr)
+    edt.set_bond_orders(bnd_ord_dct)
+    return edt.graph()
 
 
 def set_bond_stereo_parities(sgr, bnd_par_dct):
     """ set bond parities
     """
-    bnd_dct = mdict.set_by_key_by_position(bonds(sgr), bnd_par_dct,
-                                           BND_STE_PAR_POS)
-    return _create.from_atoms_and_bonds(atoms(sgr), bnd_dct)
+    edt = _GraphEditor(sgr)
+    edt.set_bond_stereo_parities(bnd_par_dct)
+    return edt.graph()
 
 
 def add_atom_implicit_hydrogen_valences(xgr, inc_atm_imp_hyd_vlc_dct):
@@ -157,14 +165,9 @@ def add_atom_implicit_hydrogen_valences(xgr, inc_atm_imp_hyd_vlc_dct):
 
     (increments can be positive or negative)
     """
-    atm_keys = list(inc_atm_imp_hyd_vlc_dct.keys())
-    atm_imp_hyd_vlcs = numpy.add(
-        dict_.values_by_key(atom_implicit_hydrogen_valences(xgr), atm_keys),
-        dict_.values_by_key(inc_atm_imp_hyd_vlc_dct, atm_keys))
-    assert all(atm_imp_hyd_vlc >= 0 for atm_imp_hyd_vlc in atm_imp_hyd_vlcs)
-    atm_imp_hyd_vlc_dct = dict_.transform_values(
-        dict(zip(atm_keys, atm_imp_hyd_vlcs)), int)
-    return set_atom_implicit_hydrogen_valences(xgr, atm_imp_hyd_vlc_dct)
+    edt = _GraphEditor(xgr)
+    edt.add_atom_implicit_hydrogen_valences(inc_atm_imp_hyd_vlc_dct)
+    return edt.graph()
 
 
 def without_bond_orders(xgr):
@@ -188,57 +191,18 @@ def without_stereo_parities(xgr):
 def add_atoms(xgr, sym_dct, imp_hyd_vlc_dct=None, ste_par_dct=None):
     """ add atoms to this molecular graph
     """
-    atm_keys = atom_keys(xgr)
-    atm_sym_dct = atom_symbols(xgr)
-    atm_imp_hyd_vlc_dct = atom_implicit_hydrogen_valences(xgr)
-    atm_ste_par_dct = atom_stereo_parities(xgr)
-
-    keys = set(sym_dct.keys())
-    imp_hyd_vlc_dct = {} if imp_hyd_vlc_dct is None else imp_hyd_vlc_dct
-    ste_par_dct = {} if ste_par_dct is None else ste_par_dct
-
-    assert not keys & atm_keys
-    assert set(imp_hyd_vlc_dct.keys()) <= keys
-    assert set(ste_par_dct.keys()) <= keys
-
-    atm_sym_dct.update(sym_dct)
-    atm_imp_hyd_vlc_dct.update(imp_hyd_vlc_dct)
-    atm_ste_par_dct.update(ste_par_dct)
-
-    atm_dct = _create.atoms_from_data(
-        atom_symbols=atm_sym_dct,
-        atom_implicit_hydrogen_valences=atm_imp_hyd_vlc_dct,
-        atom_stereo_parities=atm_ste_par_dct)
-    bnd_dct = bonds(xgr)
-    xgr = _create.from_atoms_and_bonds(atoms=atm_dct, bonds=bnd_dct)
-    return xgr
+    edt = _GraphEditor(xgr)
+    edt.add_atoms(sym_dct, imp_hyd_vlc_dct=imp_hyd_vlc_dct,
+                  ste_par_dct=ste_par_dct)
+    return edt.graph()
 
 
 def add_bonds(xgr, keys, ord_dct=None, ste_par_dct=None):
     """ add bonds to this molecular graph
     """
-    bnd_keys = set(bond_keys(xgr))
-    bnd_ord_dct = bond_orders(xgr)
-    bnd_ste_par_dct = bond_stereo_parities(xgr)
-
-    keys = set(map(frozenset, keys))
-    ord_dct = {} if ord_dct is None else ord_dct
-    ste_par_dct = {} if ste_par_dct is None else ste_par_dct
-    assert not keys & bnd_keys
-    assert set(ord_dct.keys()) <= keys
-    assert set(ste_par_dct.keys()) <= keys
-
-    bnd_keys.update(keys)
-    bnd_ord_dct.update(ord_dct)
-    bnd_ste_par_dct.update(ste_par_dct)
-
-    atm_dct = atoms(xgr)
-    bnd_dct = _create.bonds_from_data(
-        bond_keys=bnd_keys, bond_orders=bnd_ord_dct,
-        bond_stereo_parities=bnd_ste_par_dct)
-
-    xgr = _create.from_atoms_and_bonds(atoms=atm_dct, bonds=bnd_dct)
-    return xgr
+    edt = _GraphEditor(xgr)
+    edt.add_bonds(keys, ord_dct=ord_dct, ste_par_dct=ste_par_dct)
+    return edt.graph()
 
 
 def frozen(xgr):
@@ -263,42 +227,60 @@ def frozen(xgr):
 def atom_neighbor_keys(xgr):
     """ keys of neighboring atoms, by atom
     """
-    def _neighbor_keys(atm_key, atm_nbh):
-        return frozenset(atom_keys(atm_nbh) - {atm_key})
-
-    atm_ngb_keys_dct = dict_.transform_items_to_values(
-        atom_neighborhoods(xgr), _neighbor_keys)
+    atm_ngb_keys_dct, _ = _adjacency_index(xgr)
     return atm_ngb_keys_dct
 
 
 def atom_bond_keys(xgr):
     """ bond keys, by atom
     """
-    return dict_.transform_values(atom_neighborhoods(xgr), bond_keys)
+    _, atm_bnd_keys_dct = _adjacency_index(xgr)
+    return atm_bnd_keys_dct
 
 
 def atom_neighborhoods(xgr):
     """ neighborhood subgraphs, by atom
     """
-    bnd_keys = bond_keys(xgr)
+    def _neighborhood(atm_bnd_keys):
+        return bond_induced_subgraph(xgr, atm_bnd_keys)
 
-    def _neighborhood(atm_key):
-        nbh_bnd_keys = set(filter(lambda x: atm_key in x, bnd_keys))
-        return bond_induced_subgraph(xgr, nbh_bnd_keys)
-
-    atm_keys = list(atom_keys(xgr))
-    atm_nbh_dct = dict(zip(atm_keys, map(_neighborhood, atm_keys)))
+    atm_nbh_dct = dict_.transform_values(atom_bond_keys(xgr), _neighborhood)
     return atm_nbh_dct
 
 
+def _adjacency_index(xgr):
+    """ neighbor keys and bond keys, by atom
+
+    (built in a single pass over the bonds, so that neighbor lookups don't
+    require a subgraph for each atom)
+    """
+    atm_ngb_keys_dct = {atm_key: set() for atm_key in atoms(xgr)}
+    atm_bnd_keys_dct = {atm_key: set() for atm_key in atoms(xgr)}
+    for bnd_key in bonds(xgr):
+        atm1_key, atm2_key = bnd_key
+        atm_ngb_keys_dct[atm1_key].add(atm2_key)
+        atm_ngb_keys_dct[atm2_key].add(atm1_key)
+        atm_bnd_keys_dct[atm1_key].add(bnd_key)
+        atm_bnd_keys_dct[atm2_key].add(bnd_key)
+
+    atm_ngb_keys_dct = dict_.transform_values(atm_ngb_keys_dct, frozenset)
+    atm_bnd_keys_dct = dict_.transform_values(atm_bnd_keys_dct, frozenset)
+    return atm_ngb_keys_dct, atm_bnd_keys_dct
+
+
 # # bond properties
 def bond_neighbor_keys(xgr):
     """ keys of neighboring bonds, by bond
     """
-    def _neighbor_keys(bnd_key, bnd_nbh):
-        return frozenset(bond_keys(bnd_nbh) - {bnd_key})
-    bnd_ngb_keys_dct = dict_.transform_items_to_values(
-        bond_neighborhoods(xgr), _neighbor_keys)
+    atm_bnd_keys_dct = atom_bond_keys(xgr)
+
+    def _neighbor_keys(bnd_key):
+        atm1_key, atm2_key = bnd_key
+        return ((atm_bnd_keys_dct[atm1_key] | atm_bnd_keys_dct[atm2_key]) -
+                {bnd_key})
+
+    bnd_keys = bond_keys(xgr)
+    bnd_ngb_keys_dct = dict(zip(bnd_keys, map(_neighbor_keys, bnd_keys)))
     return bnd_ngb_keys_dct
 
 
@@ -319,12 +301,14 @@ def bond_neighbor_bonds(bnd_key, xgr):
 def bond_neighborhoods(xgr):
     """ neighborhood subgraphs, by bond
     """
-    bnd_keys = list(bond_keys(xgr))
+    atm_bnd_keys_dct = atom_bond_keys(xgr)
 
     def _neighborhood(bnd_key):
-        nbh_bnd_keys = set(filter(lambda x: bnd_key & x, bnd_keys))
+        atm1_key, atm2_key = bnd_key
+        nbh_bnd_keys = atm_bnd_keys_dct[atm1_key] | atm_bnd_keys_dct[atm2_key]
         return bond_induced_subgraph(xgr, nbh_bnd_keys)
 
+    bnd_keys = bond_keys(xgr)
     bnd_nbh_dct = dict(zip(bnd_keys, map(_neighborhood, bnd_keys)))
     return bnd_nbh_dct
 
@@ -339,82 +323,139 @@ def branch(xgr, atm_key, bnd_key, saddle=False, ts_bnd=None):
 def branch_atom_keys(xgr, atm_key, bnd_key, saddle=False, ts_bnd=None):
     """ atom keys for branch extending along `bnd_key` away from `atm_key`
     """
-    return atom_keys(branch(xgr, atm_key, bnd_key, saddle=saddle, ts_bnd=ts_bnd)) - {atm_key}
+    bnch_bnd_keys = branch_bond_keys(xgr, atm_key, bnd_key, saddle=saddle,
+                                     ts_bnd=ts_bnd)
+    return frozenset(itertools.chain(*bnch_bnd_keys)) - {atm_key}
 
 
-def branch_bond_keys(xgr, atm_key, bnd_key, saddle=False, ts_bnd=None):
+def branch_bond_keys(xgr, atm_key, bnd_key, saddle=False,
+                     ts_bnd=None):  # pylint: disable=unused-argument
     """ bond keys for branch extending along `bnd_key` away from `atm_key`
-    """
 
-    #bnd_key is the set of atom indices for the bond of interest
-    # atm_bnd_keys_dct is a dictionary of atoms that are connected to each atom
-#    atm_bnd_keys_dct = atom_bond_keys(xgr)
-#    print('atm_bnd_keys_dct:', atm_bnd_keys_dct)
-
-#    bnch_bnd_keys = {bnd_key}
-#    seen_bnd_keys = set()
-    # form set of keys of atoms connected to atm_key
-#    excl_bnd_keys = atm_bnd_keys_dct[atm_key]
-#    if bnd_key in excl_bnd_keys:
-#        excl_bnd_keys = excl_bnd_keys - {bnd_key}
-#    print('excl_bnd_keys:', excl_bnd_keys)
-#    new_bnd_keys = {bnd_key}
-#    bnd_ngb_keys_dct = bond_neighbor_keys(xgr)
-#    print('bnd_ngb_keys_dct:', bnd_ngb_keys_dct)
-#    if bnd_key not in bnd_ngb_keys_dct:
-#        for bnd in bnd_ngb_keys_dct:
-#            atmi, atmj = list(bnd)
-#            if atmi in list(ts_bnd) or atmj in list(ts_bnd):
-#                bnds = list(bnd_ngb_keys_dct[bnd])
-#                bnds.append(ts_bnd)
-#                bnd_ngb_keys_dct[bnd] = frozenset(bnds)
-#        bnd_ngb_keys_dct[bnd_key] = bond_neighbor_bonds(bnd_key, xgr)
-#    if saddle and bnd_key != ts_bnd:
-#        for bnd in bnd_ngb_keys_dct:
-#            atmi, atmj = list(bnd)
-#            if atmi in list(ts_bnd) or atmj in list(ts_bnd):
-#                bnds = list(bnd_ngb_keys_dct[bnd])
-#                bnds.append(ts_bnd)
-#                bnd_ngb_keys_dct[bnd] = frozenset(bnds)
-#        bnd_ngb_keys_dct[ts_bnd] = bond_neighbor_bonds(ts_bnd, xgr)
+    (for saddle points, `bnd_key` may be the forming or breaking bond, which
+    isn't in the graph; the rest of the branch is always made of graph bonds)
+
+    :param ts_bnd: deprecated and ignored; the forming or breaking bond is
+        never needed beyond `bnd_key`
+    """
     bnd_key = frozenset(bnd_key)
     assert atm_key in bnd_key
     if not saddle:
-        assert bnd_key in bond_keys(xgr)
-
-    #print('xgr test:', xgr)
-    #print('atm_key:', atm_key)
-    #print('bnd_key:', bnd_key)
-    #print('saddle:', saddle)
-    #print('ts_bnd:', ts_bnd)
+        assert bnd_key in bonds(xgr)
 
-    atm_bnd_keys_dct = atom_bond_keys(xgr)
+    atm_ngb_keys_dct, atm_bnd_keys_dct = _adjacency_index(xgr)
+    ngb_key, = bnd_key - {atm_key}
+    bnch_atm_keys = _branch_atom_keys(atm_ngb_keys_dct, atm_key, ngb_key)
 
+    excl_bnd_keys = atm_bnd_keys_dct[atm_key]
     bnch_bnd_keys = {bnd_key}
-    seen_bnd_keys = set()
-    excl_bnd_keys = atm_bnd_keys_dct[atm_key] - {bnd_key}
-
-    new_bnd_keys = {bnd_key}
-
-    #print('new_bnd_keys:', new_bnd_keys)
-    bnd_ngb_keys_dct = bond_neighbor_keys(xgr)
-    #print('bnd_ngb_keys_dct:', bnd_ngb_keys_dct)
-    if ts_bnd:
-        bnd_ngb_keys_dct[ts_bnd] = bond_neighbor_bonds(ts_bnd, xgr)
-    #print('updated bnd_ngb_keys_dct:', bnd_ngb_keys_dct)
-    while new_bnd_keys:
-        new_bnd_ngb_keys = set(
-            itertools.chain(
-                *dict_.values_by_key(bnd_ngb_keys_dct, new_bnd_keys)))
-        bnch_bnd_keys.update(new_bnd_ngb_keys - excl_bnd_keys)
-        seen_bnd_keys.update(new_bnd_keys)
-        new_bnd_keys = bnch_bnd_keys - seen_bnd_keys
-
-    #print('branch bond keys:', bnch_bnd_keys)
-
+    for bnch_atm_key in bnch_atm_keys:
+        bnch_bnd_keys.update(atm_bnd_keys_dct[bnch_atm_key] - excl_bnd_keys)
     return frozenset(bnch_bnd_keys)
 
 
+def all_branches(xgr, bnd_keys=None):
+    """ atom keys for the branches on either side of each bond
+
+    returns a dictionary `{bnd_key: {atm_key: bnch_atm_keys}}`, where
+    `bnch_atm_keys` equals `branch_atom_keys(xgr, atm_key, bnd_key)`; the
+    branches of acyclic bonds are read off of a single depth-first search,
+    so only ring bonds need a search of their own
+
+    :param bnd_keys: the bonds to get branches for (defaults to all of them)
+    """
+    bnd_keys = bond_keys(xgr) if bnd_keys is None else bnd_keys
+    bnd_keys = list(map(frozenset, bnd_keys))
+    assert set(bnd_keys) <= bond_keys(xgr)
+
+    atm_ngb_keys_dct, _ = _adjacency_index(xgr)
+    pre_dct, end_dct, par_dct, ord_atm_keys, bdg_keys = _bridge_search(
+        atm_ngb_keys_dct)
+
+    # parents precede their children in preorder
+    root_dct = {}
+    for atm_key in ord_atm_keys:
+        par_key = par_dct[atm_key]
+        root_dct[atm_key] = atm_key if par_key is None else root_dct[par_key]
+
+    def _subtree(atm_key):
+        return frozenset(ord_atm_keys[pre_dct[atm_key]:end_dct[atm_key]])
+
+    bnch_dct = {}
+    for bnd_key in bnd_keys:
+        atm1_key, atm2_key = bnd_key
+        if bnd_key in bdg_keys:
+            # for bridges, one side is the DFS subtree of the child atom
+            if par_dct[atm2_key] != atm1_key:
+                atm1_key, atm2_key = atm2_key, atm1_key
+            bnch1_atm_keys = _subtree(atm2_key)
+            bnch2_atm_keys = (_subtree(root_dct[atm1_key]) -
+                              bnch1_atm_keys)
+        else:
+            bnch1_atm_keys = frozenset(
+                _branch_atom_keys(atm_ngb_keys_dct, atm1_key, atm2_key))
+            bnch2_atm_keys = frozenset(
+                _branch_atom_keys(atm_ngb_keys_dct, atm2_key, atm1_key))
+        bnch_dct[bnd_key] = {atm1_key: bnch1_atm_keys,
+                             atm2_key: bnch2_atm_keys}
+    return bnch_dct
+
+
+def _branch_atom_keys(atm_ngb_keys_dct, atm_key, ngb_key):
+    """ atoms reachable from `ngb_key` without passing through `atm_key`
+    """
+    bnch_atm_keys = {ngb_key}
+    queue = collections.deque([ngb_key])
+    while queue:
+        for key in atm_ngb_keys_dct[queue.popleft()]:
+            if key != atm_key and key not in bnch_atm_keys:
+                bnch_atm_keys.add(key)
+                queue.append(key)
+    return bnch_atm_keys
+
+
+def _bridge_search(atm_ngb_keys_dct):
+    """ iterative depth-first search for the bridges (acyclic bonds)
+
+    returns preorder indices, subtree end indices, and DFS parents by atom,
+    the atoms in preorder, and the bridges; the subtree of an atom is the
+    preorder slice from its index to its end index
+    """
+    pre_dct = {}
+    low_dct = {}
+    end_dct = {}
+    par_dct = {}
+    ord_atm_keys = []
+    bdg_keys = set()
+    for root_key in sorted(atm_ngb_keys_dct):
+        if root_key in pre_dct:
+            continue
+
+        par_dct[root_key] = None
+        pre_dct[root_key] = low_dct[root_key] = len(ord_atm_keys)
+        ord_atm_keys.append(root_key)
+        stack = [(root_key, iter(sorted(atm_ngb_keys_dct[root_key])))]
+        while stack:
+            atm_key, ngb_keys = stack[-1]
+            ngb_key = next(ngb_keys, None)
+            if ngb_key is None:
+                stack.pop()
+                end_dct[atm_key] = len(ord_atm_keys)
+                par_key = par_dct[atm_key]
+                if par_key is not None:
+                    low_dct[par_key] = min(low_dct[par_key], low_dct[atm_key])
+                    if low_dct[atm_key] > pre_dct[par_key]:
+                        bdg_keys.add(frozenset({par_key, atm_key}))
+            elif ngb_key not in pre_dct:
+                par_dct[ngb_key] = atm_key
+                pre_dct[ngb_key] = low_dct[ngb_key] = len(ord_atm_keys)
+                ord_atm_keys.append(ngb_key)
+                stack.append((ngb_key, iter(sorted(atm_ngb_keys_dct[ngb_key]))))
+            elif ngb_key != par_dct[atm_key]:
+                low_dct[atm_key] = min(low_dct[atm_key], pre_dct[ngb_key])
+    return pre_dct, end_dct, par_dct, ord_atm_keys, bdg_keys
+
+
 def rings(xgr):
     """ rings in the graph (minimal basis)
     """
@@ -426,57 +467,93 @@ def rings(xgr):
 def rings_sorted_atom_keys(xgr):
     """ atom keys for each ring in the graph sorted by connectivity (minimal basis)
     """
-    def _sorted_ring_atom_keys(rng_bnd_keys):
-        rng_bnd_keys = list(rng_bnd_keys)
-        bnd_key = min(rng_bnd_keys, key=sorted)
-        first_atm_key, atm_key = sorted(bnd_key)
-        rng_bnd_keys.remove(bnd_key)
-        rng_atm_keys = [first_atm_key, atm_key]
-        while rng_bnd_keys:
-            bnd_key = next(filter(lambda x: atm_key in x, rng_bnd_keys))
-            rng_bnd_keys.remove(bnd_key)
-            bnd_key = set(bnd_key)
-            bnd_key.remove(atm_key)
-            atm_key = next(iter(bnd_key))
-            rng_atm_keys.append(atm_key)
-        rng_atm_keys.pop(-1)
-        rng_atm_keys = tuple(rng_atm_keys)
-        return rng_atm_keys
-
-    rng_atm_keys_lst = frozenset(
-        map(_sorted_ring_atom_keys, rings_bond_keys(xgr)))
-    return rng_atm_keys_lst
+    rng_atm_keys_lst, _, _, _ = _ring_perception(xgr)
+    return frozenset(rng_atm_keys_lst)
 
 
 def rings_bond_keys(xgr):
     """ bond keys for each ring in the graph (minimal basis)
     """
-    bnd_keys = bond_keys(xgr)
+    _, rng_bnd_keys_lst, _, _ = _ring_perception(xgr)
+    return frozenset(rng_bnd_keys_lst)
+
+
+def atom_ring_memberships(xgr):
+    """ the number of rings each atom belongs to, by atom (minimal basis)
+    """
+    _, _, atm_rng_sizes_dct, _ = _ring_perception(xgr)
+    return dict_.transform_values(atm_rng_sizes_dct, len)
 
-    def _ring_bond_keys(rng_atm_keys):
-        return frozenset(filter(lambda x: x <= rng_atm_keys, bnd_keys))
 
-    nxg = _networkx.from_graph(xgr)
-    rng_atm_keys_lst = _networkx.minimum_cycle_basis(nxg)
-    rng_bnd_keys_lst = frozenset(map(_ring_bond_keys, rng_atm_keys_lst))
-    return rng_bnd_keys_lst
+def bond_ring_memberships(xgr):
+    """ the number of rings each bond belongs to, by bond (minimal basis)
+    """
+    _, _, _, bnd_rng_sizes_dct = _ring_perception(xgr)
+    return dict_.transform_values(bnd_rng_sizes_dct, len)
 
 
+def atom_smallest_ring_sizes(xgr):
+    """ the size of the smallest ring containing each atom, by atom (minimal
+    basis; None for atoms that aren't in a ring)
+    """
+    _, _, atm_rng_sizes_dct, _ = _ring_perception(xgr)
+    return dict_.transform_values(
+        atm_rng_sizes_dct, lambda x: min(x) if x else None)
+
+
+def bond_smallest_ring_sizes(xgr):
+    """ the size of the smallest ring containing each bond, by bond (minimal
+    basis; None for bonds that aren't in a ring)
+    """
+    _, _, _, bnd_rng_sizes_dct = _ring_perception(xgr)
+    return dict_.transform_values(
+        bnd_rng_sizes_dct, lambda x: min(x) if x else None)
+
+
+@_memoized(key=_connectivity_key)
+def _ring_perception(xgr):
+    """ ring atom keys, ring bond keys, and ring sizes by atom and by bond
+
+    (rings are perceived once per connectivity and shared by all of the ring
+    functions)
+    """
+    rng_atm_keys_lst = _smallest_rings(xgr)
+    rng_bnd_keys_lst = tuple(
+        frozenset(map(frozenset, zip(rng_atm_keys,
+                                     rng_atm_keys[1:] + rng_atm_keys[:1])))
+        for rng_atm_keys in rng_atm_keys_lst)
+
+    atm_rng_sizes_dct = {atm_key: () for atm_key in atom_keys(xgr)}
+    bnd_rng_sizes_dct = {bnd_key: () for bnd_key in bond_keys(xgr)}
+    for rng_atm_keys, rng_bnd_keys in zip(rng_atm_keys_lst, rng_bnd_keys_lst):
+        rng_size = len(rng_atm_keys)
+        for atm_key in rng_atm_keys:
+            atm_rng_sizes_dct[atm_key] += (rng_size,)
+        for bnd_key in rng_bnd_keys:
+            bnd_rng_sizes_dct[bnd_key] += (rng_size,)
+
+    return (rng_atm_keys_lst, rng_bnd_keys_lst, atm_rng_sizes_dct,
+            bnd_rng_sizes_dct)
+
+
+@_memoized
 def connected_components(xgr):
     """ connected components in the graph
     """
-    cmp_xgr_atm_keys_lst = connected_components_atom_keys(xgr)
-    cmp_xgrs = tuple(subgraph(xgr, cmp_xgr_atm_keys)
-                     for cmp_xgr_atm_keys in cmp_xgr_atm_keys_lst)
+    cmp_xgrs, = _connected_components_batch([xgr])
     return cmp_xgrs
 
 
 def connected_components_atom_keys(xgr):
     """ atom keys for each connected component in the graph
+
+    (components are ordered by their first atom in the atom dictionary)
     """
-    nxg = _networkx.from_graph(xgr)
-    cmp_xgr_atm_keys_lst = _networkx.connected_component_atom_keys(nxg)
-    return cmp_xgr_atm_keys_lst
+    atm_cmp_idx_dct, ncmps = _component_indices(xgr)
+    cmp_xgr_atm_keys_lst = [set() for _ in range(ncmps)]
+    for atm_key, cmp_idx in atm_cmp_idx_dct.items():
+        cmp_xgr_atm_keys_lst[cmp_idx].add(atm_key)
+    return tuple(map(frozenset, cmp_xgr_atm_keys_lst))
 
 
 def union(xgr1, xgr2):
@@ -490,7 +567,7 @@ def union(xgr1, xgr2):
     bnd_dct = {}
     bnd_dct.update(bonds(xgr1))
     bnd_dct.update(bonds(xgr2))
-    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+    return _create.from_trusted_atoms_and_bonds(atm_dct, bnd_dct)
 
 
 def subgraph(xgr, atm_keys):
@@ -501,7 +578,7 @@ def subgraph(xgr, atm_keys):
     bnd_keys = set(filter(lambda x: x <= atm_keys, bond_keys(xgr)))
     atm_dct = dict_.by_key(atoms(xgr), atm_keys)
     bnd_dct = dict_.by_key(bonds(xgr), bnd_keys)
-    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+    return _create.from_trusted_atoms_and_bonds(atm_dct, bnd_dct)
 
 
 def bond_induced_subgraph(xgr, bnd_keys, saddle=False):
@@ -514,7 +591,7 @@ def bond_induced_subgraph(xgr, bnd_keys, saddle=False):
         assert bnd_keys <= bond_keys(xgr)
     atm_dct = dict_.by_key(atoms(xgr), atm_keys)
     bnd_dct = dict_.by_key(bonds(xgr), bnd_keys)
-    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+    return _create.from_trusted_atoms_and_bonds(atm_dct, bnd_dct)
 
 
 # # transformations
@@ -531,13 +608,9 @@ def remove_atoms(xgr, atm_keys):
 def remove_bonds(xgr, bnd_keys):
     """ remove bonds from the molecular graph
     """
-    all_bnd_keys = bond_keys(xgr)
-    bnd_keys = set(bnd_keys)
-    assert bnd_keys <= all_bnd_keys
-    bnd_keys = all_bnd_keys - bnd_keys
-    atm_dct = atoms(xgr)
-    bnd_dct = dict_.by_key(bonds(xgr), bnd_keys)
-    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+    edt = _GraphEditor(xgr)
+    edt.remove_bonds(bnd_keys)
+    return edt.graph()
 
 
 def without_dummy_atoms(xgr):
@@ -559,11 +632,17 @@ def atom_explicit_hydrogen_valences(xgr):
 def atom_explicit_hydrogen_keys(xgr):
     """ explicit hydrogen valences, by atom
     """
-    def _explicit_hydrogen_keys(atm_key, atm_nbh):
-        return frozenset(explicit_hydrogen_keys(atm_nbh) - {atm_key})
+    hyd_keys = dict_.keys_by_value(atom_symbols(xgr), lambda x: x == 'H')
+
+    def _explicit_hydrogen_keys(atm_key, atm_ngb_keys):
+        # within the neighborhood of a hydrogen, only the neighboring
+        # hydrogens with higher keys count as explicit
+        if atm_key in hyd_keys:
+            atm_ngb_keys = frozenset(k for k in atm_ngb_keys if k > atm_key)
+        return atm_ngb_keys & hyd_keys
 
     atm_exp_hyd_keys_dct = dict_.transform_items_to_values(
-        atom_neighborhoods(xgr), _explicit_hydrogen_keys)
+        atom_neighbor_keys(xgr), _explicit_hydrogen_keys)
     return atm_exp_hyd_keys_dct
 
 
@@ -593,15 +672,9 @@ def explicit_hydrogen_keys(xgr):
 def add_atom_explicit_hydrogen_keys(xgr, atm_exp_hyd_keys_dct):
     """ add explicit hydrogens by atom
     """
-    assert set(atm_exp_hyd_keys_dct.keys()) <= atom_keys(xgr)
-    for atm_key, atm_exp_hyd_keys in atm_exp_hyd_keys_dct.items():
-        assert not set(atm_exp_hyd_keys) & atom_keys(xgr)
-        atm_exp_hyd_bnd_keys = {frozenset({atm_key, atm_exp_hyd_key})
-                                for atm_exp_hyd_key in atm_exp_hyd_keys}
-        atm_exp_hyd_sym_dct = dict_.by_key({}, atm_exp_hyd_keys, fill_val='H')
-        xgr = add_atoms(xgr, atm_exp_hyd_sym_dct)
-        xgr = add_bonds(xgr, atm_exp_hyd_bnd_keys)
-    return xgr
+    edt = _GraphEditor(xgr)
+    edt.add_atom_explicit_hydrogen_keys(atm_exp_hyd_keys_dct)
+    return edt.graph()
 
 
 def implicit(xgr, atm_keys=None):
@@ -612,12 +685,11 @@ def implicit(xgr, atm_keys=None):
     atm_exp_hyd_keys_dct = dict_.by_key(
         atom_explicit_hydrogen_keys(xgr), atm_keys)
 
-    inc_imp_hyd_keys_dct = dict_.transform_values(atm_exp_hyd_keys_dct, len)
-    xgr = add_atom_implicit_hydrogen_valences(xgr, inc_imp_hyd_keys_dct)
-
-    exp_hyd_keys = set(itertools.chain(*atm_exp_hyd_keys_dct.values()))
-    xgr = remove_atoms(xgr, exp_hyd_keys)
-    return xgr
+    edt = _GraphEditor(xgr)
+    edt.add_atom_implicit_hydrogen_valences(
+        dict_.transform_values(atm_exp_hyd_keys_dct, len))
+    edt.remove_atoms(set(itertools.chain(*atm_exp_hyd_keys_dct.values())))
+    return edt.graph()
 
 
 def explicit(xgr, atm_keys=None):
@@ -625,31 +697,38 @@ def explicit(xgr, atm_keys=None):
     """
     atm_keys = backbone_keys(xgr) if atm_keys is None else atm_keys
     atm_keys = sorted(atm_keys)
-    atm_imp_hyd_vlc_dct = dict_.by_key(
-        atom_implicit_hydrogen_valences(xgr), atm_keys)
+    atm_dct = atoms(xgr)
 
     atm_exp_hyd_keys_dct = {}
-    next_atm_key = max(atom_keys(xgr)) + 1
+    next_atm_key = max(atm_dct) + 1
     for atm_key in atm_keys:
-        imp_hyd_vlc = atm_imp_hyd_vlc_dct[atm_key]
+        imp_hyd_vlc = atm_dct[atm_key][ATM_IMP_HYD_VLC_POS]
         atm_exp_hyd_keys_dct[atm_key] = set(
             range(next_atm_key, next_atm_key+imp_hyd_vlc))
         next_atm_key += imp_hyd_vlc
 
-    xgr = set_atom_implicit_hydrogen_valences(
-        xgr, dict_.by_key({}, atm_keys, fill_val=0))
-    xgr = add_atom_explicit_hydrogen_keys(xgr, atm_exp_hyd_keys_dct)
-    return xgr
+    edt = _GraphEditor(xgr)
+    edt.set_atom_implicit_hydrogen_valences(dict.fromkeys(atm_keys, 0))
+    edt.add_atom_explicit_hydrogen_keys(atm_exp_hyd_keys_dct)
+    return edt.graph()
+
+
+def _is_explicit(xgr):
+    """ are the hydrogens at all backbone atoms explicit?
+
+    (equivalent to `xgr == explicit(xgr)`, without building the graph)
+    """
+    atm_imp_hyd_vlc_dct = atom_implicit_hydrogen_valences(xgr)
+    return not any(atm_imp_hyd_vlc_dct[atm_key]
+                   for atm_key in backbone_keys(xgr))
 
 
 # # comparisons
 def full_isomorphism(xgr1, xgr2):
     """ full graph isomorphism
     """
-    assert xgr1 == explicit(xgr1) and xgr2 == explicit(xgr2)
-    nxg1 = _networkx.from_graph(xgr1)
-    nxg2 = _networkx.from_graph(xgr2)
-    iso_dct = _networkx.isomorphism(nxg1, nxg2)
+    assert _is_explicit(xgr1) and _is_explicit(xgr2)
+    iso_dct = _isomorphism(xgr1, xgr2)
     return iso_dct
 
 
@@ -667,26 +746,38 @@ def backbone_isomorphism(xgr1, xgr2):
     """
     xgr1 = implicit(xgr1)
     xgr2 = implicit(xgr2)
-    nxg1 = _networkx.from_graph(xgr1)
-    nxg2 = _networkx.from_graph(xgr2)
-    iso_dct = _networkx.isomorphism(nxg1, nxg2)
+    iso_dct = _isomorphism(xgr1, xgr2)
     return iso_dct
 
 
 def backbone_unique(xgrs):
     """ unique non-isomorphic graphs from a series
     """
-    xgrs = _unique(xgrs, equiv=backbone_isomorphic)
+    xgrs = _unique(xgrs, equiv=backbone_isomorphic, key=backbone_hash)
     return xgrs
 
 
-def _unique(itms, equiv):
+def backbone_hash(xgr):
+    """ a hash of the graph backbone, which is equal for backbone isomorphs
+    """
+    return _canonical_hash(implicit(xgr))
+
+
+def _unique(itms, equiv, key=None):
     """ unique items from a list, according to binary comparison `equiv`
+
+    if given, `key` must be equal for equivalent items; items are then only
+    compared against unique items with the same key
     """
     uniq_itms = []
+    uniq_itms_dct = {}
     for itm in itms:
-        if not any(map(functools.partial(equiv, itm), uniq_itms)):
-            uniq_itms.append(itm)
+        bkt_itms = uniq_itms if key is None else uniq_itms_dct.setdefault(
+            key(itm), [])
+        if not any(map(functools.partial(equiv, itm), bkt_itms)):
+            bkt_itms.append(itm)
+            if key is not None:
+                uniq_itms.append(itm)
 
     return tuple(uniq_itms)
 
@@ -716,44 +807,73 @@ LONE_PAIR_COUNTS_DCT = {
     18: 4,  # He
 }
 
+# periodic table groups, by element symbol (filled in as they come up)
+_GROUP_DCT = {}
+
 
 # # atom properties
 def atom_element_valences(xgr):
     """ element valences (# possible single bonds), by atom
     """
-    atm_sym_dct = atom_symbols(xgr)
-    atm_group_idx_dct = dict_.transform_values(atm_sym_dct, pt.to_group)
-    atm_elem_vlc_dct = dict_.transform_values(atm_group_idx_dct,
-                                              VALENCE_DCT.__getitem__)
+    atm_dct = atoms(xgr)
+    atm_elem_vlc_dct = {
+        atm_key: VALENCE_DCT[_element_group(atm_dct[atm_key][ATM_SYM_POS])]
+        for atm_key in atom_keys(xgr)}
     return atm_elem_vlc_dct
 
 
 def atom_lone_pair_counts(xgr):
     """ lone pair counts, by atom
     """
-    atm_sym_dct = atom_symbols(xgr)
-    atm_group_idx_dct = dict_.transform_values(atm_sym_dct, pt.to_group)
-    atm_lpc_dct = dict_.transform_values(atm_group_idx_dct,
-                                         LONE_PAIR_COUNTS_DCT.__getitem__)
-    atm_lpc_dct = dict_.transform_values(atm_lpc_dct, int)
+    atm_dct = atoms(xgr)
+    atm_lpc_dct = {
+        atm_key: int(LONE_PAIR_COUNTS_DCT[
+            _element_group(atm_dct[atm_key][ATM_SYM_POS])])
+        for atm_key in atom_keys(xgr)}
     return atm_lpc_dct
 
 
 def atom_bond_valences(xgr, bond_order=True):
     """ bond count (bond valence), by atom
+
+    (implicit hydrogens on backbone atoms count as single bonds)
     """
-    atm_keys = list(atom_keys(xgr))
-    xgr = explicit(xgr)
-    if not bond_order:
-        xgr = without_bond_orders(xgr)
+    atm_dct = atoms(xgr)
+    atm_keys = atom_keys(xgr)
 
-    atm_nbhs = dict_.values_by_key(atom_neighborhoods(xgr), atm_keys)
-    atm_bnd_vlcs = [sum(bond_orders(nbh).values()) for nbh in atm_nbhs]
-    atm_bnd_vlc_dct = dict_.transform_values(
-        dict(zip(atm_keys, atm_bnd_vlcs)), int)
+    # only backbone atoms get their implicit hydrogens counted; explicit
+    # hydrogens with implicit hydrogens of their own are rare enough that
+    # the backbone keys are only worked out when there are some
+    atm_imp_hyd_vlc_dct = {
+        atm_key: atm_dct[atm_key][ATM_IMP_HYD_VLC_POS] for atm_key in atm_keys}
+    if any(atm_dct[atm_key][ATM_SYM_POS] == 'H' and vlc
+           for atm_key, vlc in atm_imp_hyd_vlc_dct.items()):
+        for atm_key in explicit_hydrogen_keys(xgr):
+            atm_imp_hyd_vlc_dct[atm_key] = 0
+
+    atm_bnd_vlc_dct = atm_imp_hyd_vlc_dct
+    for bnd_key, bnd_val in bonds(xgr).items():
+        bnd_ord = bnd_val[BND_ORD_POS]
+        if not bond_order and bnd_ord != 0:
+            bnd_ord = 1
+        for atm_key in bnd_key:
+            atm_bnd_vlc_dct[atm_key] += bnd_ord
+
+    atm_bnd_vlc_dct = dict_.transform_values(atm_bnd_vlc_dct, int)
     return atm_bnd_vlc_dct
 
 
+def _element_group(sym):
+    """ the periodic table group of an element
+
+    (looked up once per symbol)
+    """
+    if sym not in _GROUP_DCT:
+        _GROUP_DCT[sym] = pt.to_group(sym)
+    return _GROUP_DCT[sym]
+
+
+@_memoized
 def atom_unsaturated_valences(xgr, bond_order=True):
     """ unsaturated valences, by atom
 
@@ -829,10 +949,10 @@ def bond_symmetry_numbers(xgr, frm_bnd_key, brk_bnd_key):
             nei_tfr = neighbor_dct[tfr_atm]
 
             gra = xgr[0]
-            all_hyds = []
+            all_hyds = set()
             for atm in gra:
                 if gra[atm][0] == 'H':
-                    all_hyds.append(atm)
+                    all_hyds.add(atm)
         else:
             nei_tfr = {}
 
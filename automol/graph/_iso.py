@@ -0,0 +1,176 @@
+""" isomorphisms of molecular graphs
+
+a backtracking matcher working directly on the graph dictionaries: pairs of
+graphs are first screened on cheap invariants, then atoms are only matched
+within their refinement classes, in an order that keeps each new atom
+connected to the atoms matched before it
+"""
+import collections
+from automol.graph._canon import refinement as _refinement
+from automol.graph._comp import component_indices as _component_indices
+
+
+def isomorphism(xgr1, xgr2):
+    """ an isomorphism mapping the atom keys of `xgr1` onto those of `xgr2`
+
+    (atoms and bonds must match in all of their properties; returns None if
+    the graphs aren't isomorphic)
+    """
+    return next(isomorphisms(xgr1, xgr2), None)
+
+
+def isomorphisms(xgr1, xgr2):
+    """ iterate over the isomorphisms mapping `xgr1` onto `xgr2`
+    """
+    if not _invariants_match(xgr1, xgr2):
+        return
+
+    cls_dct1, invs1 = _refinement(xgr1)
+    cls_dct2, invs2 = _refinement(xgr2)
+    if invs1 != invs2:
+        return
+
+    for iso_dct in class_isomorphisms(xgr1, xgr2, cls_dct1, cls_dct2):
+        yield iso_dct
+
+
+def _invariants_match(xgr1, xgr2):
+    """ do these graphs agree on the cheap invariants?
+
+    (atom and bond counts, atom and bond types, degrees and ring counts)
+    """
+    atm_dct1, bnd_dct1 = xgr1
+    atm_dct2, bnd_dct2 = xgr2
+    if len(atm_dct1) != len(atm_dct2) or len(bnd_dct1) != len(bnd_dct2):
+        return False
+
+    if (collections.Counter(atm_dct1.values()) !=
+            collections.Counter(atm_dct2.values())):
+        return False
+
+    if (collections.Counter(bnd_dct1.values()) !=
+            collections.Counter(bnd_dct2.values())):
+        return False
+
+    if _degrees(xgr1) != _degrees(xgr2):
+        return False
+
+    return _component_count(xgr1) == _component_count(xgr2)
+
+
+def class_isomorphisms(xgr1, xgr2, cls_dct1, cls_dct2):
+    """ iterate over the isomorphisms that map each atom onto an atom of the
+    same class
+
+    (a backtracking search; the classes must be numbered consistently, as
+    they are by refinement when the two graphs' invariants agree)
+    """
+    atm_dct2, _ = xgr2
+    ngb_dct1 = _neighbor_bonds(xgr1)
+    ngb_dct2 = _neighbor_bonds(xgr2)
+
+    cls_keys_dct2 = {}
+    for atm_key in sorted(atm_dct2):
+        cls_keys_dct2.setdefault(cls_dct2[atm_key], []).append(atm_key)
+
+    cls_sizes = {cls: len(keys) for cls, keys in cls_keys_dct2.items()}
+    ord_keys1 = _match_order(ngb_dct1, cls_dct1, cls_sizes)
+
+    iso_dct = {}
+    inv_iso_dct = {}
+
+    def _candidates(atm_key1):
+        """ atoms of xgr2 that atm_key1 can be mapped onto, given iso_dct
+        """
+        mpd_ngbs1 = [(iso_dct[ngb_key1], bnd_val)
+                     for ngb_key1, bnd_val in ngb_dct1[atm_key1].items()
+                     if ngb_key1 in iso_dct]
+        for atm_key2 in cls_keys_dct2[cls_dct1[atm_key1]]:
+            if atm_key2 in inv_iso_dct:
+                continue
+
+            ngbs2 = ngb_dct2[atm_key2]
+            if all(ngbs2.get(ngb_key2) == bnd_val
+                   for ngb_key2, bnd_val in mpd_ngbs1) and (
+                       sum(ngb_key2 in inv_iso_dct for ngb_key2 in ngbs2)
+                       == len(mpd_ngbs1)):
+                yield atm_key2
+
+    natms = len(ord_keys1)
+    if not natms:
+        yield {}
+        return
+
+    stack = [_candidates(ord_keys1[0])]
+    while stack:
+        idx = len(stack) - 1
+        atm_key1 = ord_keys1[idx]
+        if atm_key1 in iso_dct:
+            del inv_iso_dct[iso_dct.pop(atm_key1)]
+
+        atm_key2 = next(stack[-1], None)
+        if atm_key2 is None:
+            stack.pop()
+            continue
+
+        iso_dct[atm_key1] = atm_key2
+        inv_iso_dct[atm_key2] = atm_key1
+        if idx + 1 == natms:
+            yield dict(iso_dct)
+        else:
+            stack.append(_candidates(ord_keys1[idx + 1]))
+
+
+def _match_order(ngb_dct, cls_dct, cls_sizes):
+    """ the order in which to match atoms
+
+    each atom is picked from those with the most already-ordered neighbors,
+    preferring small classes, so that candidates are pruned as early as
+    possible
+    """
+    ord_keys = []
+    nmpd_dct = dict.fromkeys(ngb_dct, 0)
+
+    def _priority(atm_key):
+        return (-nmpd_dct[atm_key], cls_sizes[cls_dct[atm_key]], atm_key)
+
+    rem_keys = set(ngb_dct)
+    while rem_keys:
+        atm_key = min(rem_keys, key=_priority)
+        rem_keys.remove(atm_key)
+        ord_keys.append(atm_key)
+        for ngb_key in ngb_dct[atm_key]:
+            nmpd_dct[ngb_key] += 1
+    return ord_keys
+
+
+def _neighbor_bonds(xgr):
+    """ bond values to each neighbor, by atom
+    """
+    atm_dct, bnd_dct = xgr
+    ngb_dct = {atm_key: {} for atm_key in atm_dct}
+    for bnd_key, bnd_val in bnd_dct.items():
+        atm1_key, atm2_key = bnd_key
+        ngb_dct[atm1_key][atm2_key] = bnd_val
+        ngb_dct[atm2_key][atm1_key] = bnd_val
+    return ngb_dct
+
+
+def _degrees(xgr):
+    """ the sorted degree sequence
+    """
+    atm_dct, bnd_dct = xgr
+    deg_dct = dict.fromkeys(atm_dct, 0)
+    for atm1_key, atm2_key in bnd_dct:
+        deg_dct[atm1_key] += 1
+        deg_dct[atm2_key] += 1
+    return sorted(deg_dct.values())
+
+
+def _component_count(xgr):
+    """ the number of connected components
+
+    (given equal atom and bond counts, this fixes the number of rings)
+    """
+    _, ncmps = _component_indices(xgr)
+    return ncmps
@@ -1,13 +1,20 @@
 """ networkx interface
+
+(networkx is imported on first use, since it is slow to import and only a few
+graph functions need it)
 """
-import networkx
+import importlib
+
+
+def _networkx():
+    return importlib.import_module('networkx')
 
 
 def from_graph(xgr):
     """ networkx graph object from a molecular graph
     """
     atms, bnds = xgr
-    nxg = networkx.Graph()
+    nxg = _networkx().Graph()
     for atm_key, atm_vals in atms.items():
         nxg.add_node(atm_key, props=atm_vals)
     for bnd_key, bnd_val in bnds.items():
@@ -16,17 +23,37 @@ def from_graph(xgr):
     return nxg
 
 
+def from_edges(edges):
+    """ networkx graph object from a list of edges (pairs of nodes)
+    """
+    nxg = _networkx().Graph()
+    nxg.add_edges_from(edges)
+    return nxg
+
+
 def minimum_cycle_basis(nxg):
     """ minimum cycle basis for the graph
     """
-    rng_atm_keys_lst = networkx.algorithms.cycles.minimum_cycle_basis(nxg)
+    rng_atm_keys_lst = _networkx().algorithms.cycles.minimum_cycle_basis(nxg)
     return frozenset(map(frozenset, rng_atm_keys_lst))
 
 
 def connected_component_atom_keys(nxg):
     """ atom keys for the connected components in this graph
     """
-    return tuple(map(frozenset, networkx.algorithms.connected_components(nxg)))
+    cmp_atm_keys_lst = _networkx().algorithms.connected_components(nxg)
+    return tuple(map(frozenset, cmp_atm_keys_lst))
+
+
+def maximum_matching(nxg):
+    """ a maximum-cardinality matching of the graph
+
+    :returns: the matched edges
+    :rtype: frozenset[frozenset]
+    """
+    edges = _networkx().algorithms.matching.max_weight_matching(
+        nxg, maxcardinality=True)
+    return frozenset(map(frozenset, edges))
 
 
 def isomorphism(nxg1, nxg2):
@@ -36,7 +63,7 @@ def isomorphism(nxg1, nxg2):
     def _same_props(dct1, dct2):
         return dct1['props'] == dct2['props']
 
-    matcher = networkx.algorithms.isomorphism.GraphMatcher(
+    matcher = _networkx().algorithms.isomorphism.GraphMatcher(
         nxg1, nxg2, node_match=_same_props, edge_match=_same_props)
 
     iso_dct = None
@@ -1,15 +1,16 @@
 """ resonance graph library
 """
-import itertools
 import functools
 import numpy
 from automol import dict_
+from automol.graph._cache import memoized as _memoized
+from automol.graph._edit import GraphEditor as _GraphEditor
+from automol.graph import _networkx as _nx
 from automol.graph._graph import frozen as _frozen
 from automol.graph._graph import atom_keys as _atom_keys
 from automol.graph._graph import atoms as _atoms
 from automol.graph._graph import bond_keys as _bond_keys
 from automol.graph._graph import bond_orders as _bond_orders
-from automol.graph._graph import set_bond_orders as _set_bond_orders
 from automol.graph._graph import without_bond_orders as _without_bond_orders
 from automol.graph._graph import atom_bond_keys as _atom_bond_keys
 from automol.graph._graph import atom_neighbor_keys as _atom_neighbor_keys
@@ -19,13 +20,228 @@ from automol.graph._graph import (atom_unsaturated_valences as
 from automol.graph._graph import atom_bond_valences as _atom_bond_valences
 from automol.graph._graph import (atom_lone_pair_counts as
                                   _atom_lone_pair_counts)
-from automol.graph._graph import (maximum_spin_multiplicity as
-                                  _maximum_spin_multiplicity)
 from automol.graph._graph import explicit as _explicit
 from automol.graph._graph import (atom_explicit_hydrogen_valences as
                                   _atom_explicit_hydrogen_valences)
 
 
+# resonance analysis
+class ResonanceAnalysis():
+    """ resonance-derived properties of a graph, from a single enumeration
+    of its dominant resonances
+
+    each property is computed the first time it is asked for, so asking for
+    several of them only enumerates the resonances once
+
+    usage:
+        ana = ResonanceAnalysis(rgr)
+        atm_hyb_dct = ana.atom_hybridizations()
+        bnd_ords_dct = ana.bond_orders()
+    """
+
+    def __init__(self, rgr):
+        self._rgr = rgr
+        self._vals = {}
+
+    def _value(self, name, func):
+        """ compute a property the first time it is asked for, then keep it
+
+        (dictionaries are copied on the way out, so that callers can't
+        corrupt the kept values)
+        """
+        if name not in self._vals:
+            self._vals[name] = func()
+        val = self._vals[name]
+        return dict(val) if isinstance(val, dict) else val
+
+    def graph(self):
+        """ the graph being analyzed
+        """
+        return self._rgr
+
+    def dominant_resonances(self):
+        """ all dominant (minimum spin/maximum pi) resonance graphs
+        """
+        return self._value('dom_rgrs', self._dominant_resonances)
+
+    def _dominant_resonances(self):
+        return dominant_resonances(self._rgr)
+
+    # atom properties
+    def atom_hybridizations(self):
+        """ resonance-dominant atom hybridizations, by atom
+        """
+        return self._value('atm_hybs', self._atom_hybridizations)
+
+    def _atom_hybridizations(self):
+        atm_keys = list(_atom_keys(self._rgr))
+        atm_hybs_by_res = [
+            dict_.values_by_key(atom_hybridizations(dom_rgr), atm_keys)
+            for dom_rgr in self.dominant_resonances()]
+        atm_hybs = [min(hybs) for hybs in zip(*atm_hybs_by_res)]
+        atm_hyb_dct = dict(zip(atm_keys, atm_hybs))
+        return atm_hyb_dct
+
+    def atom_centered_cumulene_keys(self):
+        """ resonance dominant keys for atom-centered cumulenes
+
+        (see `resonance_dominant_atom_centered_cumulene_keys`)
+        """
+        return self._value('atm_cum_keys', self._atom_centered_cumulene_keys)
+
+    def _atom_centered_cumulene_keys(self):
+        cum_keys = set()
+        for cum_chain in self._cumulene_chains():
+            size = len(cum_chain)
+            if size % 2 == 1:
+                cum_keys.add(
+                    (frozenset({cum_chain[0], cum_chain[-1]}),
+                     cum_chain[size // 2])
+                )
+        cum_keys = frozenset(cum_keys)
+        return cum_keys
+
+    def bond_centered_cumulene_keys(self):
+        """ resonance dominant keys for bond-centered cumulenes
+
+        (see `resonance_dominant_bond_centered_cumulene_keys`)
+        """
+        return self._value('bnd_cum_keys', self._bond_centered_cumulene_keys)
+
+    def _bond_centered_cumulene_keys(self):
+        cum_keys = set()
+        for cum_chain in self._cumulene_chains():
+            size = len(cum_chain)
+            if size % 2 == 0:
+                cum_keys.add(
+                    (frozenset({cum_chain[0], cum_chain[-1]}),
+                     frozenset({cum_chain[size // 2 - 1],
+                                cum_chain[size // 2]}))
+                )
+        cum_keys = frozenset(cum_keys)
+        return cum_keys
+
+    def _cumulene_chains(self):
+        return self._value('cum_chains', lambda: _cumulene_chains(
+            self._rgr, self.atom_hybridizations()))
+
+    def radical_atom_keys(self):
+        """ resonance-dominant radical atom keys
+
+        (keys of resonance-dominant radical sites)
+        """
+        return self._value('rad_keys', self._radical_atom_keys)
+
+    def _radical_atom_keys(self):
+        atm_keys = list(_atom_keys(self._rgr))
+        atm_rad_vlcs_by_res = [
+            dict_.values_by_key(_atom_unsaturated_valences(dom_rgr), atm_keys)
+            for dom_rgr in self.dominant_resonances()]
+        atm_rad_vlcs = [max(rad_vlcs)
+                        for rad_vlcs in zip(*atm_rad_vlcs_by_res)]
+        atm_rad_keys = frozenset(atm_key for atm_key, atm_rad_vlc
+                                 in zip(atm_keys, atm_rad_vlcs) if atm_rad_vlc)
+        return atm_rad_keys
+
+    def single_resonance_radical_atom_keys(self):
+        """ resonance-dominant radical atom keys, for one resonance
+        """
+        return self._value(
+            'sing_res_rad_keys', self._single_resonance_radical_atom_keys)
+
+    def _single_resonance_radical_atom_keys(self):
+        dom_rgr = self.dominant_resonances()[0]
+        atm_rad_keys = frozenset(
+            atm_key for atm_key, atm_rad_vlc
+            in _atom_unsaturated_valences(dom_rgr).items() if atm_rad_vlc)
+        return atm_rad_keys
+
+    # bond properties
+    def bond_orders(self):
+        """ resonance-dominant bond orders, by bond
+        """
+        return self._value('bnd_ords', self._bond_orders)
+
+    def _bond_orders(self):
+        bnd_keys = list(_bond_keys(self._rgr))
+        bnd_ords_by_res = [
+            dict_.values_by_key(_bond_orders(dom_rgr), bnd_keys)
+            for dom_rgr in self.dominant_resonances()]
+        bnd_ords_lst = list(map(frozenset, zip(*bnd_ords_by_res)))
+        bnd_dom_res_ords_dct = dict(zip(bnd_keys, bnd_ords_lst))
+        return bnd_dom_res_ords_dct
+
+    def single_resonance_bond_orders(self):
+        """ resonance-dominant bond orders, by bond, for one resonance
+        """
+        return self._value(
+            'sing_res_bnd_ords', self._single_resonance_bond_orders)
+
+    def _single_resonance_bond_orders(self):
+        dom_rgr = self.dominant_resonances()[0]
+        bnd_ord_dct = _bond_orders(dom_rgr)
+        return {bnd_key: frozenset({bnd_ord_dct[bnd_key]})
+                for bnd_key in _bond_keys(self._rgr)}
+
+    def average_bond_orders(self):
+        """ resonance-averaged bond orders, by bond
+        """
+        return self._value('avg_bnd_ords', self._average_bond_orders)
+
+    def _average_bond_orders(self):
+        bnd_keys = list(_bond_keys(self._rgr))
+        bnd_ords_by_res = [
+            dict_.values_by_key(_bond_orders(dom_rgr), bnd_keys)
+            for dom_rgr in self.dominant_resonances()]
+        nres = len(bnd_ords_by_res)
+        bnd_ords_lst = zip(*bnd_ords_by_res)
+        avg_bnd_ord_lst = [sum(bnd_ords)/nres for bnd_ords in bnd_ords_lst]
+        avg_bnd_ord_dct = dict(zip(bnd_keys, avg_bnd_ord_lst))
+        return avg_bnd_ord_dct
+
+    def rotational_bond_keys(self, with_h_rotors=True):
+        """ rotational bonds (the graph must be explicit)
+        """
+        return self._value(
+            ('rot_bnd_keys', with_h_rotors),
+            lambda: self._rotational_bond_keys(with_h_rotors))
+
+    def _rotational_bond_keys(self, with_h_rotors):
+        xgr = self._rgr
+        atm_bnd_vlc_dct = _atom_bond_valences(xgr, bond_order=False)
+        atm_exp_hyd_vlc_dct = _atom_explicit_hydrogen_valences(xgr)
+        res_dom_bnd_ords_dct = self.bond_orders()
+
+        bnd_keys = []
+        for bnd_key, bnd_ords in res_dom_bnd_ords_dct.items():
+            if all(bnd_ord <= 1 for bnd_ord in bnd_ords):
+                atm_keys = list(bnd_key)
+                bnd_ord = min(bnd_ords)
+                rot_vlcs = numpy.array(
+                    list(map(atm_bnd_vlc_dct.__getitem__, atm_keys)))
+                rot_vlcs -= bnd_ord
+                if not with_h_rotors:
+                    atm_exp_hyd_vlcs = numpy.array(list(
+                        map(atm_exp_hyd_vlc_dct.__getitem__, atm_keys)))
+                    rot_vlcs -= atm_exp_hyd_vlcs
+                if all(rot_vlcs):
+                    bnd_keys.append(bnd_key)
+
+        return frozenset(bnd_keys)
+
+
+@_memoized
+def resonance_analysis(rgr):
+    """ the resonance analysis of a graph
+
+    (while the graph property cache is on, calls for the same graph share
+    one analysis, and so one enumeration of its resonances)
+
+    :rtype: ResonanceAnalysis
+    """
+    return ResonanceAnalysis(rgr)
+
+
 # atom properties
 def atom_hybridizations(rgr):
     """ atom hybridizations, by atom
@@ -47,13 +263,7 @@ def atom_hybridizations(rgr):
 def resonance_dominant_atom_hybridizations(rgr):
     """ resonance-dominant atom hybridizations, by atom
     """
-    atm_keys = list(_atom_keys(rgr))
-    atm_hybs_by_res = [
-        dict_.values_by_key(atom_hybridizations(dom_rgr), atm_keys)
-        for dom_rgr in dominant_resonances(rgr)]
-    atm_hybs = [min(hybs) for hybs in zip(*atm_hybs_by_res)]
-    atm_hyb_dct = dict(zip(atm_keys, atm_hybs))
-    return atm_hyb_dct
+    return resonance_analysis(rgr).atom_hybridizations()
 
 
 def resonance_dominant_atom_centered_cumulene_keys(rgr):
@@ -64,17 +274,7 @@ def resonance_dominant_atom_centered_cumulene_keys(rgr):
     where the first pair contains the sp2 atoms at the cumulene ends and
     `cent_atm_key` is the key of the central atom
     """
-    cum_chains = _cumulene_chains(rgr)
-    cum_keys = set()
-    for cum_chain in cum_chains:
-        size = len(cum_chain)
-        if size % 2 == 1:
-            cum_keys.add(
-                (frozenset({cum_chain[0], cum_chain[-1]}),
-                 cum_chain[size // 2])
-            )
-    cum_keys = frozenset(cum_keys)
-    return cum_keys
+    return resonance_analysis(rgr).atom_centered_cumulene_keys()
 
 
 def resonance_dominant_bond_centered_cumulene_keys(rgr):
@@ -86,20 +286,9 @@ def resonance_dominant_bond_centered_cumulene_keys(rgr):
     where the first pair contains the sp2 atoms at the cumulene ends and the
     second pair is the bond key for the central bond
     """
-    cum_chains = _cumulene_chains(rgr)
-    cum_keys = set()
-    for cum_chain in cum_chains:
-        size = len(cum_chain)
-        if size % 2 == 0:
-            cum_keys.add(
-                (frozenset({cum_chain[0], cum_chain[-1]}),
-                 frozenset({cum_chain[size // 2 - 1], cum_chain[size // 2]}))
-            )
-    cum_keys = frozenset(cum_keys)
-    return cum_keys
-
-def _cumulene_chains(rgr):
-    atm_hyb_dct = resonance_dominant_atom_hybridizations(rgr)
+    return resonance_analysis(rgr).bond_centered_cumulene_keys()
+
+def _cumulene_chains(rgr, atm_hyb_dct):
     sp1_atm_keys = dict_.keys_by_value(atm_hyb_dct, lambda x: x == 1)
     sp2_atm_keys = dict_.keys_by_value(atm_hyb_dct, lambda x: x == 2)
 
@@ -138,65 +327,32 @@ def resonance_dominant_radical_atom_keys(rgr):
 
     (keys of resonance-dominant radical sites)
     """
-    atm_keys = list(_atom_keys(rgr))
-    atm_rad_vlcs_by_res = [
-        dict_.values_by_key(_atom_unsaturated_valences(dom_rgr), atm_keys)
-        for dom_rgr in dominant_resonances(rgr)]
-    atm_rad_vlcs = [max(rad_vlcs) for rad_vlcs in zip(*atm_rad_vlcs_by_res)]
-    atm_rad_keys = frozenset(atm_key for atm_key, atm_rad_vlc
-                             in zip(atm_keys, atm_rad_vlcs) if atm_rad_vlc)
-    return atm_rad_keys
+    return resonance_analysis(rgr).radical_atom_keys()
+
 
 def sing_res_dom_radical_atom_keys(rgr):
     """ resonance-dominant radical atom keys,for one resonance
     """
-    atm_keys = list(_atom_keys(rgr))
-    atm_rad_vlcs_by_res = [
-        dict_.values_by_key(_atom_unsaturated_valences(dom_rgr), atm_keys)
-        for dom_rgr in dominant_resonances(rgr)]
-    first_atm_rad_val = [atm_rad_vlcs_by_res[0]]
-    atm_rad_vlcs = [max(rad_vlcs) for rad_vlcs in zip(*first_atm_rad_val)]
-    atm_rad_keys = frozenset(atm_key for atm_key, atm_rad_vlc
-                             in zip(atm_keys, atm_rad_vlcs) if atm_rad_vlc)
-    return atm_rad_keys
+    return resonance_analysis(rgr).single_resonance_radical_atom_keys()
 
 
 # bond properties
 def resonance_dominant_bond_orders(rgr):
     """ resonance-dominant bond orders, by bond
     """
-    bnd_keys = list(_bond_keys(rgr))
-    bnd_ords_by_res = [
-        dict_.values_by_key(_bond_orders(dom_rgr), bnd_keys)
-        for dom_rgr in dominant_resonances(rgr)]
-    bnd_ords_lst = list(map(frozenset, zip(*bnd_ords_by_res)))
-    bnd_dom_res_ords_dct = dict(zip(bnd_keys, bnd_ords_lst))
-    return bnd_dom_res_ords_dct
+    return resonance_analysis(rgr).bond_orders()
+
 
 def one_resonance_dominant_bond_orders(rgr):
     """ resonance-dominant bond orders, by bond
     """
-    bnd_keys = list(_bond_keys(rgr))
-    bnd_ords_by_res = [
-        dict_.values_by_key(_bond_orders(dom_rgr), bnd_keys)
-        for dom_rgr in dominant_resonances(rgr)]
-    first_bnd_ords = [bnd_ords_by_res[0] ]
-    bnd_ords_lst = list(map(frozenset, zip(*first_bnd_ords)))
-    bnd_dom_res_ords_dct = dict(zip(bnd_keys, bnd_ords_lst))
-    return bnd_dom_res_ords_dct
+    return resonance_analysis(rgr).single_resonance_bond_orders()
+
 
 def resonance_avg_bond_orders(rgr):
     """ resonance-dominant bond orders, by bond
     """
-    bnd_keys = list(_bond_keys(rgr))
-    bnd_ords_by_res = [
-        dict_.values_by_key(_bond_orders(dom_rgr), bnd_keys)
-        for dom_rgr in dominant_resonances(rgr)]
-    nres = len(bnd_ords_by_res)
-    bnd_ords_lst = zip(*bnd_ords_by_res)
-    avg_bnd_ord_lst = [sum(bnd_ords)/nres for bnd_ords in bnd_ords_lst]
-    avg_bnd_ord_dct = dict(zip(bnd_keys, avg_bnd_ord_lst))
-    return avg_bnd_ord_dct
+    return resonance_analysis(rgr).average_bond_orders()
 
 
 # transformations
@@ -206,13 +362,19 @@ def dominant_resonance(rgr):
     return next(iter(dominant_resonances(rgr)))
 
 
+@_memoized
 def dominant_resonances(rgr):
     """ all dominant (minimum spin/maximum pi) resonance graphs
+
+    (the most pi bonds a graph can take is found by matching, and only the
+    resonances with that many pi bonds are enumerated)
     """
-    rgrs = resonances(rgr)
-    mult_min = min(map(_maximum_spin_multiplicity, rgrs))
+    rgr = _without_bond_orders(rgr)
+    npi = sum(_maximum_pi_bond_increments(rgr).values())
+    add_pi_bonds_ = functools.partial(_add_pi_bonds, rgr)
+    bnd_ord_inc_dct_itr = _pi_bond_increments(rgr, npi=npi)
     dom_rgrs = tuple(
-        rgr for rgr in rgrs if _maximum_spin_multiplicity(rgr) == mult_min)
+        sorted(map(add_pi_bonds_, bnd_ord_inc_dct_itr), key=_frozen))
     return dom_rgrs
 
 
@@ -225,42 +387,140 @@ def resonances(rgr):
 def subresonances(rgr):
     """ this connected graph and its lower-spin (more pi-bonded) resonances
     """
-    def _inc_range(bnd_cap):
-        return tuple(range(0, bnd_cap+1))
-
     add_pi_bonds_ = functools.partial(_add_pi_bonds, rgr)
+    bnd_ord_inc_dct_itr = _pi_bond_increments(rgr)
+    rgrs = tuple(sorted(map(add_pi_bonds_, bnd_ord_inc_dct_itr), key=_frozen))
+    return rgrs
 
-    atm_keys = list(_atom_keys(rgr))
+
+def _pi_bond_increments(rgr, npi=None):
+    """ the valid ways of adding pi bonds to this graph, as bond order
+    increments by bond
+
+    (generated lazily, by backtracking: pi bonds are assigned bond by bond,
+    and an increment is only tried if both atoms have enough unsaturated
+    valence left for it and the bond order stays below 4, which should only
+    affect C2)
+
+    :param npi: only generate the ways of adding this many pi bonds
+        (branches that can't reach this many are cut)
+    :type npi: int
+    """
+    atm_unsat_vlc_dct = dict(_atom_unsaturated_valences(rgr))
+    bnd_ord_dct = _bond_orders(rgr)
     bnd_keys = list(_bond_keys(rgr))
-    atm_unsat_vlcs = dict_.values_by_key(
-        _atom_unsaturated_valences(rgr), atm_keys)
-    atm_bnd_keys_lst = dict_.values_by_key(_atom_bond_keys(rgr), atm_keys)
-    bnd_caps = dict_.values_by_key(_bond_capacities(rgr), bnd_keys)
+    bnd_cap_dct = _bond_capacities(rgr)
+    pi_bnd_keys = _connected_order(
+        [bnd_key for bnd_key in bnd_keys if bnd_cap_dct[bnd_key]])
+    bnd_ord_inc_dct = dict.fromkeys(bnd_keys, 0)
+
+    # the pi capacity left on each atom's unassigned bonds, for the bound
+    atm_rem_cap_dct = dict.fromkeys(atm_unsat_vlc_dct, 0)
+    for bnd_key in pi_bnd_keys:
+        for atm_key in bnd_key:
+            atm_rem_cap_dct[atm_key] += bnd_cap_dct[bnd_key]
+
+    def _bound():
+        """ an upper bound on the pi bonds the unassigned bonds can take
+        (each takes up unsaturated valence on two atoms)
+        """
+        return sum(min(atm_unsat_vlc_dct[atm_key], rem_cap)
+                   for atm_key, rem_cap in atm_rem_cap_dct.items()) // 2
+
+    def _assign(pos, count):
+        if npi is not None and count + _bound() < npi:
+            return
+
+        if pos == len(pi_bnd_keys):
+            if npi is None or count == npi:
+                yield dict(bnd_ord_inc_dct)
+            return
+
+        bnd_key = pi_bnd_keys[pos]
+        atm1_key, atm2_key = bnd_key
+        max_inc = min(atm_unsat_vlc_dct[atm1_key],
+                      atm_unsat_vlc_dct[atm2_key],
+                      3 - bnd_ord_dct[bnd_key])
+        atm_rem_cap_dct[atm1_key] -= bnd_cap_dct[bnd_key]
+        atm_rem_cap_dct[atm2_key] -= bnd_cap_dct[bnd_key]
+        for inc in range(max_inc + 1):
+            bnd_ord_inc_dct[bnd_key] = inc
+            atm_unsat_vlc_dct[atm1_key] -= inc
+            atm_unsat_vlc_dct[atm2_key] -= inc
+            for inc_dct in _assign(pos + 1, count + inc):
+                yield inc_dct
+            atm_unsat_vlc_dct[atm1_key] += inc
+            atm_unsat_vlc_dct[atm2_key] += inc
+        atm_rem_cap_dct[atm1_key] += bnd_cap_dct[bnd_key]
+        atm_rem_cap_dct[atm2_key] += bnd_cap_dct[bnd_key]
+        bnd_ord_inc_dct[bnd_key] = 0
+
+    return _assign(0, 0)
+
+
+def _connected_order(bnd_keys):
+    """ order bonds so that each one (after the first in its component)
+    shares an atom with an earlier one
+
+    (this way, atoms are finished early during backtracking, which keeps
+    the bound tight)
+    """
+    bnd_keys = sorted(bnd_keys, key=sorted)
+    ord_bnd_keys = []
+    seen_atm_keys = set()
+    while bnd_keys:
+        nxt_bnd_key = next(
+            (bnd_key for bnd_key in bnd_keys if bnd_key & seen_atm_keys),
+            bnd_keys[0])
+        bnd_keys.remove(nxt_bnd_key)
+        ord_bnd_keys.append(nxt_bnd_key)
+        seen_atm_keys |= nxt_bnd_key
+    return ord_bnd_keys
+
+
+def _maximum_pi_bond_increments(rgr):
+    """ *a* way of adding the most pi bonds to this graph, as bond order
+    increments by bond
+
+    this is a b-matching problem: each atom can take as many pi bonds as
+    it has unsaturated valences, and each bond as many as its capacity; it
+    is solved as a maximum matching on an expanded graph with one node per
+    unsaturated valence and a pair of nodes per possible pi bond:
+
+        (atm1, i) -- (bnd, k, atm1) -- (bnd, k, atm2) -- (atm2, j)
+
+    a maximum matching covers each pair of bond nodes by its middle edge
+    or by one outer edge (no pi bond), or by both outer edges (a pi bond),
+    so it is larger than the number of pairs by the number of pi bonds
+    """
+    atm_unsat_vlc_dct = _atom_unsaturated_valences(rgr)
     bnd_ord_dct = _bond_orders(rgr)
-
-    def _is_valid(bnd_ord_inc_dct):
-        # check if pi bonds exceed unsaturated valences
-        def __tally(atm_bnd_keys):
-            return sum(dict_.values_by_key(bnd_ord_inc_dct, atm_bnd_keys))
-        atm_unsat_vlc_decs = tuple(map(__tally, atm_bnd_keys_lst))
-        enough_elecs = numpy.all(
-            numpy.less_equal(atm_unsat_vlc_decs, atm_unsat_vlcs))
-        # check if all bond orders are less than 4 (should only affect C2)
-        bnd_inc_keys = bnd_ord_inc_dct.keys()
-        bnd_incs = dict_.values_by_key(bnd_ord_inc_dct, bnd_inc_keys)
-        bnd_ords = dict_.values_by_key(bnd_ord_dct, bnd_inc_keys)
-        new_bnd_ords = numpy.add(bnd_ords, bnd_incs)
-        not_too_many = numpy.all(numpy.less(new_bnd_ords, 4))
-        return enough_elecs and not_too_many
-
-    def _bond_value_dictionary(bnd_vals):
-        return dict(zip(bnd_keys, bnd_vals))
-
-    bnd_ord_incs_itr = itertools.product(*map(_inc_range, bnd_caps))
-    bnd_ord_inc_dct_itr = map(_bond_value_dictionary, bnd_ord_incs_itr)
-    bnd_ord_inc_dct_itr = filter(_is_valid, bnd_ord_inc_dct_itr)
-    rgrs = tuple(sorted(map(add_pi_bonds_, bnd_ord_inc_dct_itr), key=_frozen))
-    return rgrs
+    bnd_cap_dct = _bond_capacities(rgr)
+
+    edges = []
+    for bnd_key, bnd_cap in bnd_cap_dct.items():
+        bnd_cap = min(bnd_cap, 3 - bnd_ord_dct[bnd_key])
+        atm1_key, atm2_key = sorted(bnd_key)
+        for idx in range(bnd_cap):
+            edges.append(((bnd_key, idx, atm1_key), (bnd_key, idx, atm2_key)))
+            for atm_key in (atm1_key, atm2_key):
+                edges.extend(((atm_key, vlc_idx), (bnd_key, idx, atm_key))
+                             for vlc_idx in range(atm_unsat_vlc_dct[atm_key]))
+    nxg = _nx.from_edges(edges)
+
+    # find the pairs of bond nodes that are both matched to atom nodes
+    out_nodes = set()
+    for edge in _nx.maximum_matching(nxg):
+        bnd_nodes = [node for node in edge if len(node) == 3]
+        if len(bnd_nodes) == 1:
+            out_nodes.update(bnd_nodes)
+
+    bnd_ord_inc_dct = dict.fromkeys(bnd_ord_dct, 0)
+    for bnd_key, idx, atm_key in out_nodes:
+        if atm_key == min(bnd_key) and (
+                (bnd_key, idx, max(bnd_key)) in out_nodes):
+            bnd_ord_inc_dct[bnd_key] += 1
+    return bnd_ord_inc_dct
 
 
 def _bond_capacities(rgr):
@@ -280,16 +540,9 @@ def _bond_capacities(rgr):
 def _add_pi_bonds(rgr, bnd_ord_inc_dct):
     """ add pi bonds to this graph
     """
-    bnd_keys = _bond_keys(rgr)
-    assert set(bnd_ord_inc_dct.keys()) <= bnd_keys
-
-    bnd_keys = list(bnd_keys)
-    bnd_ords = dict_.values_by_key(_bond_orders(rgr), bnd_keys)
-    bnd_ord_incs = dict_.values_by_key(bnd_ord_inc_dct, bnd_keys, fill_val=0)
-    new_bnd_ords = numpy.add(bnd_ords, bnd_ord_incs)
-    bnd_ord_dct = dict(zip(bnd_keys, new_bnd_ords))
-    rgr = _set_bond_orders(rgr, bnd_ord_dct)
-    return rgr
+    edt = _GraphEditor(rgr)
+    edt.increment_bond_orders(bnd_ord_inc_dct)
+    return edt.graph()
 
 
 # other utilities
@@ -297,23 +550,4 @@ def rotational_bond_keys(xgr, with_h_rotors=True):
     """ determine rotational bonds in this molecular graph
     """
     xgr = _explicit(xgr)
-    atm_bnd_vlc_dct = _atom_bond_valences(xgr, bond_order=False)
-    atm_exp_hyd_vlc_dct = _atom_explicit_hydrogen_valences(xgr)
-    res_dom_bnd_ords_dct = resonance_dominant_bond_orders(xgr)
-
-    bnd_keys = []
-    for bnd_key, bnd_ords in res_dom_bnd_ords_dct.items():
-        if all(bnd_ord <= 1 for bnd_ord in bnd_ords):
-            atm_keys = list(bnd_key)
-            bnd_ord = min(bnd_ords)
-            rot_vlcs = numpy.array(
-                list(map(atm_bnd_vlc_dct.__getitem__, atm_keys)))
-            rot_vlcs -= bnd_ord
-            if not with_h_rotors:
-                atm_exp_hyd_vlcs = numpy.array(list(
-                    map(atm_exp_hyd_vlc_dct.__getitem__, atm_keys)))
-                rot_vlcs -= atm_exp_hyd_vlcs
-            if all(rot_vlcs):
-                bnd_keys.append(bnd_key)
-
-    return frozenset(bnd_keys)
+    return resonance_analysis(xgr).rotational_bond_keys(with_h_rotors)
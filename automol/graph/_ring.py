@@ -0,0 +1,159 @@
+""" ring perception
+
+the smallest set of smallest rings (SSSR) is found as a minimum cycle basis
+with Horton's algorithm: for every atom and bond, the cycle formed by the bond
+and the shortest paths to its ends is a candidate; candidates are taken
+shortest first, keeping those that are linearly independent (over GF(2)) of
+the ones kept so far, with bond sets stored as integer bit masks
+"""
+import collections
+
+
+def smallest_rings(xgr):
+    """ atom keys for each ring in the smallest set of smallest rings
+
+    each ring is ordered by connectivity, starting from the lower key of its
+    lowest bond and heading towards the other; the rings are sorted by size
+    and then by their atom keys
+    """
+    atm_ngb_keys_dct = _ring_core(xgr)
+    bnd_keys = sorted(
+        (frozenset({atm1_key, atm2_key})
+         for atm1_key, atm_ngb_keys in atm_ngb_keys_dct.items()
+         for atm2_key in atm_ngb_keys if atm1_key < atm2_key),
+        key=sorted)
+    bnd_bit_dct = {bnd_key: 1 << idx for idx, bnd_key in enumerate(bnd_keys)}
+
+    nrngs = (len(bnd_keys) - len(atm_ngb_keys_dct) +
+             _component_count(atm_ngb_keys_dct))
+    if not nrngs:
+        return ()
+
+    cands = sorted(_horton_candidates(atm_ngb_keys_dct),
+                   key=lambda x: (len(x), sorted(x)))
+
+    rng_atm_keys_lst = []
+    basis_dct = {}
+    seen_vecs = set()
+    for cand in cands:
+        vec = 0
+        for atm1_key, atm2_key in zip(cand, cand[1:] + cand[:1]):
+            vec |= bnd_bit_dct[frozenset({atm1_key, atm2_key})]
+
+        if vec in seen_vecs:
+            continue
+        seen_vecs.add(vec)
+
+        if _is_independent(vec, basis_dct):
+            rng_atm_keys_lst.append(_sorted_ring_atom_keys(cand))
+            if len(rng_atm_keys_lst) == nrngs:
+                break
+
+    return tuple(sorted(rng_atm_keys_lst, key=lambda x: (len(x), sorted(x))))
+
+
+def _ring_core(xgr):
+    """ neighbor keys by atom, after repeatedly stripping off terminal atoms
+
+    (every ring lies in the core, so the candidate search can skip the rest)
+    """
+    atm_dct, bnd_dct = xgr
+    atm_ngb_keys_dct = {atm_key: set() for atm_key in atm_dct}
+    for atm1_key, atm2_key in bnd_dct:
+        atm_ngb_keys_dct[atm1_key].add(atm2_key)
+        atm_ngb_keys_dct[atm2_key].add(atm1_key)
+
+    queue = [atm_key for atm_key, atm_ngb_keys in atm_ngb_keys_dct.items()
+             if len(atm_ngb_keys) < 2]
+    while queue:
+        atm_key = queue.pop()
+        if atm_key not in atm_ngb_keys_dct:
+            continue
+        for ngb_key in atm_ngb_keys_dct.pop(atm_key):
+            atm_ngb_keys_dct[ngb_key].remove(atm_key)
+            if len(atm_ngb_keys_dct[ngb_key]) < 2:
+                queue.append(ngb_key)
+    return atm_ngb_keys_dct
+
+
+def _horton_candidates(atm_ngb_keys_dct):
+    """ Horton's candidate cycles, as sequences of atom keys
+    """
+    for root_key in sorted(atm_ngb_keys_dct):
+        # breadth-first shortest path tree, visiting neighbors in key order
+        par_dct = {root_key: None}
+        queue = collections.deque([root_key])
+        while queue:
+            atm_key = queue.popleft()
+            for ngb_key in sorted(atm_ngb_keys_dct[atm_key]):
+                if ngb_key not in par_dct:
+                    par_dct[ngb_key] = atm_key
+                    queue.append(ngb_key)
+
+        for atm1_key, par1_key in par_dct.items():
+            for atm2_key in atm_ngb_keys_dct[atm1_key]:
+                is_tree_bnd = (par1_key == atm2_key or
+                               par_dct[atm2_key] == atm1_key)
+                if atm1_key > atm2_key or is_tree_bnd:
+                    continue
+
+                path1 = _tree_path(par_dct, atm1_key)
+                path2 = _tree_path(par_dct, atm2_key)
+                if set(path1) & set(path2) == {root_key}:
+                    yield tuple(path1 + path2[:0:-1])
+
+
+def _tree_path(par_dct, atm_key):
+    """ the path from the root of a shortest path tree down to this atom
+    """
+    path = [atm_key]
+    while par_dct[path[-1]] is not None:
+        path.append(par_dct[path[-1]])
+    return path[::-1]
+
+
+def _is_independent(vec, basis_dct):
+    """ reduce a bit vector against the basis, adding it if it is independent
+    """
+    while vec:
+        piv = vec.bit_length() - 1
+        if piv not in basis_dct:
+            basis_dct[piv] = vec
+            return True
+        vec ^= basis_dct[piv]
+    return False
+
+
+def _sorted_ring_atom_keys(rng_atm_keys):
+    """ reorder a ring to start at the lower key of its lowest bond, heading
+    towards the other key
+    """
+    rng_atm_keys = list(rng_atm_keys)
+    natms = len(rng_atm_keys)
+    bnd_keys = [sorted((rng_atm_keys[idx], rng_atm_keys[(idx + 1) % natms]))
+                for idx in range(natms)]
+    first_key, second_key = min(bnd_keys)
+    idx = rng_atm_keys.index(first_key)
+    if rng_atm_keys[(idx + 1) % natms] != second_key:
+        rng_atm_keys.reverse()
+        idx = rng_atm_keys.index(first_key)
+    return tuple(rng_atm_keys[idx:] + rng_atm_keys[:idx])
+
+
+def _component_count(atm_ngb_keys_dct):
+    """ the number of connected components
+    """
+    ncmps = 0
+    seen_keys = set()
+    for root_key in atm_ngb_keys_dct:
+        if root_key in seen_keys:
+            continue
+        ncmps += 1
+        seen_keys.add(root_key)
+        stack = [root_key]
+        while stack:
+            for ngb_key in atm_ngb_keys_dct[stack.pop()]:
+                if ngb_key not in seen_keys:
+                    seen_keys.add(ngb_key)
+                    stack.append(ngb_key)
+    return ncmps
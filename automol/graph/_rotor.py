@@ -0,0 +1,69 @@
+""" rotor analysis, for one species or many at once
+"""
+import collections
+import functools
+import multiprocessing
+from automol.graph._cache import memoized as _memoized
+from automol.graph._cache import graph_key as _graph_key
+from automol.graph._graph import explicit as _explicit
+from automol.graph._graph import all_branches as _all_branches
+from automol.graph._graph import (bond_symmetry_numbers as
+                                  _bond_symmetry_numbers)
+from automol.graph._res import rotational_bond_keys as _rotational_bond_keys
+
+Rotor = collections.namedtuple(
+    'Rotor', ['symmetry_number', 'branch_atom_keys'])
+
+
+@_memoized
+def rotors(xgr, with_h_rotors=True):
+    """ rotors, by bond
+
+    for each rotational bond, the (approximate) symmetry number of its
+    torsional potential and the atom keys of the branches on either side of
+    it, as `((atm_key, bnch_atm_keys), ...)` pairs sorted by atom key (see
+    `all_branches`)
+
+    (hydrogens are made explicit first, so the branches include them; the
+    rotors are immutable, so they can be cached and shared)
+
+    :rtype: dict[frozenset, Rotor]
+    """
+    xgr = _explicit(xgr)
+    rot_bnd_keys = _rotational_bond_keys(xgr, with_h_rotors=with_h_rotors)
+    bnd_sym_num_dct = _bond_symmetry_numbers(xgr, None, None)
+    bnd_bnch_dct = _all_branches(xgr, rot_bnd_keys)
+    rot_dct = {bnd_key: Rotor(bnd_sym_num_dct[bnd_key],
+                              tuple(sorted(bnd_bnch_dct[bnd_key].items())))
+               for bnd_key in rot_bnd_keys}
+    return rot_dct
+
+
+def rotors_batch(xgrs, with_h_rotors=True, nprocs=1):
+    """ rotors, by bond, for each graph in a series
+
+    species that come up more than once are only analyzed once, and the rest
+    are spread over a pool of processes
+
+    :param nprocs: the number of processes (with one, the default, the
+        graphs are analyzed here, through the graph property cache)
+    :type nprocs: int
+    :rtype: tuple[dict[frozenset, Rotor]]
+    """
+    xgrs = list(xgrs)
+    keys = list(map(_graph_key, xgrs))
+    uniq_xgr_dct = dict(zip(reversed(keys), reversed(xgrs)))
+    uniq_keys = list(uniq_xgr_dct)
+    uniq_xgrs = list(map(uniq_xgr_dct.__getitem__, uniq_keys))
+
+    rotors_ = functools.partial(rotors, with_h_rotors=with_h_rotors)
+    nprocs = min(nprocs, len(uniq_xgrs))
+    if nprocs > 1:
+        chunksize = len(uniq_xgrs) // (4 * nprocs) + 1
+        with multiprocessing.Pool(nprocs) as pool:
+            rot_dcts = pool.map(rotors_, uniq_xgrs, chunksize)
+    else:
+        rot_dcts = list(map(rotors_, uniq_xgrs))
+
+    rot_dct_dct = dict(zip(uniq_keys, rot_dcts))
+    return tuple(dict(rot_dct_dct[key]) for key in keys)
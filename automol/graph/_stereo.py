@@ -1,20 +1,27 @@
 """ stereo graph library
 """
 import itertools
-import functools
 import more_itertools as mit
 import numpy
 from qcelemental import constants as qcc
 from automol import dict_
 from automol import cart
 import automol.create.geom
+from automol.graph._cache import memoized as _memoized
+from automol.graph._symm import (automorphism_generators as
+                                 _automorphism_generators)
+from automol.graph._embed import (embed_atom_coordinates as
+                                  _embed_atom_coordinates)
 from automol.graph._res import (resonance_dominant_atom_hybridizations as
                                 _resonance_dominant_atom_hybridizations)
-from automol.graph._res import (resonance_dominant_bond_orders as
-                                _resonance_dominant_bond_orders)
+from automol.graph._res import resonance_analysis as _resonance_analysis
+from automol.graph._chain import longest_chain as _longest_chain
 from automol.graph._graph import atoms as _atoms
 from automol.graph._graph import bonds as _bonds
 from automol.graph._graph import atom_keys as _atom_keys
+from automol.graph._graph import backbone_keys as _backbone_keys
+from automol.graph._graph import (explicit_hydrogen_keys as
+                                  _explicit_hydrogen_keys)
 from automol.graph._graph import atom_symbols as _atom_symbols
 from automol.graph._graph import atom_stereo_parities as _atom_stereo_parities
 from automol.graph._graph import bond_stereo_parities as _bond_stereo_parities
@@ -33,13 +40,15 @@ from automol.graph._graph import atom_neighbor_keys as _atom_neighbor_keys
 from automol.graph._graph import branch as _branch
 from automol.graph._graph import explicit as _explicit
 from automol.graph._graph import implicit as _implicit
-from automol.graph._graph import backbone_keys as _backbone_keys
-from automol.graph._graph import (explicit_hydrogen_keys as
-                                  _explicit_hydrogen_keys)
-from automol.graph._graph import rings_bond_keys as _rings_bond_keys
+from automol.graph._graph import (bond_smallest_ring_sizes as
+                                  _bond_smallest_ring_sizes)
 from automol.graph._graph import (rings_sorted_atom_keys as
                                   _rings_sorted_atom_keys)
 from automol.graph._graph import connected_components as _connected_components
+from automol.graph._graph import (connected_components_atom_keys as
+                                  _connected_components_atom_keys)
+
+_PAR_CODE_DCT = {None: -1, False: 0, True: 1}
 
 
 def has_stereo(xgr):
@@ -68,50 +77,50 @@ def stereo_priority_vector(xgr, atm_key, atm_ngb_key):
     """ generates a sortable one-to-one representation of the branch extending
     from `atm_key` through its bonded neighbor `atm_ngb_key`
     """
-    bbn_keys = _backbone_keys(xgr)
-    exp_hyd_keys = _explicit_hydrogen_keys(xgr)
-
-    if atm_ngb_key not in bbn_keys:
-        assert atm_ngb_key in exp_hyd_keys
-        assert frozenset({atm_key, atm_ngb_key}) in _bonds(xgr)
+    assert frozenset({atm_key, atm_ngb_key}) in _bonds(xgr)
+    if atm_ngb_key not in _backbone_keys(xgr):
+        assert atm_ngb_key in _explicit_hydrogen_keys(xgr)
         pri_vec = ()
     else:
-        xgr = _implicit(xgr)
-        atm_dct = _atoms(xgr)
-        bnd_dct = _bonds(xgr)
-        assert atm_key in bbn_keys
-        assert frozenset({atm_key, atm_ngb_key}) in bnd_dct
-
         # here, switch to an implicit graph
-        atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
-
-        def _priority_vector(atm1_key, atm2_key, seen_keys):
-            # we keep a list of seen keys to cut off cycles, avoiding infinite
-            # loops
-
-            bnd_val = bnd_dct[frozenset({atm1_key, atm2_key})]
-            atm_val = atm_dct[atm2_key]
+        igr = _implicit(xgr)
+        pri_vec = _priority_vector(igr, _atom_neighbor_keys(igr), atm_key,
+                                   atm_ngb_key)
+    return pri_vec
 
-            bnd_val = _replace_nones_with_negative_infinity(bnd_val)
-            atm_val = _replace_nones_with_negative_infinity(atm_val)
 
-            if atm2_key in seen_keys:
-                ret = (bnd_val,)
+def _priority_vector(igr, atm_ngb_keys_dct, atm_key, atm_ngb_key):
+    """ the priority vector of a backbone branch, in an implicit graph
+    """
+    atm_dct = _atoms(igr)
+    bnd_dct = _bonds(igr)
+
+    def _vector(atm1_key, atm2_key, seen_keys):
+        # we keep a list of seen keys to cut off cycles, avoiding infinite
+        # loops
+
+        bnd_val = bnd_dct[frozenset({atm1_key, atm2_key})]
+        atm_val = atm_dct[atm2_key]
+
+        bnd_val = _replace_nones_with_negative_infinity(bnd_val)
+        atm_val = _replace_nones_with_negative_infinity(atm_val)
+
+        if atm2_key in seen_keys:
+            ret = (bnd_val,)
+        else:
+            seen_keys.update({atm1_key, atm2_key})
+            atm3_keys = atm_ngb_keys_dct[atm2_key] - {atm1_key}
+            if atm3_keys:
+                next_vals, seen_keys = zip(*[
+                    _vector(atm2_key, atm3_key, seen_keys)
+                    for atm3_key in atm3_keys])
+                ret = (bnd_val, atm_val) + next_vals
             else:
-                seen_keys.update({atm1_key, atm2_key})
-                atm3_keys = atm_ngb_keys_dct[atm2_key] - {atm1_key}
-                if atm3_keys:
-                    next_vals, seen_keys = zip(*[
-                        _priority_vector(atm2_key, atm3_key, seen_keys)
-                        for atm3_key in atm3_keys])
-                    ret = (bnd_val, atm_val) + next_vals
-                else:
-                    ret = (bnd_val, atm_val)
+                ret = (bnd_val, atm_val)
 
-            return ret, seen_keys
-
-        pri_vec, _ = _priority_vector(atm_key, atm_ngb_key, set())
+        return ret, seen_keys
 
+    pri_vec, _ = _vector(atm_key, atm_ngb_key, set())
     return pri_vec
 
 
@@ -119,142 +128,336 @@ def _replace_nones_with_negative_infinity(seq):
     return [-numpy.inf if val is None else val for val in seq]
 
 
+@_memoized
+def stereo_priority_ranks(xgr):
+    """ integer priority ranks of the branches extending from each atom
+    through each of its bonded neighbors
+
+    the branches are split into classes of equal priority by iterative
+    refinement, starting from the bond and the neighbor's atom values and
+    then comparing, round by round, the classes of the branches behind the
+    neighbor; at each atom, the distinct classes are then ordered by their
+    priority vectors (see `stereo_priority_vector`), and explicit hydrogen
+    branches rank lowest
+
+    these ranks define the neighbor order that stereo parities refer to (see
+    `stereo_sorted_atom_neighbor_keys`); they only compare between the
+    branches of one atom
+
+    :returns: ranks by (atom key, neighbor key) pair
+    :rtype: dict
+    """
+    igr = _implicit(xgr)
+    atm_dct = _atoms(igr)
+    atm_ngb_keys_dct = _atom_neighbor_keys(igr)
+
+    inv_dct = {}
+    for bnd_key, (bnd_ord, bnd_par) in _bonds(igr).items():
+        atm1_key, atm2_key = sorted(bnd_key)
+        bnd_inv = (bnd_ord, _PAR_CODE_DCT[bnd_par])
+        for key1, key2 in ((atm1_key, atm2_key), (atm2_key, atm1_key)):
+            sym, imp_hyd_vlc, atm_par = atm_dct[key2]
+            atm_inv = (sym, imp_hyd_vlc, _PAR_CODE_DCT[atm_par])
+            inv_dct[(key1, key2)] = (bnd_inv, atm_inv)
+
+    cls_dct, ncls = _ranks(inv_dct)
+    while True:
+        inv_dct = {
+            (key1, key2): (cls, tuple(sorted(
+                (cls_dct[(key2, key3)] for key3 in atm_ngb_keys_dct[key2]
+                 if key3 != key1), reverse=True)))
+            for (key1, key2), cls in cls_dct.items()}
+        prev_ncls = ncls
+        cls_dct, ncls = _ranks(inv_dct)
+        if ncls == prev_ncls:
+            break
+
+    # order the distinct classes at each atom by their priority vectors
+    # (branches of one class can have different vectors, so each class
+    # takes the lowest vector among its branches at the atom)
+    rnk_dct = {}
+    for atm_key, atm_ngb_keys in atm_ngb_keys_dct.items():
+        clss = sorted(set(cls_dct[(atm_key, atm_ngb_key)]
+                          for atm_ngb_key in atm_ngb_keys))
+        if len(clss) > 1:
+            vec_dct = {}
+            for atm_ngb_key in atm_ngb_keys:
+                cls = cls_dct[(atm_key, atm_ngb_key)]
+                vec = _priority_vector(igr, atm_ngb_keys_dct, atm_key,
+                                       atm_ngb_key)
+                vec_dct[cls] = min(vec_dct.get(cls, vec), vec)
+            clss = [cls for _, cls in sorted((vec_dct[cls], cls)
+                                             for cls in clss)]
+        rnk_dct.update({
+            (atm_key, atm_ngb_key): clss.index(cls_dct[(atm_key,
+                                                        atm_ngb_key)])
+            for atm_ngb_key in atm_ngb_keys})
+
+    for atm_key, atm_ngb_keys in _atom_neighbor_keys(xgr).items():
+        for atm_ngb_key in atm_ngb_keys - set(atm_ngb_keys_dct):
+            rnk_dct[(atm_key, atm_ngb_key)] = -1
+
+    return rnk_dct
+
+
+def _ranks(inv_dct):
+    """ ranks by key, numbered in order of the invariants
+    """
+    srt_invs = sorted(set(inv_dct.values()))
+    rnk_idx_dct = {inv: idx for idx, inv in enumerate(srt_invs)}
+    rnk_dct = {key: rnk_idx_dct[inv] for key, inv in inv_dct.items()}
+    return rnk_dct, len(srt_invs)
+
+
+@_memoized
 def stereogenic_atom_keys(xgr):
     """ (unassigned) stereogenic atoms in this graph
     """
     xgr = _without_bond_orders(xgr)
     xgr = _explicit(xgr)  # for simplicity, add the explicit hydrogens back in
-    atm_keys = dict_.keys_by_value(_atom_bond_valences(xgr), lambda x: x == 4)
-    atm_keys -= atom_stereo_keys(xgr)
-
     atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
-
-    def _is_stereogenic(atm_key):
-        atm_ngb_keys = list(atm_ngb_keys_dct[atm_key])
-        pri_vecs = [stereo_priority_vector(xgr, atm_key, atm_ngb_key)
-                    for atm_ngb_key in atm_ngb_keys]
-        return not any(pv1 == pv2
-                       for pv1, pv2 in itertools.combinations(pri_vecs, r=2))
-
-    ste_gen_atm_keys = frozenset(filter(_is_stereogenic, atm_keys))
+    rnk_dct = stereo_priority_ranks(xgr)
+    ste_gen_atm_keys = frozenset(
+        atm_key for atm_key in stereo_candidate_atom_keys(xgr)
+        if is_stereogenic_atom(atm_key, atm_ngb_keys_dct, rnk_dct))
     return ste_gen_atm_keys
 
 
+@_memoized
 def stereogenic_bond_keys(xgr):
     """ (unassigned) stereogenic bonds in this graph
     """
     xgr = _without_bond_orders(xgr)
     xgr = _explicit(xgr)  # for simplicity, add the explicit hydrogens back in
-    bnd_keys = dict_.keys_by_value(
-        _resonance_dominant_bond_orders(xgr), lambda x: 2 in x)
+    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
+    rnk_dct = stereo_priority_ranks(xgr)
+    ste_gen_bnd_keys = frozenset(
+        bnd_key for bnd_key in stereo_candidate_bond_keys(xgr)
+        if is_stereogenic_bond(bnd_key, atm_ngb_keys_dct, rnk_dct))
+    return ste_gen_bnd_keys
+
+
+def stereo_candidate_atom_keys(xgr):
+    """ unassigned atoms with four bonds, which are stereogenic unless two of
+    their branches tie
+
+    (expects an explicit graph without bond orders)
+    """
+    atm_keys = dict_.keys_by_value(_atom_bond_valences(xgr), lambda x: x == 4)
+    atm_keys -= atom_stereo_keys(xgr)
+    return atm_keys
+
+
+def stereo_candidate_bond_keys(xgr):
+    """ unassigned double bonds between sp^2 atoms, outside of small rings,
+    which are stereogenic unless the branches on either end tie
+
+    (expects an explicit graph without bond orders)
+    """
+    res_ana = _resonance_analysis(xgr)
+    bnd_keys = dict_.keys_by_value(res_ana.bond_orders(), lambda x: 2 in x)
 
     # make sure both ends are sp^2 (excludes cumulenes)
-    atm_hyb_dct = _resonance_dominant_atom_hybridizations(xgr)
+    atm_hyb_dct = res_ana.atom_hybridizations()
     sp2_atm_keys = dict_.keys_by_value(atm_hyb_dct, lambda x: x == 2)
     bnd_keys = frozenset({bnd_key for bnd_key in bnd_keys
                           if bnd_key <= sp2_atm_keys})
 
     bnd_keys -= bond_stereo_keys(xgr)
-    bnd_keys -= functools.reduce(  # remove double bonds in small rings
-        frozenset.union,
-        filter(lambda x: len(x) < 8, _rings_bond_keys(xgr)), frozenset())
+    bnd_keys -= dict_.keys_by_value(  # remove double bonds in small rings
+        _bond_smallest_ring_sizes(xgr), lambda x: x is not None and x < 8)
+    return bnd_keys
 
-    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
 
-    def _is_stereogenic(bnd_key):
-        atm1_key, atm2_key = bnd_key
+def is_stereogenic_atom(atm_key, atm_ngb_keys_dct, rnk_dct):
+    """ do the branches of this atom all have different priorities?
+    """
+    atm_ngb_keys = atm_ngb_keys_dct[atm_key]
+    rnks = set(rnk_dct[(atm_key, atm_ngb_key)]
+               for atm_ngb_key in atm_ngb_keys)
+    return len(rnks) == len(atm_ngb_keys)
 
-        def _is_symmetric_on_bond(atm_key, atm_ngb_key):
-            atm_ngb_keys = list(atm_ngb_keys_dct[atm_key] - {atm_ngb_key})
 
-            if not atm_ngb_keys:                # C=:O:
-                ret = True
-            elif len(atm_ngb_keys) == 1:        # C=N:-X
-                ret = False
-            else:
-                assert len(atm_ngb_keys) == 2   # C=C(-X)-Y
-                ret = (stereo_priority_vector(xgr, atm_key, atm_ngb_keys[0]) ==
-                       stereo_priority_vector(xgr, atm_key, atm_ngb_keys[1]))
+def is_stereogenic_bond(bnd_key, atm_ngb_keys_dct, rnk_dct):
+    """ do the branches on each end of this bond have different priorities?
+    """
+    atm1_key, atm2_key = bnd_key
 
-            return ret
+    def _is_symmetric_on_bond(atm_key, atm_ngb_key):
+        atm_ngb_keys = list(atm_ngb_keys_dct[atm_key] - {atm_ngb_key})
 
-        return not (_is_symmetric_on_bond(atm1_key, atm2_key) or
-                    _is_symmetric_on_bond(atm2_key, atm1_key))
+        if not atm_ngb_keys:                # C=:O:
+            ret = True
+        elif len(atm_ngb_keys) == 1:        # C=N:-X
+            ret = False
+        else:
+            assert len(atm_ngb_keys) == 2   # C=C(-X)-Y
+            ret = (rnk_dct[(atm_key, atm_ngb_keys[0])] ==
+                   rnk_dct[(atm_key, atm_ngb_keys[1])])
 
-    ste_gen_bnd_keys = frozenset(filter(_is_stereogenic, bnd_keys))
-    return ste_gen_bnd_keys
+        return ret
+
+    return not (_is_symmetric_on_bond(atm1_key, atm2_key) or
+                _is_symmetric_on_bond(atm2_key, atm1_key))
 
 
 def stereomers(xgr):
     """ all stereomers, ignoring this graph's assignments
     """
-    bool_vals = (False, True)
-
-    def _expand_atom_stereo(sgr):
-        atm_ste_keys = stereogenic_atom_keys(sgr)
-        nste_atms = len(atm_ste_keys)
-        sgrs = [_set_atom_stereo_parities(sgr, dict(zip(atm_ste_keys,
-                                                        atm_ste_par_vals)))
-                for atm_ste_par_vals
-                in itertools.product(bool_vals, repeat=nste_atms)]
-        return sgrs
-
-    def _expand_bond_stereo(sgr):
-        bnd_ste_keys = stereogenic_bond_keys(sgr)
-        nste_bnds = len(bnd_ste_keys)
-        sgrs = [_set_bond_stereo_parities(sgr, dict(zip(bnd_ste_keys,
-                                                        bnd_ste_par_vals)))
-                for bnd_ste_par_vals
-                in itertools.product(bool_vals, repeat=nste_bnds)]
-        return sgrs
-
-    last_sgrs = []
-    sgrs = [_without_stereo_parities(xgr)]
-
-    while sgrs != last_sgrs:
-        last_sgrs = sgrs
-        sgrs = list(itertools.chain(*map(_expand_atom_stereo, sgrs)))
-        sgrs = list(itertools.chain(*map(_expand_bond_stereo, sgrs)))
-
+    sgrs = _expand_stereo(_without_stereo_parities(xgr), {}, {})
     return tuple(sorted(sgrs, key=_frozen))
 
 
 def substereomers(xgr):
     """ all stereomers compatible with this graph's assignments
     """
-    _assigned = functools.partial(
-        dict_.filter_by_value, func=lambda x: x is not None)
+    return tuple(sorted(iterate_stereomers(xgr, unique=False), key=_frozen))
+
+
+def iterate_stereomers(xgr, unique=True, limit=None):
+    """ stereomers compatible with this graph's assignments, one at a time
+
+    (the stereo sites are assigned depth-first, in the same rounds as for
+    `stereomers`, and sites that are assigned in this graph only take their
+    assigned parities, so that incompatible branches are never expanded;
+    the stereomers are not sorted)
+
+    :param unique: skip stereomers that are related to one already yielded by
+        a symmetry of the graph, such as the two labelings of a meso
+        compound?
+    :type unique: bool
+    :param limit: the maximum number of stereomers to yield
+    :type limit: int
+    """
+    known_atm_par_dct = dict_.filter_by_value(
+        _atom_stereo_parities(xgr), lambda x: x is not None)
+    known_bnd_par_dct = dict_.filter_by_value(
+        _bond_stereo_parities(xgr), lambda x: x is not None)
+    gens = _automorphism_generators(xgr) if unique else ()
+
+    nsgrs = 0
+    for sgr in _expand_stereo(_without_stereo_parities(xgr),
+                              known_atm_par_dct, known_bnd_par_dct):
+        if limit is not None and nsgrs >= limit:
+            break
+
+        # skip stereomers where a known site was never stereogenic
+        if not (set(known_atm_par_dct.items()) <=
+                set(_atom_stereo_parities(sgr).items()) and
+                set(known_bnd_par_dct.items()) <=
+                set(_bond_stereo_parities(sgr).items())):
+            continue
+
+        if not gens or _is_orbit_representative(sgr, gens):
+            nsgrs += 1
+            yield sgr
+
+
+def _expand_stereo(xgr, known_atm_par_dct, known_bnd_par_dct):
+    """ assign the stereogenic atoms, then the stereogenic bonds, and repeat
+    until nothing is left to assign, depth-first
+
+    (the candidate sites don't depend on the assignments, so they are found
+    once, on an explicit copy of the graph without bond orders that is kept
+    alongside the graph and given the same parities)
+    """
+    egr = _explicit(_without_bond_orders(xgr))
+    atm_ngb_keys_dct = _atom_neighbor_keys(egr)
+    cand_atm_keys = stereo_candidate_atom_keys(egr)
+    cand_bnd_keys = stereo_candidate_bond_keys(egr)
+
+    def _expand(sgr, egr):
+        rnk_dct = stereo_priority_ranks(egr)
+        atm_par_dct = _atom_stereo_parities(egr)
+        atm_keys = sorted(
+            atm_key for atm_key in cand_atm_keys
+            if atm_par_dct[atm_key] is None and
+            is_stereogenic_atom(atm_key, atm_ngb_keys_dct, rnk_dct))
+        for atm_pars in _parity_choices(atm_keys, known_atm_par_dct):
+            atm_par_dct = dict(zip(atm_keys, atm_pars))
+            atm_sgr = _set_atom_stereo_parities(sgr, atm_par_dct)
+            atm_egr = _set_atom_stereo_parities(egr, atm_par_dct)
+
+            rnk_dct = stereo_priority_ranks(atm_egr)
+            bnd_par_dct = _bond_stereo_parities(atm_egr)
+            bnd_keys = sorted(
+                (bnd_key for bnd_key in cand_bnd_keys
+                 if bnd_par_dct[bnd_key] is None and
+                 is_stereogenic_bond(bnd_key, atm_ngb_keys_dct, rnk_dct)),
+                key=sorted)
+            for bnd_pars in _parity_choices(bnd_keys, known_bnd_par_dct):
+                bnd_par_dct = dict(zip(bnd_keys, bnd_pars))
+                bnd_sgr = _set_bond_stereo_parities(atm_sgr, bnd_par_dct)
+                bnd_egr = _set_bond_stereo_parities(atm_egr, bnd_par_dct)
+                if atm_keys or bnd_keys:
+                    for exp_sgr in _expand(bnd_sgr, bnd_egr):
+                        yield exp_sgr
+                else:
+                    yield bnd_sgr
+
+    return _expand(xgr, egr)
 
-    known_atm_ste_par_dct = _assigned(_atom_stereo_parities(xgr))
-    known_bnd_ste_par_dct = _assigned(_bond_stereo_parities(xgr))
 
-    def _is_compatible(sgr):
-        atm_ste_par_dct = _assigned(_atom_stereo_parities(sgr))
-        bnd_ste_par_dct = _assigned(_bond_stereo_parities(sgr))
-        _compat_atm_assgns = (set(known_atm_ste_par_dct.items()) <=
-                              set(atm_ste_par_dct.items()))
-        _compat_bnd_assgns = (set(known_bnd_ste_par_dct.items()) <=
-                              set(bnd_ste_par_dct.items()))
-        return _compat_atm_assgns and _compat_bnd_assgns
+def _parity_choices(keys, known_par_dct):
+    """ combinations of parities for these sites, keeping known parities
+    """
+    return itertools.product(*(
+        (known_par_dct[key],) if key in known_par_dct else (False, True)
+        for key in keys))
 
-    sgrs = tuple(filter(_is_compatible, stereomers(xgr)))
-    return sgrs
+
+def _is_orbit_representative(sgr, gens):
+    """ is this stereomer's assignment the lowest of its images under the
+    automorphisms?
+
+    (an automorphism maps a stereomer onto an equivalent one, with the
+    parity of each site carried over to its image)
+    """
+    atm_par_dct = dict_.filter_by_value(
+        _atom_stereo_parities(sgr), lambda x: x is not None)
+    bnd_par_dct = dict_.filter_by_value(
+        _bond_stereo_parities(sgr), lambda x: x is not None)
+
+    def _sort_key(asg):
+        atm_pars, bnd_pars = asg
+        return (sorted(atm_pars), sorted((sorted(bnd_key), par)
+                                         for bnd_key, par in bnd_pars))
+
+    asg = (frozenset(atm_par_dct.items()), frozenset(bnd_par_dct.items()))
+    asg_key = _sort_key(asg)
+    orb = {asg}
+    queue = [asg]
+    while queue:
+        atm_pars, bnd_pars = queue.pop()
+        for gen in gens:
+            img_asg = (
+                frozenset((gen[atm_key], par) for atm_key, par in atm_pars),
+                frozenset((frozenset(map(gen.__getitem__, bnd_key)), par)
+                          for bnd_key, par in bnd_pars))
+            if img_asg not in orb:
+                if _sort_key(img_asg) < asg_key:
+                    return False
+                orb.add(img_asg)
+                queue.append(img_asg)
+    return True
 
 
 def stereo_sorted_atom_neighbor_keys(xgr, atm_key, atm_ngb_keys):
     """ get the neighbor keys of an atom sorted by stereo priority
+
+    (the order is that of `stereo_priority_ranks`, which is the order stereo
+    parities refer to)
     """
-    atm_ngb_keys = list(atm_ngb_keys)
+    rnk_dct = stereo_priority_ranks(xgr)
+    return rank_sorted_atom_neighbor_keys(atm_key, atm_ngb_keys, rnk_dct)
 
-    # explicitly create an object array because otherwise the argsort
-    # interprets [()] as []
-    atm_pri_vecs = numpy.empty(len(atm_ngb_keys), dtype=numpy.object_)
-    atm_pri_vecs[:] = [stereo_priority_vector(xgr, atm_key, atm_ngb_key)
-                       for atm_ngb_key in atm_ngb_keys]
 
-    sort_idxs = numpy.argsort(atm_pri_vecs)
-    sorted_atm_ngb_keys = tuple(map(atm_ngb_keys.__getitem__, sort_idxs))
-    return sorted_atm_ngb_keys
+def rank_sorted_atom_neighbor_keys(atm_key, atm_ngb_keys, rnk_dct):
+    """ sort the neighbor keys of an atom by precomputed priority ranks
+    """
+    return tuple(sorted(atm_ngb_keys,
+                        key=lambda atm_ngb_key: rnk_dct[(atm_key,
+                                                         atm_ngb_key)]))
 
 
 def set_stereo_from_atom_coordinates(xgr, atm_xyz_dct):
@@ -262,47 +465,84 @@ def set_stereo_from_atom_coordinates(xgr, atm_xyz_dct):
 
     (coordinate distances need not match connectivity -- what matters is the
     relative positions at stereo sites)
-    """
-    last_xgr = None
-
-    # set atom and bond stereo, iterating to self-consistency
-    atm_keys = set()
-    bnd_keys = set()
-    while last_xgr != xgr:
-        last_xgr = xgr
-        atm_keys.update(stereogenic_atom_keys(xgr))
-        bnd_keys.update(stereogenic_bond_keys(xgr))
-        xgr = _set_atom_stereo_from_coordinates(xgr, atm_keys, atm_xyz_dct)
-        xgr = _set_bond_stereo_from_coordinates(xgr, bnd_keys, atm_xyz_dct)
 
-    return xgr
-
-
-def _set_atom_stereo_from_coordinates(xgr, atm_keys, atm_xyz_dct):
+    assignments can break ties between branches, making other sites
+    stereogenic or changing their neighbor priorities, so this iterates to
+    self-consistency; the candidate sites are found once, and each round
+    only re-examines the connected components that changed in the last one
+    """
     assert xgr == _explicit(xgr)
 
-    atm_pars = [
-        _atom_stereo_parity_from_coordinates(xgr, atm_key, atm_xyz_dct)
-        for atm_key in atm_keys]
-    xgr = _set_atom_stereo_parities(xgr, dict(zip(atm_keys, atm_pars)))
-    return xgr
+    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
+    cand_xgr = _without_bond_orders(xgr)
+    cand_atm_keys = stereo_candidate_atom_keys(cand_xgr)
+    cand_bnd_keys = stereo_candidate_bond_keys(cand_xgr)
+    atm_cmp_idx_dct = {
+        atm_key: cmp_idx for cmp_idx, cmp_atm_keys
+        in enumerate(_connected_components_atom_keys(xgr))
+        for atm_key in cmp_atm_keys}
 
+    def _in(cmp_idxs, key):
+        return atm_cmp_idx_dct[next(iter(key))] in cmp_idxs
 
-def _set_bond_stereo_from_coordinates(xgr, bnd_keys, atm_xyz_dct):
-    assert xgr == _explicit(xgr)
+    # set atom and bond stereo, iterating to self-consistency
+    atm_keys = set()
+    bnd_keys = set()
+    seen_xgrs = {_frozen(xgr)}
+    cmp_idxs = set(atm_cmp_idx_dct.values())
+    while cmp_idxs:
+        # find sites that have become stereogenic
+        rnk_dct = stereo_priority_ranks(_without_bond_orders(xgr))
+        atm_keys.update(
+            atm_key for atm_key in cand_atm_keys - atm_keys
+            if _in(cmp_idxs, [atm_key]) and
+            is_stereogenic_atom(atm_key, atm_ngb_keys_dct, rnk_dct))
+        bnd_keys.update(
+            bnd_key for bnd_key in cand_bnd_keys - bnd_keys
+            if _in(cmp_idxs, bnd_key) and
+            is_stereogenic_bond(bnd_key, atm_ngb_keys_dct, rnk_dct))
+
+        # (re-)assign the atoms, then the bonds
+        rnk_dct = stereo_priority_ranks(xgr)
+        atm_par_dct = _atom_stereo_parities(xgr)
+        atm_par_dct = {
+            atm_key: par for atm_key, par in (
+                (atm_key, _atom_stereo_parity_from_coordinates(
+                    atm_key, atm_ngb_keys_dct, rnk_dct, atm_xyz_dct))
+                for atm_key in atm_keys if _in(cmp_idxs, [atm_key]))
+            if par != atm_par_dct[atm_key]}
+        if atm_par_dct:
+            xgr = _set_atom_stereo_parities(xgr, atm_par_dct)
+            rnk_dct = stereo_priority_ranks(xgr)
+
+        bnd_par_dct = _bond_stereo_parities(xgr)
+        bnd_par_dct = {
+            bnd_key: par for bnd_key, par in (
+                (bnd_key, _bond_stereo_parity_from_coordinates(
+                    bnd_key, atm_ngb_keys_dct, rnk_dct, atm_xyz_dct))
+                for bnd_key in bnd_keys if _in(cmp_idxs, bnd_key))
+            if par != bnd_par_dct[bnd_key]}
+        if bnd_par_dct:
+            xgr = _set_bond_stereo_parities(xgr, bnd_par_dct)
+
+        # only components with new assignments need another look
+        cmp_idxs = set(atm_cmp_idx_dct[atm_key] for atm_key in atm_par_dct)
+        cmp_idxs.update(atm_cmp_idx_dct[next(iter(bnd_key))]
+                        for bnd_key in bnd_par_dct)
+
+        # around fused rings, the assignments can cycle instead of settling,
+        # so stop at the first repeat
+        if _frozen(xgr) in seen_xgrs:
+            break
+        seen_xgrs.add(_frozen(xgr))
 
-    bnd_pars = [
-        _bond_stereo_parity_from_coordinates(xgr, bnd_key, atm_xyz_dct)
-        for bnd_key in bnd_keys]
-    xgr = _set_bond_stereo_parities(xgr, dict(zip(bnd_keys, bnd_pars)))
     return xgr
 
 
-def _atom_stereo_parity_from_coordinates(xgr, atm_key, atm_xyz_dct):
-    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
-    atm_ngb_keys = atm_ngb_keys_dct[atm_key]
-    atm_ngb_keys = stereo_sorted_atom_neighbor_keys(
-        xgr, atm_key, atm_ngb_keys)
+def _atom_stereo_parity_from_coordinates(atm_key, atm_ngb_keys_dct, rnk_dct,
+                                         atm_xyz_dct):
+    atm_ngb_keys = rank_sorted_atom_neighbor_keys(
+        atm_key, atm_ngb_keys_dct[atm_key], rnk_dct)
     atm_ngb_xyzs = list(map(atm_xyz_dct.__getitem__, atm_ngb_keys))
     det_mat = numpy.ones((4, 4))
     det_mat[:, :3] = atm_ngb_xyzs
@@ -312,16 +552,16 @@ def _atom_stereo_parity_from_coordinates(xgr, atm_key, atm_xyz_dct):
     return par
 
 
-def _bond_stereo_parity_from_coordinates(xgr, bnd_key, atm_xyz_dct):
+def _bond_stereo_parity_from_coordinates(bnd_key, atm_ngb_keys_dct, rnk_dct,
+                                         atm_xyz_dct):
     atm1_key, atm2_key = bnd_key
-    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
     atm1_ngb_keys = atm_ngb_keys_dct[atm1_key] - {atm2_key}
     atm2_ngb_keys = atm_ngb_keys_dct[atm2_key] - {atm1_key}
 
-    atm1_ngb_keys = stereo_sorted_atom_neighbor_keys(
-        xgr, atm1_key, atm1_ngb_keys)
-    atm2_ngb_keys = stereo_sorted_atom_neighbor_keys(
-        xgr, atm2_key, atm2_ngb_keys)
+    atm1_ngb_keys = rank_sorted_atom_neighbor_keys(
+        atm1_key, atm1_ngb_keys, rnk_dct)
+    atm2_ngb_keys = rank_sorted_atom_neighbor_keys(
+        atm2_key, atm2_ngb_keys, rnk_dct)
 
     # get the top priority neighbor keys on each side
     atm1_ngb_key = atm1_ngb_keys[0]
@@ -354,10 +594,11 @@ def atom_stereo_coordinates(sgr):
     """
     assert sgr == _explicit(sgr)
     last_xgr = None
-    xgr = _without_stereo_parities(sgr)
 
     # first, get a set of non-stereo-specific coordinates for the graph
-    atm_xyz_dct = _atom_coordinates(xgr)
+    # (except for polycyclic components, which are embedded with their
+    # stereo in place, so their parities start out assigned)
+    xgr, atm_xyz_dct = _atom_coordinates(sgr)
 
     if has_stereo(sgr):
         full_atm_ste_par_dct = _atom_stereo_parities(sgr)
@@ -389,8 +630,9 @@ def _correct_atom_stereo_coordinates(xgr, atm_ste_par_dct, atm_xyz_dct):
     atm_keys = list(atm_ste_par_dct.keys())
     for atm_key in atm_keys:
         par = atm_ste_par_dct[atm_key]
+        rnk_dct = stereo_priority_ranks(xgr)
         curr_par = _atom_stereo_parity_from_coordinates(
-            xgr, atm_key, atm_xyz_dct)
+            atm_key, atm_ngb_keys_dct, rnk_dct, atm_xyz_dct)
         atm_ngb_keys = atm_ngb_keys_dct[atm_key]
 
         if curr_par != par:
@@ -417,7 +659,7 @@ def _correct_atom_stereo_coordinates(xgr, atm_ste_par_dct, atm_xyz_dct):
             atm_xyz_dct.update(dict(zip(rot_atm_keys, rot_atm_xyzs)))
 
         new_par = _atom_stereo_parity_from_coordinates(
-            xgr, atm_key, atm_xyz_dct)
+            atm_key, atm_ngb_keys_dct, rnk_dct, atm_xyz_dct)
 
         assert new_par == par
         xgr = _set_atom_stereo_parities(xgr, {atm_key: par})
@@ -431,8 +673,9 @@ def _correct_bond_stereo_coordinates(xgr, bnd_ste_par_dct, atm_xyz_dct):
     bnd_keys = list(bnd_ste_par_dct.keys())
     for bnd_key in bnd_keys:
         par = bnd_ste_par_dct[bnd_key]
+        rnk_dct = stereo_priority_ranks(xgr)
         curr_par = _bond_stereo_parity_from_coordinates(
-            xgr, bnd_key, atm_xyz_dct)
+            bnd_key, atm_ngb_keys_dct, rnk_dct, atm_xyz_dct)
 
         if curr_par != par:
             atm1_key, atm2_key = bnd_key
@@ -441,10 +684,10 @@ def _correct_bond_stereo_coordinates(xgr, bnd_ste_par_dct, atm_xyz_dct):
 
             atm1_ngb_keys = atm_ngb_keys_dct[atm1_key] - {atm2_key}
             atm2_ngb_keys = atm_ngb_keys_dct[atm2_key] - {atm1_key}
-            atm1_ngb_keys = stereo_sorted_atom_neighbor_keys(
-                xgr, atm1_key, atm1_ngb_keys)
-            atm2_ngb_keys = stereo_sorted_atom_neighbor_keys(
-                xgr, atm2_key, atm2_ngb_keys)
+            atm1_ngb_keys = rank_sorted_atom_neighbor_keys(
+                atm1_key, atm1_ngb_keys, rnk_dct)
+            atm2_ngb_keys = rank_sorted_atom_neighbor_keys(
+                atm2_key, atm2_ngb_keys, rnk_dct)
 
             rot_axis = numpy.subtract(atm2_xyz, atm1_xyz)
             rot_ = cart.vec.rotate_(
@@ -466,30 +709,75 @@ def _correct_bond_stereo_coordinates(xgr, bnd_ste_par_dct, atm_xyz_dct):
             atm_xyz_dct.update(dict(zip(rot_atm_keys, rot_atm_xyzs)))
 
         assert _bond_stereo_parity_from_coordinates(
-            xgr, bnd_key, atm_xyz_dct) == par
+            bnd_key, atm_ngb_keys_dct, rnk_dct, atm_xyz_dct) == par
         xgr = _set_bond_stereo_parities(xgr, {bnd_key: par})
 
     return xgr, atm_xyz_dct
 
 
 def _atom_coordinates(sgr):
-    """ non-stereo-specific coordinates for a molecular graph
+    """ coordinates for a molecular graph, along with the graph of stereo
+    parities they satisfy
+
+    (polycyclic components are embedded by distance geometry with their
+    stereo in place; the others are not stereo-specific)
     """
+    xgr = _without_stereo_parities(sgr)
     atm_xyz_dct = {}
     for idx, cnn_sgr in enumerate(_connected_components(sgr)):
         shift = 20. * idx
-        cnn_atm_xyz_dct = _connected_graph_atom_coordinates(cnn_sgr)
+        if len(_rings_sorted_atom_keys(cnn_sgr)) > 1:
+            cnn_atm_xyz_dct = _embedded_atom_coordinates(cnn_sgr)
+            xgr = _set_atom_stereo_parities(
+                xgr, _atom_stereo_parities(cnn_sgr))
+            xgr = _set_bond_stereo_parities(
+                xgr, _bond_stereo_parities(cnn_sgr))
+        else:
+            cnn_atm_xyz_dct = _connected_graph_atom_coordinates(
+                _without_stereo_parities(cnn_sgr))
         atm_keys = list(cnn_atm_xyz_dct.keys())
         atm_xyzs = numpy.array(list(cnn_atm_xyz_dct.values()))
         atm_xyzs += numpy.array([0., 0., shift])
         atm_xyz_dct.update(dict(zip(atm_keys, map(tuple, atm_xyzs))))
-    return atm_xyz_dct
+    return xgr, atm_xyz_dct
+
+
+def _embedded_atom_coordinates(sgr):
+    """ stereo-specific coordinates for a connected molecular graph, by
+    distance geometry embedding
+    """
+    rnk_dct = stereo_priority_ranks(sgr)
+    atm_ngb_keys_dct = _atom_neighbor_keys(sgr)
+
+    vol_par_dct = {}
+    for atm_key, par in _atom_stereo_parities(sgr).items():
+        if par is not None:
+            atm_ngb_keys = rank_sorted_atom_neighbor_keys(
+                atm_key, atm_ngb_keys_dct[atm_key], rnk_dct)
+            vol_par_dct[tuple(atm_ngb_keys)] = par
+
+    dih_par_dct = {}
+    for bnd_key, par in _bond_stereo_parities(sgr).items():
+        if par is not None:
+            atm1_key, atm2_key = sorted(bnd_key)
+            atm1_ngb_key = rank_sorted_atom_neighbor_keys(
+                atm1_key, atm_ngb_keys_dct[atm1_key] - {atm2_key},
+                rnk_dct)[0]
+            atm2_ngb_key = rank_sorted_atom_neighbor_keys(
+                atm2_key, atm_ngb_keys_dct[atm2_key] - {atm1_key},
+                rnk_dct)[0]
+            dih_par_dct[(atm1_ngb_key, atm1_key, atm2_key, atm2_ngb_key)] = (
+                par)
+
+    return _embed_atom_coordinates(_without_stereo_parities(sgr),
+                                   vol_par_dct=vol_par_dct,
+                                   dih_par_dct=dih_par_dct)
 
 
 def _connected_graph_atom_coordinates(sgr):
     """ non-stereo-specific coordinates for a connected molecular graph
 
-    (currently assumes a with at most one ring -- fix that)
+    (graphs with more than one ring are embedded by distance geometry)
     """
     assert sgr == _explicit(sgr)
 
@@ -514,7 +802,7 @@ def _connected_graph_atom_coordinates(sgr):
         atm_ngb_keys_dct = _atom_neighbor_keys(sgr)
 
         # start assigning coordinates along the longest chain
-        max_chain = longest_chain(sgr)
+        max_chain = _longest_chain(sgr)
         atm2_key, atm3_key = max_chain[:2]
 
         # add a dummy atom to start the chain
@@ -559,8 +847,7 @@ def _connected_graph_atom_coordinates(sgr):
             atm_xyz_dct = _extend_atom_coordinates(
                 sgr, atm1_key, atm2_key, atm3_key, atm_xyz_dct)
     else:
-        raise NotImplementedError("This algorithm is currently not implemented"
-                                  "for more than one ring.")
+        atm_xyz_dct = _embedded_atom_coordinates(sgr)
 
     return atm_xyz_dct
 
@@ -673,50 +960,3 @@ def _dihedral_increment(sgr, atm1_key, atm2_key, atm3_key, check=True):
     atm3_hyb = atm_hyb_dct[atm3_key]
     dih_incr = 2 * numpy.pi / atm3_hyb if not atm3_hyb == 0 else 0.
     return dih_incr
-
-
-def longest_chain(xgr):
-    """ longest chain in the graph
-    """
-    atm_keys = _atom_keys(xgr)
-
-    max_chain = max((_longest_chain(xgr, atm_key) for atm_key in atm_keys),
-                    key=len)
-    return max_chain
-
-
-def atom_longest_chains(xgr):
-    """ longest chains, by atom
-    """
-    atm_keys = _atom_keys(xgr)
-
-    long_chain_dct = {atm_key: _longest_chain(xgr, atm_key)
-                      for atm_key in atm_keys}
-    return long_chain_dct
-
-
-def _longest_chain(xgr, atm_key):
-    atm_ngb_keys_dct = _atom_neighbor_keys(xgr)
-    atm_ngb_keys = atm_ngb_keys_dct[atm_key]
-
-    chains_lst = []
-    if atm_ngb_keys:
-        next_chains_lst = [
-            [atm_key, atm_ngb_key] for atm_ngb_key in atm_ngb_keys]
-
-        while True:
-            chains_lst = next_chains_lst
-            next_chains_lst = []
-            for chain in chains_lst:
-                atm_ngb_keys = atm_ngb_keys_dct[chain[-1]]
-                next_atm_keys = sorted(atm_ngb_keys - set(chain))
-                for next_atm_key in next_atm_keys:
-                    next_chains_lst.append(chain + [next_atm_key])
-
-            if not next_chains_lst:
-                break
-
-        max_chain = tuple(chains_lst[0])
-    else:
-        max_chain = tuple((atm_key,))
-    return max_chain
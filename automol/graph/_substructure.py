@@ -0,0 +1,370 @@
+""" substructure search
+
+patterns are small graphs whose atom and bond properties may be left open:
+each property is given as a value, a set of allowed values, or None (any
+value); hydrogens are matched as counts, so targets are searched in their
+implicit form and matches are reported in terms of backbone atom keys
+
+unsaturated valences and bond orders are taken from the target graph as
+given, so patterns that use them (double bonds, radical sites) should be
+searched for in resonance graphs, such as the one from `dominant_resonance`
+
+a search maps each pattern atom onto a distinct target atom with matching
+properties, such that every pattern bond maps onto a matching target bond;
+the target may have extra bonds between the matched atoms
+"""
+import collections
+from qcelemental import periodictable as pt
+from automol.graph._graph import implicit as _implicit
+from automol.graph._graph import (atom_unsaturated_valences as
+                                  _atom_unsaturated_valences)
+
+Pattern = collections.namedtuple(
+    'Pattern', ['atoms', 'bonds', 'steps', 'counts'])
+
+# positions of atom properties in the matched values
+_SYM_POS = 0
+_UNSAT_VLC_POS = 3
+
+
+def pattern(atom_symbols, bond_keys, atom_implicit_hydrogen_valences=None,
+            atom_unsaturated_valences=None, atom_stereo_parities=None,
+            bond_orders=None, bond_stereo_parities=None):
+    """ compile a substructure pattern
+
+    each property is a value, a set of allowed values, or None to allow
+    anything; an atom symbol of '*' also allows any element
+
+    format:
+        pat = Pattern(atoms, bonds, steps, counts)
+        atoms := {atm_key: (sym, imp_hyd_vlc, ste_par, unsat_vlc), ...}
+        bonds := {bnd_key: (bnd_ord, bnd_ste_par), ...}
+        [the remaining fields hold the compiled search plan]
+
+    :param atom_symbols: atomic symbols, by atom key
+    :type atom_symbols: dict
+    :param bond_keys: bond keys
+    :type bond_keys: set
+    :param atom_implicit_hydrogen_valences: hydrogen counts, by atom key
+    :type atom_implicit_hydrogen_valences: dict
+    :param atom_unsaturated_valences: unsaturated valences, by atom key
+    :type atom_unsaturated_valences: dict
+    :param atom_stereo_parities: atom stereo parities, by atom key
+    :type atom_stereo_parities: dict
+    :param bond_orders: bond orders, by bond key
+    :type bond_orders: dict
+    :param bond_stereo_parities: bond stereo parities, by bond key
+    :type bond_stereo_parities: dict
+    """
+    atm_keys = sorted(atom_symbols)
+    bnd_keys = set(map(frozenset, bond_keys))
+    assert all(bnd_key <= set(atm_keys) and len(bnd_key) == 2
+               for bnd_key in bnd_keys)
+
+    def _spec(dct, key, func=None):
+        val = dict(dct or {}).get(key)
+        if isinstance(val, (set, frozenset, list, tuple)):
+            val = frozenset(map(func, val) if func else val)
+        elif val is not None and func:
+            val = func(val)
+        return val
+
+    def _symbol(sym):
+        return None if sym in ('*', None) else pt.to_E(sym)
+
+    atm_dct = {}
+    for atm_key in atm_keys:
+        sym = atom_symbols[atm_key]
+        sym = (frozenset(map(pt.to_E, sym))
+               if isinstance(sym, (set, frozenset, list, tuple))
+               else _symbol(sym))
+        atm_dct[atm_key] = (
+            sym,
+            _spec(atom_implicit_hydrogen_valences, atm_key, int),
+            _spec(atom_stereo_parities, atm_key),
+            _spec(atom_unsaturated_valences, atm_key, int))
+
+    bond_orders = {frozenset(k): v for k, v in dict(bond_orders or {}).items()}
+    bond_stereo_parities = {frozenset(k): v for k, v
+                            in dict(bond_stereo_parities or {}).items()}
+    bnd_dct = {bnd_key: (_spec(bond_orders, bnd_key),
+                         _spec(bond_stereo_parities, bnd_key))
+               for bnd_key in bnd_keys}
+
+    steps = _search_plan(atm_dct, bnd_dct)
+    counts = _fingerprint((atm_dct, bnd_dct))
+    return Pattern(atm_dct, bnd_dct, steps, counts)
+
+
+def substructure_matches(xgr, pat, unique=True):
+    """ matches of a pattern in a graph
+
+    :param pat: a pattern, from `pattern()`
+    :param unique: report only one match for each set of target atoms?
+    :type unique: bool
+    :returns: maps from pattern atom keys onto target atom keys
+    :rtype: tuple[dict]
+    """
+    return _matches(_target(xgr, _needs_unsaturation([pat])), pat,
+                    unique=unique)
+
+
+def has_substructure(xgr, pat):
+    """ does this graph contain the pattern?
+    """
+    tgt = _target(xgr, _needs_unsaturation([pat]))
+    return _passes_prescreen(tgt, pat) and next(_search(tgt, pat),
+                                                None) is not None
+
+
+def functional_groups(xgr, grp_names=None):
+    """ matches of the functional group library, by group name
+
+    (groups without matches are left out)
+
+    :param grp_names: the groups to look for (defaults to all of them)
+    :type grp_names: list[str]
+    """
+    grp_names = sorted(FUNCTIONAL_GROUPS) if grp_names is None else grp_names
+    pat_dct = {name: FUNCTIONAL_GROUPS[name] for name in grp_names}
+    match_dct, = substructure_matches_batch([xgr], pat_dct)
+    return match_dct
+
+
+def substructure_matches_batch(xgrs, pat_dct, unique=True):
+    """ matches of several patterns in many graphs
+
+    each graph is prepared once and fingerprinted (element and bond counts),
+    so that patterns needing more of an element or bond type than a graph
+    has are skipped without a search
+
+    :param pat_dct: patterns, by name
+    :type pat_dct: dict
+    :returns: for each graph, the matches of each pattern found in it, by
+        name
+    :rtype: tuple[dict]
+    """
+    pat_items = sorted(pat_dct.items())
+    needs_unsat = _needs_unsaturation(pat_dct.values())
+
+    match_dcts = []
+    for xgr in xgrs:
+        tgt = _target(xgr, needs_unsat)
+        match_dct = {}
+        for name, pat in pat_items:
+            if _passes_prescreen(tgt, pat):
+                matches = _matches(tgt, pat, unique=unique)
+                if matches:
+                    match_dct[name] = matches
+        match_dcts.append(match_dct)
+    return tuple(match_dcts)
+
+
+# helpers
+def _search_plan(atm_dct, bnd_dct):
+    """ the steps of the search: at each, a pattern atom to match, and the
+    bonds back to the atoms matched before it to check
+
+    atoms with fixed symbols go first and each new atom is, if possible, a
+    neighbor of one already placed, so that its candidates can be drawn from
+    the neighbors of that atom's match
+    """
+    ngb_dct = {atm_key: set() for atm_key in atm_dct}
+    for atm1_key, atm2_key in bnd_dct:
+        ngb_dct[atm1_key].add(atm2_key)
+        ngb_dct[atm2_key].add(atm1_key)
+
+    def _priority(atm_key):
+        sym = atm_dct[atm_key][_SYM_POS]
+        return (sym is None or isinstance(sym, frozenset),
+                -len(ngb_dct[atm_key]), atm_key)
+
+    order = []
+    rem_keys = set(atm_dct)
+    while rem_keys:
+        ngb_keys = {k for k in rem_keys if ngb_dct[k] & set(order)}
+        atm_key = min(ngb_keys or rem_keys, key=_priority)
+        rem_keys.remove(atm_key)
+        order.append(atm_key)
+
+    steps = []
+    for idx, atm_key in enumerate(order):
+        prev_ngb_keys = [k for k in order[:idx] if k in ngb_dct[atm_key]]
+        anchor = prev_ngb_keys[0] if prev_ngb_keys else None
+        bnd_specs = tuple((k, bnd_dct[frozenset({atm_key, k})])
+                          for k in prev_ngb_keys)
+        steps.append((atm_key, atm_dct[atm_key], len(ngb_dct[atm_key]),
+                      anchor, bnd_specs))
+    return tuple(steps)
+
+
+def _fingerprint(xgr):
+    """ counts of elements and of bonds between elements
+
+    (for patterns, open symbols are left out, so that the counts are lower
+    bounds on those of any match)
+    """
+    atm_dct, bnd_dct = xgr
+    counts = collections.Counter()
+    for atm_val in atm_dct.values():
+        sym = atm_val[_SYM_POS]
+        if isinstance(sym, str):
+            counts[sym] += 1
+    for bnd_key in bnd_dct:
+        syms = [atm_dct[atm_key][_SYM_POS] for atm_key in bnd_key]
+        if all(isinstance(sym, str) for sym in syms):
+            counts[tuple(sorted(syms))] += 1
+    return counts
+
+
+def _target(xgr, needs_unsat):
+    """ the graph data used in searching it
+    """
+    xgr = _implicit(xgr)
+    atm_dct, bnd_dct = xgr
+    unsat_dct = (_atom_unsaturated_valences(xgr) if needs_unsat else
+                 dict.fromkeys(atm_dct))
+    atm_val_dct = {atm_key: (sym, imp_hyd_vlc, par, unsat_dct[atm_key])
+                   for atm_key, (sym, imp_hyd_vlc, par) in atm_dct.items()}
+
+    ngb_dct = {atm_key: {} for atm_key in atm_dct}
+    for bnd_key, bnd_val in bnd_dct.items():
+        atm1_key, atm2_key = bnd_key
+        ngb_dct[atm1_key][atm2_key] = bnd_val
+        ngb_dct[atm2_key][atm1_key] = bnd_val
+
+    sym_keys_dct = {}
+    for atm_key in sorted(atm_dct):
+        sym_keys_dct.setdefault(atm_dct[atm_key][_SYM_POS], []).append(atm_key)
+    return (atm_val_dct, ngb_dct, sym_keys_dct, _fingerprint(xgr))
+
+
+def _needs_unsaturation(pats):
+    return any(atm_spec[_UNSAT_VLC_POS] is not None
+               for pat in pats for atm_spec in pat.atoms.values())
+
+
+def _passes_prescreen(tgt, pat):
+    _, _, _, counts = tgt
+    return all(counts[key] >= cnt for key, cnt in pat.counts.items())
+
+
+def _matches(tgt, pat, unique=True):
+    """ the matches of a pattern in a prepared target
+    """
+    if not _passes_prescreen(tgt, pat):
+        return ()
+
+    matches = []
+    seen = set()
+    for match in _search(tgt, pat):
+        if unique:
+            atm_keys = frozenset(match.values())
+            if atm_keys in seen:
+                continue
+            seen.add(atm_keys)
+        matches.append(match)
+    return tuple(matches)
+
+
+def _search(tgt, pat):
+    """ backtracking search following the pattern's compiled plan
+    """
+    atm_val_dct, ngb_dct, sym_keys_dct, _ = tgt
+    nsteps = len(pat.steps)
+    if not nsteps:
+        return
+
+    match = {}
+    used_keys = set()
+
+    def _candidates(step):
+        _, atm_spec, deg, anchor, bnd_specs = step
+        if anchor is not None:
+            cand_keys = sorted(ngb_dct[match[anchor]])
+        else:
+            sym = atm_spec[_SYM_POS]
+            if sym is None:
+                cand_keys = sorted(atm_val_dct)
+            elif isinstance(sym, frozenset):
+                cand_keys = sorted(k for s in sym
+                                   for k in sym_keys_dct.get(s, ()))
+            else:
+                cand_keys = sym_keys_dct.get(sym, ())
+
+        for cand_key in cand_keys:
+            if (cand_key not in used_keys and
+                    len(ngb_dct[cand_key]) >= deg and
+                    _is_match(atm_spec, atm_val_dct[cand_key]) and
+                    all(match[k] in ngb_dct[cand_key] and
+                        _is_match(bnd_spec, ngb_dct[cand_key][match[k]])
+                        for k, bnd_spec in bnd_specs)):
+                yield cand_key
+
+    stack = [_candidates(pat.steps[0])]
+    while stack:
+        idx = len(stack) - 1
+        atm_key = pat.steps[idx][0]
+        if atm_key in match:
+            used_keys.remove(match.pop(atm_key))
+
+        cand_key = next(stack[-1], None)
+        if cand_key is None:
+            stack.pop()
+            continue
+
+        match[atm_key] = cand_key
+        used_keys.add(cand_key)
+        if idx + 1 == nsteps:
+            yield {k: match[k] for k in sorted(match)}
+        else:
+            stack.append(_candidates(pat.steps[idx + 1]))
+
+
+def _is_match(spec, val):
+    """ do these values satisfy this specification?
+    """
+    for spec_val, tgt_val in zip(spec, val):
+        if spec_val is None:
+            continue
+        if isinstance(spec_val, frozenset):
+            if tgt_val not in spec_val:
+                return False
+        elif tgt_val != spec_val:
+            return False
+    return True
+
+
+# functional group library (hydrogens as counts)
+FUNCTIONAL_GROUPS = {
+    'alkene': pattern(
+        {0: 'C', 1: 'C'}, [{0, 1}], bond_orders={(0, 1): 2}),
+    'alkyne': pattern(
+        {0: 'C', 1: 'C'}, [{0, 1}], bond_orders={(0, 1): 3}),
+    'carbonyl': pattern(
+        {0: 'C', 1: 'O'}, [{0, 1}], bond_orders={(0, 1): 2}),
+    'hydroxyl': pattern(
+        {0: 'C', 1: 'O'}, [{0, 1}],
+        atom_implicit_hydrogen_valences={1: 1}, bond_orders={(0, 1): 1}),
+    'ether': pattern(
+        {0: 'C', 1: 'O', 2: 'C'}, [{0, 1}, {1, 2}],
+        atom_implicit_hydrogen_valences={1: 0},
+        bond_orders={(0, 1): 1, (1, 2): 1}),
+    'alkoxy': pattern(
+        {0: 'C', 1: 'O'}, [{0, 1}],
+        atom_implicit_hydrogen_valences={1: 0},
+        atom_unsaturated_valences={1: 1}, bond_orders={(0, 1): 1}),
+    'hydroperoxy': pattern(
+        {0: 'C', 1: 'O', 2: 'O'}, [{0, 1}, {1, 2}],
+        atom_implicit_hydrogen_valences={1: 0, 2: 1},
+        bond_orders={(0, 1): 1, (1, 2): 1}),
+    'peroxy': pattern(
+        {0: 'C', 1: 'O', 2: 'O'}, [{0, 1}, {1, 2}],
+        atom_implicit_hydrogen_valences={1: 0, 2: 0},
+        atom_unsaturated_valences={2: 1},
+        bond_orders={(0, 1): 1, (1, 2): 1}),
+    'radical': pattern(
+        {0: '*'}, [], atom_unsaturated_valences={0: {1, 2, 3}}),
+    'abstractable_hydrogen': pattern(
+        {0: '*'}, [], atom_implicit_hydrogen_valences={0: {1, 2, 3, 4}}),
+}
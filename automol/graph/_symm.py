@@ -0,0 +1,197 @@
+""" graph symmetry: automorphisms and atom and bond orbits
+
+the automorphism group is found by individualization and refinement: atoms
+are individualized (given colors of their own) one at a time until
+refinement leaves every atom in a class by itself, which fixes a base of
+atoms b1, b2, ..., bk; working back up from the bottom of this chain, the
+orbit of b_i under the automorphisms fixing b1, ..., b(i-1) is completed by
+searching for an automorphism mapping b_i onto each atom of its class that
+the generators found so far don't already reach
+
+the group order is the product of these orbit sizes
+"""
+from automol.graph._cache import memoized as _memoized
+from automol.graph._canon import refinement as _refinement
+from automol.graph._iso import class_isomorphisms as _class_isomorphisms
+
+
+def automorphism_generators(xgr, stereo=True):
+    """ generators of the automorphism group
+
+    (atoms and bonds must be mapped onto atoms and bonds with the same
+    properties; the identity is left out, so a graph without symmetry has
+    no generators)
+
+    :param stereo: require stereo parities to match?
+    :type stereo: bool
+    :returns: permutations of the atom keys, as dictionaries
+    :rtype: tuple[dict]
+    """
+    gens, _ = _automorphism_group(xgr, stereo=stereo)
+    return tuple(map(dict, gens))
+
+
+def automorphism_group_order(xgr, stereo=True):
+    """ the number of automorphisms of the graph, including the identity
+    """
+    _, order = _automorphism_group(xgr, stereo=stereo)
+    return order
+
+
+def atom_orbits(xgr, stereo=True):
+    """ atom symmetry classes: sets of atoms mapped onto each other by the
+    automorphisms
+
+    (sorted by their lowest atom key)
+    """
+    atm_dct, _ = xgr
+    gens = automorphism_generators(xgr, stereo=stereo)
+    return _orbits(atm_dct, gens, _permute_atom_key, sort_key=int)
+
+
+def bond_orbits(xgr, stereo=True):
+    """ bond symmetry classes: sets of bonds mapped onto each other by the
+    automorphisms
+
+    (sorted by their lowest bond key)
+    """
+    _, bnd_dct = xgr
+    gens = automorphism_generators(xgr, stereo=stereo)
+    return _orbits(bnd_dct, gens, _permute_bond_key, sort_key=sorted)
+
+
+def symmetry_unique_atom_keys(xgr, atm_keys=None, stereo=True):
+    """ one atom from each atom orbit, out of these atoms
+
+    (the lowest key is picked from each orbit; use this to skip equivalent
+    reaction sites)
+    """
+    atm_keys = set(xgr[0] if atm_keys is None else atm_keys)
+    return frozenset(min(orb & atm_keys)
+                     for orb in atom_orbits(xgr, stereo=stereo)
+                     if orb & atm_keys)
+
+
+def symmetry_unique_bond_keys(xgr, bnd_keys=None, stereo=True):
+    """ one bond from each bond orbit, out of these bonds
+
+    (the lowest key is picked from each orbit)
+    """
+    bnd_keys = set(map(frozenset, xgr[1] if bnd_keys is None else bnd_keys))
+    return frozenset(min(orb & bnd_keys, key=sorted)
+                     for orb in bond_orbits(xgr, stereo=stereo)
+                     if orb & bnd_keys)
+
+
+@_memoized
+def _automorphism_group(xgr, stereo=True):
+    """ generators and order of the automorphism group
+    """
+    if not stereo:
+        atm_dct, bnd_dct = xgr
+        xgr = ({atm_key: (sym, vlc, None)
+                for atm_key, (sym, vlc, _) in atm_dct.items()},
+               {bnd_key: (bnd_ord, None)
+                for bnd_key, (bnd_ord, _) in bnd_dct.items()})
+
+    # individualize atoms until the refined partition is discrete
+    base = []
+    cells = []
+    col_dct = {}
+    while True:
+        cls_dct, _ = _refinement(xgr, atm_col_dct=col_dct)
+        cls_keys_dct = {}
+        for atm_key in sorted(cls_dct):
+            cls_keys_dct.setdefault(cls_dct[atm_key], []).append(atm_key)
+
+        cls_keys_lst = [cls_keys_dct[cls] for cls in sorted(cls_keys_dct)
+                        if len(cls_keys_dct[cls]) > 1]
+        if not cls_keys_lst:
+            break
+
+        cell = min(cls_keys_lst, key=len)
+        base.append(cell[0])
+        cells.append(cell)
+        col_dct[cell[0]] = len(base)
+
+    # complete the orbits of the base atoms, from the bottom of the chain up
+    gens = []
+    order = 1
+    for lvl in reversed(range(len(base))):
+        fix_col_dct = {atm_key: idx + 1
+                       for idx, atm_key in enumerate(base[:lvl])}
+        orb = _orbit(base[lvl], gens)
+        for atm_key in cells[lvl]:
+            if atm_key not in orb:
+                gen = _automorphism(xgr, fix_col_dct, base[lvl], atm_key)
+                if gen is not None:
+                    gens.append(gen)
+                    orb = _orbit(base[lvl], gens)
+        order *= len(orb)
+
+    return tuple(gens), order
+
+
+def _automorphism(xgr, fix_col_dct, atm1_key, atm2_key):
+    """ an automorphism fixing the colored atoms and mapping atm1_key onto
+    atm2_key, or None if there isn't one
+    """
+    col = len(fix_col_dct) + 1
+    col_dct1 = dict(fix_col_dct)
+    col_dct1[atm1_key] = col
+    col_dct2 = dict(fix_col_dct)
+    col_dct2[atm2_key] = col
+
+    cls_dct1, invs1 = _refinement(xgr, atm_col_dct=col_dct1)
+    cls_dct2, invs2 = _refinement(xgr, atm_col_dct=col_dct2)
+    if invs1 != invs2:
+        return None
+
+    return next(_class_isomorphisms(xgr, xgr, cls_dct1, cls_dct2), None)
+
+
+def _orbit(atm_key, gens):
+    """ the orbit of an atom under the group generated by these permutations
+    """
+    orb = {atm_key}
+    queue = [atm_key]
+    while queue:
+        key = queue.pop()
+        for gen in gens:
+            img_key = gen[key]
+            if img_key not in orb:
+                orb.add(img_key)
+                queue.append(img_key)
+    return orb
+
+
+def _orbits(keys, gens, permute, sort_key):
+    """ orbits of these keys under the group generated by these permutations
+    """
+    par_dct = {key: key for key in keys}
+
+    def _root(key):
+        while par_dct[key] != key:
+            par_dct[key] = par_dct[par_dct[key]]
+            key = par_dct[key]
+        return key
+
+    for gen in gens:
+        for key in keys:
+            root1, root2 = _root(key), _root(permute(gen, key))
+            if root1 != root2:
+                par_dct[root1] = root2
+
+    orb_dct = {}
+    for key in keys:
+        orb_dct.setdefault(_root(key), set()).add(key)
+    return tuple(sorted(map(frozenset, orb_dct.values()),
+                        key=lambda orb: min(map(sort_key, orb))))
+
+
+def _permute_atom_key(gen, atm_key):
+    return gen[atm_key]
+
+
+def _permute_bond_key(gen, bnd_key):
+    return frozenset(map(gen.__getitem__, bnd_key))
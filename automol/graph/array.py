@@ -0,0 +1,405 @@
+""" compact, array-backed molecular graphs
+
+format:
+    agr = (atm_keys, atm_nums, atm_imp_hyd_vlcs, atm_ste_pars,
+           bnd_idxs, bnd_ords, bnd_ste_pars,
+           ngb_ptrs, ngb_idxs, ngb_bnd_idxs)
+
+    atoms are stored in order of their (sorted) keys and referred to by their
+    index in that order; bonds are stored as sorted pairs of atom indices;
+    atomic symbols are stored as atomic numbers (0 for dummy atoms) and stereo
+    parities as integer codes (-1 for None, 0 for False, 1 for True); the
+    adjacency is stored in compressed sparse row (CSR) form, so the neighbors
+    of atom `idx` are `ngb_idxs[ngb_ptrs[idx]:ngb_ptrs[idx+1]]` and the
+    corresponding bonds are `ngb_bnd_idxs[ngb_ptrs[idx]:ngb_ptrs[idx+1]]`
+
+batch format:
+    bgr = (atm_ptrs, atm_nums, atm_imp_hyd_vlcs, bnd_ptrs, bnd_idxs, bnd_ords)
+
+    the atoms and bonds of many graphs are concatenated, so that properties
+    of the whole batch can be computed in a few array operations; the atoms
+    of graph `idx` are `atm_ptrs[idx]:atm_ptrs[idx+1]` and its bonds are
+    `bnd_ptrs[idx]:bnd_ptrs[idx+1]`, with bonds stored as pairs of indices
+    into the concatenated atoms
+"""
+import numpy
+from qcelemental import periodictable as pt
+from automol.graph._graph import atoms as _atoms
+from automol.graph._graph import bonds as _bonds
+from automol.graph._graph import VALENCE_DCT as _VALENCE_DCT
+from automol.graph._graph import LONE_PAIR_COUNTS_DCT as _LONE_PAIR_COUNTS_DCT
+import automol.create.graph as _create
+
+ATM_KEYS_POS = 0
+ATM_NUMS_POS = 1
+ATM_IMP_HYD_VLCS_POS = 2
+ATM_STE_PARS_POS = 3
+BND_IDXS_POS = 4
+BND_ORDS_POS = 5
+BND_STE_PARS_POS = 6
+NGB_PTRS_POS = 7
+NGB_IDXS_POS = 8
+NGB_BND_IDXS_POS = 9
+
+BATCH_ATM_PTRS_POS = 0
+BATCH_ATM_NUMS_POS = 1
+BATCH_ATM_IMP_HYD_VLCS_POS = 2
+BATCH_BND_PTRS_POS = 3
+BATCH_BND_IDXS_POS = 4
+BATCH_BND_ORDS_POS = 5
+
+KEY_DTYPE = numpy.int64
+NUM_DTYPE = numpy.uint8
+VLC_DTYPE = numpy.uint8
+ORD_DTYPE = numpy.int8
+PAR_DTYPE = numpy.int8
+IDX_DTYPE = numpy.int32
+
+# element lookup tables, indexed by atomic number
+SYMBOLS = tuple(pt.E)
+ATOMIC_NUMBER_DCT = {sym: num for num, sym in enumerate(SYMBOLS)}
+GROUPS = tuple(pt.to_group(num) if num else None
+               for num in range(len(SYMBOLS)))
+ELEMENT_VALENCES = numpy.array(
+    [_VALENCE_DCT.get(grp, 0) for grp in GROUPS], dtype=VLC_DTYPE)
+LONE_PAIR_COUNTS = numpy.array(
+    [_LONE_PAIR_COUNTS_DCT.get(grp, 0) for grp in GROUPS], dtype=VLC_DTYPE)
+
+_PAR_CODE_DCT = {None: -1, False: 0, True: 1}
+_PAR_VAL_DCT = {-1: None, 0: False, 1: True}
+
+
+# conversions
+def from_graph(xgr):
+    """ compact array graph from a molecular graph
+    """
+    atm_dct = _atoms(xgr)
+    bnd_dct = _bonds(xgr)
+
+    atm_keys = sorted(atm_dct.keys())
+    atm_idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+    atm_vals = [atm_dct[atm_key] for atm_key in atm_keys]
+    atm_syms, atm_imp_hyd_vlcs, atm_ste_pars = (
+        zip(*atm_vals) if atm_vals else ((), (), ()))
+
+    bnd_idx_pairs = sorted(
+        tuple(sorted(map(atm_idx_dct.__getitem__, bnd_key)))
+        for bnd_key in bnd_dct.keys())
+    bnd_vals = [bnd_dct[frozenset(map(atm_keys.__getitem__, bnd_idx_pair))]
+                for bnd_idx_pair in bnd_idx_pairs]
+    bnd_ords, bnd_ste_pars = zip(*bnd_vals) if bnd_vals else ((), ())
+
+    natms = len(atm_keys)
+    bnd_idxs = numpy.array(bnd_idx_pairs, dtype=IDX_DTYPE).reshape(-1, 2)
+    ngb_ptrs, ngb_idxs, ngb_bnd_idxs = _adjacency_arrays(natms, bnd_idxs)
+
+    agr = (numpy.array(atm_keys, dtype=KEY_DTYPE),
+           numpy.array(list(map(_atomic_number, atm_syms)), dtype=NUM_DTYPE),
+           numpy.array(atm_imp_hyd_vlcs, dtype=VLC_DTYPE),
+           numpy.array(list(map(_PAR_CODE_DCT.__getitem__, atm_ste_pars)),
+                       dtype=PAR_DTYPE),
+           bnd_idxs,
+           numpy.array(bnd_ords, dtype=ORD_DTYPE),
+           numpy.array(list(map(_PAR_CODE_DCT.__getitem__, bnd_ste_pars)),
+                       dtype=PAR_DTYPE),
+           ngb_ptrs, ngb_idxs, ngb_bnd_idxs)
+    return agr
+
+
+def to_graph(agr):
+    """ molecular graph from a compact array graph
+    """
+    atm_keys = list(map(int, atom_keys(agr)))
+    atm_syms = list(map(SYMBOLS.__getitem__, atomic_numbers(agr)))
+    atm_imp_hyd_vlcs = list(map(int, atom_implicit_hydrogen_valences(agr)))
+    atm_ste_pars = list(map(_PAR_VAL_DCT.__getitem__,
+                            agr[ATM_STE_PARS_POS].tolist()))
+    bnd_keys = [frozenset(map(atm_keys.__getitem__, bnd_idx_pair))
+                for bnd_idx_pair in bond_indices(agr).tolist()]
+    bnd_ords = list(map(int, bond_orders(agr)))
+    bnd_ste_pars = list(map(_PAR_VAL_DCT.__getitem__,
+                            agr[BND_STE_PARS_POS].tolist()))
+
+    atm_dct = dict(zip(atm_keys,
+                       zip(atm_syms, atm_imp_hyd_vlcs, atm_ste_pars)))
+    bnd_dct = dict(zip(bnd_keys, zip(bnd_ords, bnd_ste_pars)))
+    return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
+
+
+# getters
+def atom_count(agr):
+    """ the number of atoms
+    """
+    return len(atom_keys(agr))
+
+
+def bond_count(agr):
+    """ the number of bonds
+    """
+    return len(bond_indices(agr))
+
+
+def atom_keys(agr):
+    """ atom keys, by atom index
+    """
+    return agr[ATM_KEYS_POS]
+
+
+def atomic_numbers(agr):
+    """ atomic numbers, by atom index
+    """
+    return agr[ATM_NUMS_POS]
+
+
+def atom_symbols(agr):
+    """ atomic symbols, by atom index
+    """
+    return numpy.array(SYMBOLS)[atomic_numbers(agr)]
+
+
+def atom_implicit_hydrogen_valences(agr):
+    """ atom implicit hydrogen valences, by atom index
+    """
+    return agr[ATM_IMP_HYD_VLCS_POS]
+
+
+def atom_stereo_parities(agr):
+    """ atom stereo parities, by atom index (-1 for None, 0 for False, 1 for
+    True)
+    """
+    return agr[ATM_STE_PARS_POS]
+
+
+def bond_indices(agr):
+    """ atom index pairs, by bond index
+    """
+    return agr[BND_IDXS_POS]
+
+
+def bond_keys(agr):
+    """ atom key pairs, by bond index
+    """
+    return atom_keys(agr)[bond_indices(agr)]
+
+
+def bond_orders(agr):
+    """ bond orders, by bond index
+    """
+    return agr[BND_ORDS_POS]
+
+
+def bond_stereo_parities(agr):
+    """ bond stereo parities, by bond index (-1 for None, 0 for False, 1 for
+    True)
+    """
+    return agr[BND_STE_PARS_POS]
+
+
+# adjacency
+def atom_degrees(agr):
+    """ the number of neighbors, by atom index
+    """
+    return numpy.diff(agr[NGB_PTRS_POS])
+
+
+def atom_neighbor_indices(agr, atm_idx):
+    """ indices of the neighbors of an atom
+    """
+    ngb_ptrs = agr[NGB_PTRS_POS]
+    return agr[NGB_IDXS_POS][ngb_ptrs[atm_idx]:ngb_ptrs[atm_idx+1]]
+
+
+def atom_bond_indices(agr, atm_idx):
+    """ indices of the bonds of an atom
+    """
+    ngb_ptrs = agr[NGB_PTRS_POS]
+    return agr[NGB_BND_IDXS_POS][ngb_ptrs[atm_idx]:ngb_ptrs[atm_idx+1]]
+
+
+# chemistry library
+def atom_element_valences(agr):
+    """ element valences (# possible single bonds), by atom index
+    """
+    return ELEMENT_VALENCES[atomic_numbers(agr)].astype(int)
+
+
+def atom_lone_pair_counts(agr):
+    """ lone pair counts, by atom index
+    """
+    return LONE_PAIR_COUNTS[atomic_numbers(agr)].astype(int)
+
+
+def atom_bond_valences(agr, bond_order=True):
+    """ bond count (bond valence), by atom index
+
+    (implicit hydrogens count as single bonds)
+    """
+    return _bond_valences(atom_implicit_hydrogen_valences(agr),
+                          bond_indices(agr), bond_orders(agr),
+                          bond_order=bond_order)
+
+
+def atom_unsaturated_valences(agr, bond_order=True):
+    """ unsaturated valences, by atom index
+
+    (element valences minus bonding valences -- pi sites and radical electrons)
+    """
+    return (atom_element_valences(agr) -
+            atom_bond_valences(agr, bond_order=bond_order))
+
+
+def maximum_spin_multiplicity(agr, bond_order=True):
+    """ the highest possible spin multiplicity for this molecular graph
+    """
+    return int(numpy.sum(atom_unsaturated_valences(
+        agr, bond_order=bond_order))) + 1
+
+
+# batches
+def from_graphs(xgrs):
+    """ a batch of molecular graphs, concatenated into flat arrays
+
+    (the atoms of each graph are in order of their keys, as for `from_graph`)
+    """
+    atm_cnts = []
+    bnd_cnts = []
+    atm_nums = []
+    atm_imp_hyd_vlcs = []
+    bnd_idxs = []
+    bnd_ords = []
+    for xgr in xgrs:
+        atm_dct = _atoms(xgr)
+        bnd_dct = _bonds(xgr)
+        offset = len(atm_nums)
+        atm_idx_dct = {atm_key: offset + idx
+                       for idx, atm_key in enumerate(sorted(atm_dct))}
+        for atm_key in sorted(atm_dct):
+            sym, imp_hyd_vlc, _ = atm_dct[atm_key]
+            atm_nums.append(_atomic_number(sym))
+            atm_imp_hyd_vlcs.append(imp_hyd_vlc)
+        for bnd_key, (bnd_ord, _) in bnd_dct.items():
+            bnd_idxs.append(sorted(map(atm_idx_dct.__getitem__, bnd_key)))
+            bnd_ords.append(bnd_ord)
+        atm_cnts.append(len(atm_dct))
+        bnd_cnts.append(len(bnd_dct))
+
+    bgr = (_pointers(atm_cnts),
+           numpy.array(atm_nums, dtype=NUM_DTYPE),
+           numpy.array(atm_imp_hyd_vlcs, dtype=VLC_DTYPE),
+           _pointers(bnd_cnts),
+           numpy.array(bnd_idxs, dtype=IDX_DTYPE).reshape(-1, 2),
+           numpy.array(bnd_ords, dtype=ORD_DTYPE))
+    return bgr
+
+
+def graph_count(bgr):
+    """ the number of graphs in a batch
+    """
+    return len(bgr[BATCH_ATM_PTRS_POS]) - 1
+
+
+def atom_graph_indices(bgr):
+    """ the index of the graph each atom in a batch belongs to
+    """
+    atm_ptrs = bgr[BATCH_ATM_PTRS_POS]
+    return numpy.repeat(numpy.arange(graph_count(bgr)), numpy.diff(atm_ptrs))
+
+
+def split_atom_values(bgr, vals):
+    """ split values for the atoms of a batch into arrays for each graph
+    """
+    return numpy.split(numpy.asarray(vals), bgr[BATCH_ATM_PTRS_POS][1:-1])
+
+
+def atom_element_valences_batch(bgr):
+    """ element valences (# possible single bonds), for the atoms of a batch
+    """
+    return ELEMENT_VALENCES[bgr[BATCH_ATM_NUMS_POS]].astype(int)
+
+
+def atom_lone_pair_counts_batch(bgr):
+    """ lone pair counts, for the atoms of a batch
+    """
+    return LONE_PAIR_COUNTS[bgr[BATCH_ATM_NUMS_POS]].astype(int)
+
+
+def atom_bond_valences_batch(bgr, bond_order=True):
+    """ bond count (bond valence), for the atoms of a batch
+
+    (implicit hydrogens count as single bonds)
+    """
+    return _bond_valences(bgr[BATCH_ATM_IMP_HYD_VLCS_POS],
+                          bgr[BATCH_BND_IDXS_POS], bgr[BATCH_BND_ORDS_POS],
+                          bond_order=bond_order)
+
+
+def atom_unsaturated_valences_batch(bgr, bond_order=True):
+    """ unsaturated valences, for the atoms of a batch
+    """
+    return (atom_element_valences_batch(bgr) -
+            atom_bond_valences_batch(bgr, bond_order=bond_order))
+
+
+def maximum_spin_multiplicities_batch(bgr, bond_order=True):
+    """ the highest possible spin multiplicity of each graph in a batch
+    """
+    atm_unsat_vlcs = atom_unsaturated_valences_batch(
+        bgr, bond_order=bond_order)
+    return _segment_sums(bgr, atm_unsat_vlcs) + 1
+
+
+def unsaturated_atom_counts_batch(bgr, bond_order=True):
+    """ the number of unsaturated (radical or pi-bonded) atoms in each graph
+    of a batch
+    """
+    atm_unsat_vlcs = atom_unsaturated_valences_batch(
+        bgr, bond_order=bond_order)
+    return _segment_sums(bgr, atm_unsat_vlcs > 0)
+
+
+# helpers
+def _atomic_number(sym):
+    return ATOMIC_NUMBER_DCT[sym] if sym in ATOMIC_NUMBER_DCT else pt.to_Z(sym)
+
+
+def _bond_valences(atm_imp_hyd_vlcs, bnd_idxs, bnd_ords, bond_order=True):
+    """ bond valences from implicit hydrogens and a bond array, summed per
+    atom with a single bincount
+    """
+    bnd_ords = bnd_ords.astype(int)
+    if not bond_order:
+        bnd_ords = (bnd_ords != 0).astype(int)
+
+    bnd_vlcs = numpy.bincount(bnd_idxs.ravel(),
+                              weights=numpy.repeat(bnd_ords, 2),
+                              minlength=len(atm_imp_hyd_vlcs)).astype(int)
+    return bnd_vlcs + atm_imp_hyd_vlcs
+
+
+def _segment_sums(bgr, atm_vals):
+    """ sums of atom values over each graph of a batch
+    """
+    return numpy.bincount(atom_graph_indices(bgr), weights=atm_vals,
+                          minlength=graph_count(bgr)).astype(int)
+
+
+def _pointers(cnts):
+    ptrs = numpy.zeros(len(cnts) + 1, dtype=IDX_DTYPE)
+    ptrs[1:] = numpy.cumsum(cnts)
+    return ptrs
+
+
+def _adjacency_arrays(natms, bnd_idxs):
+    """ CSR adjacency arrays (pointers, neighbor indices, bond indices)
+    """
+    nbnds = len(bnd_idxs)
+    rows = numpy.concatenate([bnd_idxs[:, 0], bnd_idxs[:, 1]])
+    cols = numpy.concatenate([bnd_idxs[:, 1], bnd_idxs[:, 0]])
+    bnds = numpy.concatenate([numpy.arange(nbnds), numpy.arange(nbnds)])
+    order = numpy.argsort(rows, kind='stable')
+
+    ngb_ptrs = numpy.zeros(natms + 1, dtype=IDX_DTYPE)
+    ngb_ptrs[1:] = numpy.cumsum(numpy.bincount(rows, minlength=natms))
+    ngb_idxs = cols[order].astype(IDX_DTYPE)
+    ngb_bnd_idxs = bnds[order].astype(IDX_DTYPE)
+    return ngb_ptrs, ngb_idxs, ngb_bnd_idxs
@@ -5,6 +5,7 @@ import itertools
 from automol import formula
 from automol import dict_
 import automol.convert.graph
+from automol.graph._edit import GraphEditor as _GraphEditor
 from automol.graph._graph import atom_keys as _atom_keys
 from automol.graph._graph import explicit as _explicit
 from automol.graph._graph import union as _union
@@ -12,7 +13,6 @@ from automol.graph._graph import relabel as _relabel
 from automol.graph._graph import connected_components as _connected_components
 from automol.graph._graph import full_isomorphism as _full_isomorphism
 from automol.graph._graph import add_bonds as _add_bonds
-from automol.graph._graph import remove_bonds as _remove_bonds
 from automol.graph._graph import atom_neighbor_keys as _atom_neighbor_keys
 from automol.graph._graph import (without_stereo_parities as
                                   _without_stereo_parities)
@@ -24,6 +24,8 @@ from automol.graph._graph import atom_stereo_parities as _atom_stereo_parities
 from automol.graph._graph import bond_stereo_parities as _bond_stereo_parities
 from automol.graph._res import (resonance_dominant_radical_atom_keys as
                                 _resonance_dominant_radical_atom_keys)
+from automol.graph._canon import refinement as _refinement
+from automol.graph._iso import class_isomorphisms as _class_isomorphisms
 from automol.graph._stereo import atom_stereo_keys as _atom_stereo_keys
 from automol.graph._stereo import bond_stereo_keys as _bond_stereo_keys
 from automol.graph._stereo import (stereo_sorted_atom_neighbor_keys as
@@ -64,9 +66,10 @@ def apply(tra, xgr):
     brk_bnd_keys = broken_bond_keys(tra)
     frm_bnd_keys = formed_bond_keys(tra)
     # in case some bonds are broken *and* formed, we subtract the other set
-    xgr = _remove_bonds(xgr, brk_bnd_keys - frm_bnd_keys)
-    xgr = _add_bonds(xgr, frm_bnd_keys - brk_bnd_keys)
-    return xgr
+    edt = _GraphEditor(xgr)
+    edt.remove_bonds(brk_bnd_keys - frm_bnd_keys)
+    edt.add_bonds(frm_bnd_keys - brk_bnd_keys)
+    return edt.graph()
 
 
 def form_dummy_bonds(tra, xgr):
@@ -150,111 +153,225 @@ def _permutation_parity(seq, ref_seq):
     return par
 
 
+# reaction classification
+def classify(xgr1, xgr2):
+    """ classify a reaction, trying each reaction class that could fit it
+
+    the components of either side, their formulas, radical and unsaturated
+    sites, and the refinement invariants that `canonical_hash` digests are
+    computed once and shared between the reaction classes; only the classes
+    that fit the numbers of reactant and product components are tried (and
+    none, if the two sides differ in formula)
+
+    :returns: the results of each class that matched, by the name of its
+        function in this module (in the form that function returns them)
+    :rtype: dict
+    """
+    rxn1 = _ReactionSide(xgr1)
+    rxn2 = _ReactionSide(xgr2)
+
+    cls_dct = {}
+    if rxn1.formula() == rxn2.formula():
+        ncmps = (len(rxn1.components()), len(rxn2.components()))
+        for cls_name in _CLASS_NAMES_BY_COMPONENT_COUNTS.get(ncmps, ()):
+            ret = _CLASS_FINDER_DCT[cls_name](rxn1, rxn2)
+            tra = ret[0] if cls_name in _CLASS_NAMES_WITH_INDICES else ret
+            if tra:
+                cls_dct[cls_name] = ret
+
+    return cls_dct
+
+
 def hydrogen_atom_migration(xgr1, xgr2):
     """ find a hydrogen migration transformation
     """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
+    return _hydrogen_atom_migration(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+def proton_migration(xgr1, xgr2):
+    """ find a proton migration transformation
+    """
+    return _proton_migration(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+def beta_scission(xgr1, xgr2):
+    """ find a beta scission transformation
+    """
+    return _beta_scission(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+def addition(xgr1, xgr2):
+    """ find an addition transformation
+    """
+    return _addition(_ReactionSide(xgr1), _ReactionSide(xgr2))
 
+
+def elimination(xgr1, xgr2):
+    """identifies elimination reactions
+    """
+    return _elimination(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+def substitution(xgr1, xgr2):
+    """identifies substitution reactions
+    """
+    return _substitution(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+def insertion(xgr1, xgr2):
+    """ find an insertion transformation
+    """
+    return _insertion(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+def hydrogen_abstraction(xgr1, xgr2):
+    """ find an addition transformation
+    """
+    return _hydrogen_abstraction(_ReactionSide(xgr1), _ReactionSide(xgr2))
+
+
+class _ReactionSide():
+    """ one side of a reaction, split into its components
+
+    the properties that the reaction classes look at are computed the first
+    time they are asked for, so they can be shared between the classes
+    """
+
+    def __init__(self, xgr):
+        assert xgr == _explicit(xgr)
+        self._xgr = xgr
+        self._xgrs = _connected_components(xgr)
+        self._vals = {}
+
+    def graph(self):
+        """ the graph for this side
+        """
+        return self._xgr
+
+    def components(self):
+        """ the connected components of the graph
+        """
+        return self._xgrs
+
+    def formula(self):
+        """ the formula for this side
+        """
+        return self._value(
+            'fml', lambda: automol.convert.graph.formula(self._xgr))
+
+    def refinement(self):
+        """ the refinement of the graph (see `_refined_isomorphism`)
+        """
+        return self._value('ref', lambda: _refinement(self._xgr))
+
+    def component_formulas(self):
+        """ the formulas of the components
+        """
+        return self._value('cmp_fmls', lambda: tuple(
+            map(automol.convert.graph.formula, self._xgrs)))
+
+    def component_refinements(self):
+        """ the refinements of the components
+        """
+        return self._value(
+            'cmp_refs', lambda: tuple(map(_refinement, self._xgrs)))
+
+    def component_radical_atom_keys(self):
+        """ resonance-dominant radical atom keys, by component
+        """
+        return self._value('cmp_rad_keys', lambda: tuple(
+            map(_resonance_dominant_radical_atom_keys, self._xgrs)))
+
+    def component_unsaturated_atom_keys(self):
+        """ unsaturated atom keys, by component
+        """
+        return self._value('cmp_unsat_keys', lambda: tuple(
+            map(_unsaturated_atom_keys, self._xgrs)))
+
+    def _value(self, name, func):
+        if name not in self._vals:
+            self._vals[name] = func()
+        return self._vals[name]
+
+
+def _hydrogen_atom_migration(rxn1, rxn2):
     tras = []
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
-
-    if len(xgrs1) == 1 and len(xgrs2) == 1:
-        xgr1, = xgrs1
-        xgr2, = xgrs2
-
-        h_atm_key1 = max(_atom_keys(xgr1)) + 1
-        h_atm_key2 = max(_atom_keys(xgr2)) + 1
-        rad_atm_keys1 = _resonance_dominant_radical_atom_keys(xgr1)
-        rad_atm_keys2 = _resonance_dominant_radical_atom_keys(xgr2)
-        for atm_key1, atm_key2 in itertools.product(rad_atm_keys1,
-                                                    rad_atm_keys2):
-            xgr1_h = _add_atom_explicit_hydrogen_keys(
-                xgr1, {atm_key1: [h_atm_key1]})
-            xgr2_h = _add_atom_explicit_hydrogen_keys(
-                xgr2, {atm_key2: [h_atm_key2]})
-           
-            inv_atm_key_dct = _full_isomorphism(xgr2_h, xgr1_h)
-            if inv_atm_key_dct:
-                tras.append(from_data(
-                    frm_bnd_keys=[{atm_key1,
-                                   inv_atm_key_dct[h_atm_key2]}],
-                    brk_bnd_keys=[{inv_atm_key_dct[atm_key2],
-                                   inv_atm_key_dct[h_atm_key2]}]))
+    if len(rxn1.components()) == 1 and len(rxn2.components()) == 1:
+        rad_atm_keys1, = rxn1.component_radical_atom_keys()
+        rad_atm_keys2, = rxn2.component_radical_atom_keys()
+        tras = _hydrogen_migrations(rxn1.graph(), rxn2.graph(),
+                                    rad_atm_keys1, rad_atm_keys2)
 
     if len(tras) < 1:
         tras = None
     return tras
 
 
-def proton_migration(xgr1, xgr2):
-    """ find a proton migration transformation
-    """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
-
+def _proton_migration(rxn1, rxn2):
     tras = []
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
-
-    h_atm_key1 = max(_atom_keys(xgr1)) + 1
-    h_atm_key2 = max(_atom_keys(xgr2)) + 1
+    if len(rxn1.components()) == 1 and len(rxn2.components()) == 1:
+        atm_keys1, = rxn1.component_unsaturated_atom_keys()
+        atm_keys2, = rxn2.component_unsaturated_atom_keys()
+        tras = _hydrogen_migrations(rxn1.graph(), rxn2.graph(),
+                                    atm_keys1, atm_keys2)
 
-    if len(xgrs1) == 1 and len(xgrs2) == 1:
-        xgr1, = xgrs1
-        xgr2, = xgrs2
-        atm_keys1 = _unsaturated_atom_keys(xgr1)
-        atm_keys2 = _unsaturated_atom_keys(xgr2)
-        for atm_key1, atm_key2 in itertools.product(atm_keys1, atm_keys2):
-            xgr1_h = _add_atom_explicit_hydrogen_keys(
-                xgr1, {atm_key1: [h_atm_key1]})
-            xgr2_h = _add_atom_explicit_hydrogen_keys(
-                xgr2, {atm_key2: [h_atm_key2]})
-
-            inv_atm_key_dct = _full_isomorphism(xgr2_h, xgr1_h)
-            if inv_atm_key_dct:
-                tras.append(from_data(
-                    frm_bnd_keys=[{atm_key1,
-                                   inv_atm_key_dct[h_atm_key2]}],
-                    brk_bnd_keys=[{inv_atm_key_dct[atm_key2],
-                                   inv_atm_key_dct[h_atm_key2]}]))
     if len(tras) < 1:
         tras = None
     return tras
 
 
-def beta_scission(xgr1, xgr2):
-    """ find a beta scission transformation
+def _hydrogen_migrations(xgr1, xgr2, atm_keys1, atm_keys2):
+    """ transformations moving a hydrogen onto one of `atm_keys1` in `xgr1`
+    from one of `atm_keys2`, as read off of `xgr2`
+
+    (each site is hydrogenated and refined once, so that only pairs of sites
+    whose hydrogenated graphs agree on their invariants need a search)
     """
+    h_atm_key1 = max(_atom_keys(xgr1)) + 1
+    h_atm_key2 = max(_atom_keys(xgr2)) + 1
+    xgr1_h_dct = {atm_key1: _add_atom_explicit_hydrogen_keys(
+        xgr1, {atm_key1: [h_atm_key1]}) for atm_key1 in atm_keys1}
+    xgr2_h_dct = {atm_key2: _add_atom_explicit_hydrogen_keys(
+        xgr2, {atm_key2: [h_atm_key2]}) for atm_key2 in atm_keys2}
+    ref1_dct = dict_.transform_values(xgr1_h_dct, _refinement)
+    ref2_dct = dict_.transform_values(xgr2_h_dct, _refinement)
+
+    tras = []
+    for atm_key1, atm_key2 in itertools.product(atm_keys1, atm_keys2):
+        inv_atm_key_dct = _refined_isomorphism(
+            xgr2_h_dct[atm_key2], xgr1_h_dct[atm_key1],
+            ref1=ref2_dct[atm_key2], ref2=ref1_dct[atm_key1])
+        if inv_atm_key_dct:
+            tras.append(from_data(
+                frm_bnd_keys=[{atm_key1,
+                               inv_atm_key_dct[h_atm_key2]}],
+                brk_bnd_keys=[{inv_atm_key_dct[atm_key2],
+                               inv_atm_key_dct[h_atm_key2]}]))
+    return tras
+
+
+def _beta_scission(rxn1, rxn2):
     tra = None
 
-    rev_tra = addition(xgr2, xgr1)
+    rev_tra = _addition(rxn2, rxn1)
     if rev_tra:
-        tra = _reverse(rev_tra, xgr2, xgr1)
+        tra = _reverse(rev_tra, rxn2.graph(), rxn1.graph(),
+                       ref2=rxn1.refinement())
 
     return tra
 
 
-def addition(xgr1, xgr2):
-    """ find an addition transformation
-    """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
-
+def _addition(rxn1, rxn2):
     tra = None
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
-
-    if len(xgrs1) == 2 and len(xgrs2) == 1:
-        x_xgr, y_xgr = xgrs1
-        xgr2, = xgrs2
-        x_atm_keys = _unsaturated_atom_keys(x_xgr)
-        y_atm_keys = _unsaturated_atom_keys(y_xgr)
-        xgeo = automol.graph.geometry(xgr2)
+    if len(rxn1.components()) == 2 and len(rxn2.components()) == 1:
+        x_xgr, y_xgr = rxn1.components()
+        x_atm_keys, y_atm_keys = rxn1.component_unsaturated_atom_keys()
         for x_atm_key, y_atm_key in itertools.product(x_atm_keys, y_atm_keys):
             xy_xgr = _add_bonds(
                 _union(x_xgr, y_xgr), [{x_atm_key, y_atm_key}])
-        
-            xgeo = automol.graph.geometry(xy_xgr)
-            atm_key_dct = _full_isomorphism(xy_xgr, xgr2)
+
+            atm_key_dct = _refined_isomorphism(xy_xgr, rxn2.graph(),
+                                               ref2=rxn2.refinement())
             if atm_key_dct:
                 tra = from_data(frm_bnd_keys=[{x_atm_key, y_atm_key}],
                                 brk_bnd_keys=[])
@@ -262,28 +379,18 @@ def addition(xgr1, xgr2):
     return tra
 
 
-def elimination(xgr1, xgr2):
-    """identifies elimination reactions
-    """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
+def _elimination(rxn1, rxn2):
     tra = None
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
-    print('xgrs1 test', xgrs1)
-    print('xgrs2 test', xgrs2)
-    print('length test:', len(xgrs1), len(xgrs2))
+    xgr1 = rxn1.graph()
+    xgr2 = rxn2.graph()
+    ref2 = rxn2.refinement()
     tras = []
-    if len(xgrs1) == 1 and len(xgrs2) == 2:
+    if len(rxn1.components()) == 1 and len(rxn2.components()) == 2:
         atms = automol.graph.atoms(xgr1)
         neighs = automol.graph.atom_neighbor_keys(xgr1)
         bnds = automol.graph.bond_keys(xgr1)
-        radicals = _resonance_dominant_radical_atom_keys(xgr1)
+        radicals, = rxn1.component_radical_atom_keys()
         lonepairs = automol.graph.atom_lone_pair_counts(xgr1)
-        print('radicals:', radicals)
-        print('lonepairs:', lonepairs)
-        print('atms:', atms)
-        print('neighs:', neighs)
-        print('bnds:', bnds)
         for atmi in atms:
             i_neighs = neighs[atmi]
             for atmj in i_neighs:
@@ -308,7 +415,8 @@ def elimination(xgr1, xgr2):
                                     bnd_form_key_kl = frozenset({atmk, atml})
                                     newnew_xgr = automol.graph.remove_bonds(new_xgr, [bnd_break_key_il])
                                     newnew_xgr = automol.graph.add_bonds(newnew_xgr, [bnd_form_key_kl])
-                                    atm_key_dct = _full_isomorphism(newnew_xgr, xgr2)
+                                    atm_key_dct = _refined_isomorphism(
+                                        newnew_xgr, xgr2, ref2=ref2)
                                     if atm_key_dct:
                                         tra = [[bnd_form_key_kl], [bnd_break_key_ij, bnd_break_key_il]]
                                         return tra
@@ -318,13 +426,12 @@ def elimination(xgr1, xgr2):
                                         bnd_form_key_km = frozenset({atmk, atmm})
                                         newnew_xgr = automol.graph.remove_bonds(new_xgr, [bnd_break_key_lm])
                                         newnew_xgr = automol.graph.add_bonds(newnew_xgr, [bnd_form_key_km])
-                                        atm_key_dct = _full_isomorphism(newnew_xgr, xgr2)
+                                        atm_key_dct = _refined_isomorphism(
+                                            newnew_xgr, xgr2, ref2=ref2)
                                         if atm_key_dct:
                                             tras.append([[bnd_form_key_km], [bnd_break_key_ij, bnd_break_key_lm]])
         for atmi in atms:
             i_neighs = neighs[atmi]
-            print('atmi test:', atmi)
-            print('i_neighs test:', i_neighs)
             for atmj in i_neighs:
                 bnd_break_key_ij = _get_bnd_key(atmi, atmj, bnds)
                 new_xgr = automol.graph.remove_bonds(xgr1, [bnd_break_key_ij])
@@ -338,15 +445,9 @@ def elimination(xgr1, xgr2):
                     neighsA = automol.graph.atom_neighbor_keys(xgrA)
                     atmsB = automol.graph.atoms(xgrB)
                     neighs_i = neighsA[atmi]
-                    print('len atmsB test:', len(atmsB))
                     for atmk in atmsB:
                         if lonepairs[atmk] > 0 or len(atmsB) == 1:
                         # if lonepairs[atmk] > 0:
-                            print('xgrA test:', xgrA)
-                            print('xgrB test:', xgrB)
-                            print('atmk in lonepairs:', atmk)
-                            print('neighs_i:', neighs_i)
-                            print('atmj:', atmj)
                             for atml in neighs_i:
                                 neighs_l = neighsA[atml]
                                 if atml != atmj:
@@ -354,7 +455,8 @@ def elimination(xgr1, xgr2):
                                     bnd_form_key_kl = frozenset({atmk, atml})
                                     newnew_xgr = automol.graph.remove_bonds(new_xgr, [bnd_break_key_il])
                                     newnew_xgr = automol.graph.add_bonds(newnew_xgr, [bnd_form_key_kl])
-                                    atm_key_dct = _full_isomorphism(newnew_xgr, xgr2)
+                                    atm_key_dct = _refined_isomorphism(
+                                        newnew_xgr, xgr2, ref2=ref2)
                                     if atm_key_dct:
                                         tra = [[bnd_form_key_kl], [bnd_break_key_ij, bnd_break_key_il]]
                                         return tra
@@ -364,30 +466,26 @@ def elimination(xgr1, xgr2):
                                         bnd_form_key_km = frozenset({atmk, atmm})
                                         newnew_xgr = automol.graph.remove_bonds(new_xgr, [bnd_break_key_lm])
                                         newnew_xgr = automol.graph.add_bonds(newnew_xgr, [bnd_form_key_km])
-                                        atm_key_dct = _full_isomorphism(newnew_xgr, xgr2)
+                                        atm_key_dct = _refined_isomorphism(
+                                            newnew_xgr, xgr2, ref2=ref2)
                                         if atm_key_dct:
                                             tras.append([[bnd_form_key_km], [bnd_break_key_ij, bnd_break_key_lm]])
     if len(tras) < 1:
         tras = None
     return tras
-            
 
-def substitution(xgr1, xgr2):
-    """identifies substitution reactions
-    """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
 
+def _substitution(rxn1, rxn2):
     tra = None
     idxs = None
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
-
-    print('len xgrs test:', len(xgrs1), len(xgrs2))
-    print('xgrs test:', xgrs1, xgrs2)
-
-    if len(xgrs1) == 2 and len(xgrs2) == 2:
-        xgrA, xgrB = xgrs1
-        xgrC, xgrD = xgrs2
+    xgr1 = rxn1.graph()
+    xgr2 = rxn2.graph()
+    ref1 = rxn1.refinement()
+    ref2 = rxn2.refinement()
+
+    if len(rxn1.components()) == 2 and len(rxn2.components()) == 2:
+        xgrA, xgrB = rxn1.components()
+        xgrC, xgrD = rxn2.components()
         atmsA = automol.graph.atoms(xgrA)
         neighsA = automol.graph.atom_neighbor_keys(xgrA)
         bndsA = automol.graph.bond_keys(xgrA)
@@ -400,16 +498,21 @@ def substitution(xgr1, xgr2):
         atmsD = automol.graph.atoms(xgrD)
         neighsD = automol.graph.atom_neighbor_keys(xgrD)
         bndsD = automol.graph.bond_keys(xgrD)
-        tra = _substitution(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2)
+        tra = _ordered_substitution(
+            atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2, ref2)
         idxs = [[0, 1], [0, 1]]
         if not tra:
-            tra = _substitution(atmsB, neighsB, bndsB, atmsA, neighsA, xgr1, xgr2)
+            tra = _ordered_substitution(
+                atmsB, neighsB, bndsB, atmsA, neighsA, xgr1, xgr2, ref2)
             idxs = [[0, 1], [1, 0]]
             if not tra:
-                tra = _substitution(atmsC, neighsC, bndsC, atmsD, neighsD, xgr2, xgr1)
+                tra = _ordered_substitution(
+                    atmsC, neighsC, bndsC, atmsD, neighsD, xgr2, xgr1, ref1)
                 idxs = [[1, 0], [0, 1]]
                 if not tra:
-                    tra = _substitution(atmsD, neighsD, bndsD, atmsC, neighsC, xgr2, xgr1)
+                    tra = _ordered_substitution(
+                        atmsD, neighsD, bndsD, atmsC, neighsC, xgr2, xgr1,
+                        ref1)
                     idxs = [[1, 0], [1, 0]]
                     if not tra:
                         idxs = None
@@ -417,17 +520,21 @@ def substitution(xgr1, xgr2):
         # return not substitution for radical + unsaturated reactions
         unsat_atm_keys = automol.graph.unsaturated_atom_keys(xgrA)
         # print('unsat test:', tra[0][0], unsat_atm_keys)
-        tra_list = list(tra[0])
-        for key in unsat_atm_keys:
-            if key in tra_list[0]:
-                pass
-                #tra = None
-                # commented out the tra = None and added pass to run CO + HO2
+        if tra:
+            tra_list = list(tra[0])
+            for key in unsat_atm_keys:
+                if key in tra_list[0]:
+                    pass
+                    #tra = None
+                    # commented out the tra = None and added pass to run CO + HO2
                         
     return tra, idxs
 
 
-def _substitution(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2):
+def _ordered_substitution(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2,
+                          ref2):
+    """Do the substitution for an order of reactants
+    """
     for atmi in atmsA:
         if _is_heavy(atmi, atmsA):
             i_neighs = neighsA[atmi]
@@ -438,48 +545,50 @@ def _substitution(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2):
                     if atmk != atmi and atmk != atmj:# and not atmi in neighsB[atmk] and not atmj in neighsB[atmk]:
                         bnd_form_key_ik = frozenset({atmi, atmk})
                         newnew_xgr = automol.graph.add_bonds(new_xgr, [bnd_form_key_ik])
-                        atm_key_dct = _full_isomorphism(newnew_xgr, xgr2)
+                        atm_key_dct = _refined_isomorphism(
+                            newnew_xgr, xgr2, ref2=ref2)
                         if atm_key_dct:
                             tra = [[bnd_form_key_ik], [bnd_break_key_ij]]
                             return tra
 
 
-def insertion(xgr1, xgr2):
-    """ find an insertion transformation
-    """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
-
+def _insertion(rxn1, rxn2):
     tra = None
     idxs = None
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
-    if len(xgrs1) == 2 and len(xgrs2) == 1:
-        xgrA, xgrB = xgrs1
+    xgr1 = rxn1.graph()
+    xgr2 = rxn2.graph()
+    ref2 = rxn2.refinement()
+    if len(rxn1.components()) == 2 and len(rxn2.components()) == 1:
+        xgrA, xgrB = rxn1.components()
         atmsA = automol.graph.atoms(xgrA)
         atmsB = automol.graph.atoms(xgrB)
         neighsA = automol.graph.atom_neighbor_keys(xgrA)
         neighsB = automol.graph.atom_neighbor_keys(xgrB)
         bndsA = automol.graph.bond_keys(xgrA)
         bndsB = automol.graph.bond_keys(xgrB)
-        tra = _insertion(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2)
+        tra = _ordered_insertion(
+            atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2, ref2)
         idxs = [0, 1]
         if not tra:
-            tra = _insertion(atmsB, neighsB, bndsB, atmsA, neighsA, xgr1, xgr2)
+            tra = _ordered_insertion(
+                atmsB, neighsB, bndsB, atmsA, neighsA, xgr1, xgr2, ref2)
             if tra:
                 idxs = [1, 0]
             else: 
                 idxs = None
-    elif len(xgrs1) == 1 and len(xgrs2) == 1:
+    elif len(rxn1.components()) == 1 and len(rxn2.components()) == 1:
         xgrA = xgr1
         idxs = [0]
         atmsA = automol.graph.atoms(xgrA)
         neighsA = automol.graph.atom_neighbor_keys(xgrA)
         bndsA = automol.graph.bond_keys(xgrA)
-        tra = _insertion(atmsA, neighsA, bndsA, atmsA, neighsA, xgr1, xgr2)
+        tra = _ordered_insertion(
+            atmsA, neighsA, bndsA, atmsA, neighsA, xgr1, xgr2, ref2)
     return tra, idxs
 
 
-def _insertion(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2):
+def _ordered_insertion(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2,
+                       ref2):
     """Do the insertion for an order of reactants
     """
     for i in atmsA:
@@ -493,7 +602,8 @@ def _insertion(atmsA, neighsA, bndsA, atmsB, neighsB, xgr1, xgr2):
                         bnd_form_key_ik = {i, k}
                         bnd_form_key_jk = {j, k}
                         newnew_xgr = automol.graph.add_bonds(new_xgr, [bnd_form_key_ik, bnd_form_key_jk])
-                        atm_key_dct = _full_isomorphism(newnew_xgr, xgr2)
+                        atm_key_dct = _refined_isomorphism(
+                            newnew_xgr, xgr2, ref2=ref2)
                         if atm_key_dct:
                             tra = [[bnd_form_key_ik, bnd_form_key_jk], [bnd_break_key_ij]]
                             return tra
@@ -516,24 +626,21 @@ def _get_bnd_key(idx1, idx2, bond_keys):
             return bnd
 
 
-def hydrogen_abstraction(xgr1, xgr2):
-    """ find an addition transformation
-    """
-    assert xgr1 == _explicit(xgr1) and xgr2 == _explicit(xgr2)
-
+def _hydrogen_abstraction(rxn1, rxn2):
     tra = None
-    xgrs1 = _connected_components(xgr1)
-    xgrs2 = _connected_components(xgr2)
+    xgrs1 = rxn1.components()
+    xgrs2 = rxn2.components()
 
     ret = formula.reac.argsort_hydrogen_abstraction(
-        list(map(automol.convert.graph.formula, xgrs1)),
-        list(map(automol.convert.graph.formula, xgrs2)))
+        list(rxn1.component_formulas()), list(rxn2.component_formulas()))
     if ret is not None:
         idxs1, idxs2 = ret
         q1h_xgr, q2_xgr = list(map(xgrs1.__getitem__, idxs1))
         q1_xgr, q2h_xgr = list(map(xgrs2.__getitem__, idxs2))
-        q1_tra = _partial_hydrogen_abstraction(q1h_xgr, q1_xgr)
-        q2_rev_tra = _partial_hydrogen_abstraction(q2h_xgr, q2_xgr)
+        q1h_ref = rxn1.component_refinements()[idxs1[0]]
+        q2h_ref = rxn2.component_refinements()[idxs2[1]]
+        q1_tra = _partial_hydrogen_abstraction(q1h_xgr, q1_xgr, q1h_ref)
+        q2_rev_tra = _partial_hydrogen_abstraction(q2h_xgr, q2_xgr, q2h_ref)
         if q1_tra and q2_rev_tra:
             xgr1_ = _union(apply(q1_tra, q1h_xgr), q2_xgr)
             xgr2_ = _union(q1_xgr, q2h_xgr)
@@ -546,7 +653,7 @@ def hydrogen_abstraction(xgr1, xgr2):
     return tra
 
 
-def _partial_hydrogen_abstraction(qh_xgr, q_xgr):
+def _partial_hydrogen_abstraction(qh_xgr, q_xgr, qh_ref=None):
     tra = None
     h_atm_key = max(_atom_keys(q_xgr)) + 1
     #rad_atm_keys = _resonance_dominant_radical_atom_keys(q_xgr)
@@ -555,7 +662,7 @@ def _partial_hydrogen_abstraction(qh_xgr, q_xgr):
     #for atm_key in rad_atm_keys:
         q_xgr_h = _add_atom_explicit_hydrogen_keys(
             q_xgr, {atm_key: [h_atm_key]})
-        inv_atm_key_dct = _full_isomorphism(q_xgr_h, qh_xgr)
+        inv_atm_key_dct = _refined_isomorphism(q_xgr_h, qh_xgr, ref2=qh_ref)
         if inv_atm_key_dct:
             brk_bnd_keys = [frozenset(
                 {inv_atm_key_dct[atm_key], inv_atm_key_dct[h_atm_key]})]
@@ -564,10 +671,10 @@ def _partial_hydrogen_abstraction(qh_xgr, q_xgr):
     return tra
 
 
-def _reverse(tra, xgr1, xgr2):
+def _reverse(tra, xgr1, xgr2, ref2=None):
     frm_bnd_keys = formed_bond_keys(tra)
     brk_bnd_keys = broken_bond_keys(tra)
-    atm_key_dct = _full_isomorphism(apply(tra, xgr1), xgr2)
+    atm_key_dct = _refined_isomorphism(apply(tra, xgr1), xgr2, ref2=ref2)
     rev_frm_bnd_keys = [frozenset(map(atm_key_dct.__getitem__, bnd_key))
                         for bnd_key in brk_bnd_keys]
     rev_brk_bnd_keys = [frozenset(map(atm_key_dct.__getitem__, bnd_key))
@@ -577,6 +684,40 @@ def _reverse(tra, xgr1, xgr2):
     return rev_tra
 
 
+def _refined_isomorphism(xgr1, xgr2, ref1=None, ref2=None):
+    """ full isomorphism of `xgr1` onto `xgr2`, reusing their refinements
+    (classes and invariants, as returned by `refinement`) where they are
+    already known
+
+    (graphs whose invariants differ are told apart without a search)
+    """
+    cls_dct1, invs1 = _refinement(xgr1) if ref1 is None else ref1
+    cls_dct2, invs2 = _refinement(xgr2) if ref2 is None else ref2
+    if invs1 != invs2:
+        return None
+    return next(_class_isomorphisms(xgr1, xgr2, cls_dct1, cls_dct2), None)
+
+
+# reaction classes that fit each pair of (reactant, product) component counts
+_CLASS_NAMES_BY_COMPONENT_COUNTS = {
+    (1, 1): ('hydrogen_atom_migration', 'proton_migration', 'insertion'),
+    (2, 1): ('addition', 'insertion'),
+    (1, 2): ('beta_scission', 'elimination'),
+    (2, 2): ('hydrogen_abstraction', 'substitution'),
+}
+_CLASS_NAMES_WITH_INDICES = ('insertion', 'substitution')
+_CLASS_FINDER_DCT = {
+    'hydrogen_atom_migration': _hydrogen_atom_migration,
+    'proton_migration': _proton_migration,
+    'beta_scission': _beta_scission,
+    'addition': _addition,
+    'elimination': _elimination,
+    'substitution': _substitution,
+    'insertion': _insertion,
+    'hydrogen_abstraction': _hydrogen_abstraction,
+}
+
+
 def _is_atom_key(obj):
     return isinstance(obj, numbers.Integral)
 
@@ -1,5 +1,7 @@
 """ test automol.graph
 """
+import os
+import tempfile
 import numpy
 import automol
 from automol import graph
@@ -29,6 +31,17 @@ C8H13O_SGR = (
      frozenset({6, 7}): (1, None), frozenset({8, 7}): (1, None),
      frozenset({3, 5}): (1, False), frozenset({5, 7}): (1, None)})
 
+C5H5N5O_CGR = (
+    {0: ('C', 1, None), 1: ('C', 0, None), 2: ('C', 0, None),
+     3: ('C', 0, None), 4: ('C', 0, None), 5: ('N', 2, None),
+     6: ('N', 0, None), 7: ('N', 0, None), 8: ('N', 0, None),
+     9: ('N', 1, None), 10: ('O', 1, None)},
+    {frozenset({10, 4}): (1, None), frozenset({8, 2}): (1, None),
+     frozenset({0, 6}): (1, None), frozenset({9, 3}): (1, None),
+     frozenset({1, 2}): (1, None), frozenset({3, 7}): (1, None),
+     frozenset({2, 5}): (1, None), frozenset({1, 6}): (1, None),
+     frozenset({0, 7}): (1, None), frozenset({9, 4}): (1, None),
+     frozenset({1, 3}): (1, None), frozenset({8, 4}): (1, None)})
 
 C3H3_CGR = (
     {0: ('C', 1, None), 1: ('C', 1, None), 2: ('C', 1, None)},
@@ -192,6 +205,25 @@ C3H5N3_SGRS = (
       frozenset({2, 5}): (1, None)}),
 )
 
+# norborneol (bicyclic, bridged)
+C7H12O_CGR = (
+    {0: ('O', 1, None), 1: ('C', 1, None), 2: ('C', 2, None),
+     3: ('C', 1, None), 4: ('C', 2, None), 5: ('C', 2, None),
+     6: ('C', 1, None), 7: ('C', 2, None)},
+    {frozenset({0, 1}): (1, None), frozenset({1, 2}): (1, None),
+     frozenset({2, 3}): (1, None), frozenset({3, 4}): (1, None),
+     frozenset({4, 5}): (1, None), frozenset({5, 6}): (1, None),
+     frozenset({6, 7}): (1, None), frozenset({1, 6}): (1, None),
+     frozenset({3, 7}): (1, None)})
+
+# fluorobicyclobutane (bicyclic, fused, with a pseudo-asymmetric apex)
+C4H5F_CGR = (
+    {0: ('C', 1, None), 1: ('C', 1, None), 2: ('F', 0, None),
+     6: ('C', 2, None), 9: ('C', 1, None)},
+    {frozenset({0, 1}): (1, None), frozenset({0, 9}): (1, None),
+     frozenset({1, 9}): (1, None), frozenset({1, 6}): (1, None),
+     frozenset({6, 9}): (1, None), frozenset({0, 2}): (1, None)})
+
 C8H13O_SGRS = (
     ({0: ('C', 3, None), 1: ('C', 2, None), 2: ('C', 3, None),
       3: ('C', 1, None), 4: ('C', 1, None), 5: ('C', 1, None),
@@ -283,6 +315,61 @@ def test__from_data():
     assert sgr == C8H13O_SGR
 
 
+def test__from_trusted_atoms_and_bonds():
+    """ test automol.create.graph.from_trusted_atoms_and_bonds
+    """
+    atm_dct, bnd_dct = C8H13O_SGR
+    assert automol.create.graph.from_trusted_atoms_and_bonds(
+        atm_dct, bnd_dct) == C8H13O_SGR
+
+    # invalid data is only caught with validation on
+    bad_atm_dct = dict(atm_dct)
+    bad_atm_dct[8] = ('o', 0, None)
+    automol.create.graph.from_trusted_atoms_and_bonds(bad_atm_dct, bnd_dct)
+
+    automol.create.graph.enable_validation()
+    try:
+        assert automol.create.graph.validation_enabled()
+        assert graph.explicit(C8H13O_SGR) == graph.explicit(C8H13O_SGR)
+        try:
+            automol.create.graph.from_trusted_atoms_and_bonds(
+                bad_atm_dct, bnd_dct)
+            raise RuntimeError('validation was skipped')
+        except AssertionError:
+            pass
+    finally:
+        automol.create.graph.disable_validation()
+
+
+def test__graph_editor():
+    """ test graph.GraphEditor
+    """
+    cgr = graph.explicit(C8H13O_CGR)
+
+    edt = graph.GraphEditor(C8H13O_CGR)
+    edt.increment_bond_orders({frozenset({1, 4}): 1, frozenset({3, 5}): 1})
+    assert edt.graph() == C8H13O_RGR
+
+    edt = graph.GraphEditor(cgr)
+    edt.remove_atoms(graph.explicit_hydrogen_keys(cgr))
+    edt.set_atom_implicit_hydrogen_valences(
+        graph.atom_implicit_hydrogen_valences(C8H13O_CGR))
+    assert edt.graph() == C8H13O_CGR
+
+    # edits are made on a copy
+    assert cgr == graph.explicit(C8H13O_CGR)
+
+    edt = graph.GraphEditor(C8H13O_CGR)
+    edt.add_atoms({9: 'C', 10: 'H'}, imp_hyd_vlc_dct={9: 3})
+    edt.add_bonds([{8, 9}, {1, 10}])
+    edt.add_atom_implicit_hydrogen_valences({1: -1})
+    assert edt.graph() == graph.add_bonds(
+        graph.add_atom_implicit_hydrogen_valences(
+            graph.add_atoms(C8H13O_CGR, {9: 'C', 10: 'H'}, {9: 3}), {1: -1}),
+        [{8, 9}, {1, 10}])
+    assert list(graph.atoms(edt.graph())) == list(range(11))
+
+
 def test__set_atom_implicit_hydrogen_valences():
     """ test graph.set_atom_implicit_hydrogen_valences
     """
@@ -371,22 +458,27 @@ def test__branch():
     )
 
 
+def test__all_branches():
+    """ test graph.all_branches
+    """
+    bnch_dct = graph.all_branches(C8H13O_CGR)
+    assert bnch_dct[frozenset({6, 4})] == {
+        6: frozenset({1, 4}), 4: frozenset({0, 2, 3, 5, 6, 7, 8})}
+    for bnd_key, atm_bnch_dct in bnch_dct.items():
+        for atm_key, bnch_atm_keys in atm_bnch_dct.items():
+            assert bnch_atm_keys == graph.branch_atom_keys(
+                C8H13O_CGR, atm_key, bnd_key)
+
+    # ring bonds
+    bnch_dct = graph.all_branches(C3H3_CGR)
+    assert bnch_dct[frozenset({0, 1})] == {
+        0: frozenset({1, 2}), 1: frozenset({0, 2})}
+
+
 def test__rings():
     """ test graph.rings
     """
-    c5h5n5o_cgr = (
-        {0: ('C', 1, None), 1: ('C', 0, None), 2: ('C', 0, None),
-         3: ('C', 0, None), 4: ('C', 0, None), 5: ('N', 2, None),
-         6: ('N', 0, None), 7: ('N', 0, None), 8: ('N', 0, None),
-         9: ('N', 1, None), 10: ('O', 1, None)},
-        {frozenset({10, 4}): (1, None), frozenset({8, 2}): (1, None),
-         frozenset({0, 6}): (1, None), frozenset({9, 3}): (1, None),
-         frozenset({1, 2}): (1, None), frozenset({3, 7}): (1, None),
-         frozenset({2, 5}): (1, None), frozenset({1, 6}): (1, None),
-         frozenset({0, 7}): (1, None), frozenset({9, 4}): (1, None),
-         frozenset({1, 3}): (1, None), frozenset({8, 4}): (1, None)})
-
-    assert graph.rings(c5h5n5o_cgr) == (
+    assert graph.rings(C5H5N5O_CGR) == (
         ({0: ('C', 1, None), 1: ('C', 0, None), 3: ('C', 0, None),
           6: ('N', 0, None), 7: ('N', 0, None)},
          {frozenset({0, 6}): (1, None), frozenset({3, 7}): (1, None),
@@ -400,6 +492,21 @@ def test__rings():
     )
 
 
+def test__ring_memberships():
+    """ test graph.atom_ring_memberships and graph.bond_smallest_ring_sizes
+    """
+    assert graph.atom_ring_memberships(C5H5N5O_CGR) == {
+        0: 1, 1: 2, 2: 1, 3: 2, 4: 1, 5: 0, 6: 1, 7: 1, 8: 1, 9: 1, 10: 0}
+    assert graph.bond_ring_memberships(C5H5N5O_CGR)[frozenset({1, 3})] == 2
+    assert graph.atom_smallest_ring_sizes(C5H5N5O_CGR) == {
+        0: 5, 1: 5, 2: 6, 3: 5, 4: 6, 5: None, 6: 5, 7: 5, 8: 6, 9: 6,
+        10: None}
+    bnd_rng_size_dct = graph.bond_smallest_ring_sizes(C5H5N5O_CGR)
+    assert bnd_rng_size_dct[frozenset({1, 3})] == 5
+    assert bnd_rng_size_dct[frozenset({1, 2})] == 6
+    assert bnd_rng_size_dct[frozenset({2, 5})] is None
+
+
 def test__connected_components():
     """ test graph.connected_components
     """
@@ -415,6 +522,18 @@ def test__connected_components():
     assert cmp_gras in [(gra1, gra2), (gra2, gra1)]
 
 
+def test__connected_components_batch():
+    """ test graph.connected_components_batch
+    """
+    gra1 = C3H3_CGR
+    gra2 = graph.transform_keys(C2_CGR, lambda x: x + 3)
+    gra = graph.union(gra1, gra2)
+    assert graph.connected_components_batch([gra, gra1, ({}, {})]) == (
+        (gra1, gra2), (gra1,), ())
+    assert graph.connected_components_atom_keys(gra) == (
+        frozenset({0, 1, 2}), frozenset({3, 4}))
+
+
 def test__subgraph():
     """ test graph.subgraph
     """
@@ -509,6 +628,34 @@ def test__implicit():
 
 
 # # comparisons
+def test__full_isomorphism():
+    """ test graph.full_isomorphism
+    """
+    sgr = graph.explicit(C8H13O_SGR)
+    natms = len(graph.atoms(sgr))
+    for _ in range(10):
+        pmt_dct = dict(enumerate(numpy.random.permutation(natms)))
+        sgr_pmt = graph.relabel(sgr, pmt_dct)
+        iso_dct = graph.full_isomorphism(sgr, sgr_pmt)
+        assert graph.relabel(sgr, iso_dct) == sgr_pmt
+
+    assert graph.full_isomorphism(
+        graph.explicit(C8H13O_CGR), graph.explicit(C8H13O_RGR)) is None
+
+    # a six-membered ring vs. two three-membered rings
+    c6_cgr = ({0: ('C', 0, None), 1: ('C', 0, None), 2: ('C', 0, None),
+               3: ('C', 0, None), 4: ('C', 0, None), 5: ('C', 0, None)},
+              {frozenset({0, 1}): (1, None), frozenset({1, 2}): (1, None),
+               frozenset({2, 3}): (1, None), frozenset({3, 4}): (1, None),
+               frozenset({4, 5}): (1, None), frozenset({5, 0}): (1, None)})
+    c3c3_cgr = ({0: ('C', 0, None), 1: ('C', 0, None), 2: ('C', 0, None),
+                 3: ('C', 0, None), 4: ('C', 0, None), 5: ('C', 0, None)},
+                {frozenset({0, 1}): (1, None), frozenset({1, 2}): (1, None),
+                 frozenset({2, 0}): (1, None), frozenset({3, 4}): (1, None),
+                 frozenset({4, 5}): (1, None), frozenset({5, 3}): (1, None)})
+    assert graph.full_isomorphism(c6_cgr, c3c3_cgr) is None
+
+
 def test__backbone_isomorphic():
     """ test graph.backbone_isomorphic
     """
@@ -539,6 +686,113 @@ def test__backbone_unique():
     assert graph.backbone_unique(C3H3_RGRS) == C3H3_RGRS[:2]
 
 
+def test__canonical_hash():
+    """ test graph.canonical_hash
+    """
+    sgr = graph.relabel(C8H13O_SGR, {0: 8, 1: 7, 2: 6, 3: 5, 4: 4, 5: 3, 6: 2,
+                                     7: 1, 8: 0})
+    assert graph.canonical_hash(sgr) == graph.canonical_hash(C8H13O_SGR)
+    assert graph.canonical_hash(C8H13O_SGR) != graph.canonical_hash(
+        C8H13O_CGR)
+    assert graph.canonical_hash(C8H13O_SGR, stereo=False) == (
+        graph.canonical_hash(C8H13O_CGR, stereo=False))
+    assert graph.canonical_hash(C8H13O_RGR) != graph.canonical_hash(
+        C8H13O_CGR)
+
+    assert graph.backbone_hash(C8H13O_CGR) == graph.backbone_hash(
+        graph.explicit(C8H13O_CGR))
+    assert len(set(map(graph.backbone_hash, C3H3_RGRS))) == 2
+
+    cls_dct = graph.atom_classes(C3H3_RGRS[1])
+    assert cls_dct[1] == cls_dct[2] != cls_dct[0]
+
+
+def test__automorphisms():
+    """ test graph.automorphism_group_order
+    """
+    assert graph.automorphism_group_order(C2H2CL2F2_CGR) == 2
+    assert graph.automorphism_generators(C2H2CL2F2_CGR) == (
+        {0: 1, 1: 0, 2: 4, 3: 5, 4: 2, 5: 3},)
+    assert graph.atom_orbits(C2H2CL2F2_CGR) == (
+        frozenset({0, 1}), frozenset({2, 4}), frozenset({3, 5}))
+    assert graph.bond_orbits(C2H2CL2F2_CGR) == (
+        frozenset({frozenset({0, 1})}),
+        frozenset({frozenset({0, 2}), frozenset({1, 4})}),
+        frozenset({frozenset({0, 3}), frozenset({1, 5})}))
+    assert graph.symmetry_unique_atom_keys(C2H2CL2F2_CGR) == {0, 2, 3}
+    assert graph.symmetry_unique_bond_keys(C2H2CL2F2_CGR) == {
+        frozenset({0, 1}), frozenset({0, 2}), frozenset({0, 3})}
+
+    # two methyl groups and a methylene group
+    xgr = graph.explicit(C8H13O_CGR)
+    assert graph.automorphism_group_order(xgr) == 72
+    assert graph.automorphism_group_order(graph.implicit(xgr)) == 1
+    assert len(graph.symmetry_unique_atom_keys(
+        xgr, graph.explicit_hydrogen_keys(xgr))) == 8
+
+
+def test__substructure_matches():
+    """ test graph.substructure_matches
+    """
+    # allyl hydroperoxide
+    rgr = ({0: ('C', 2, None), 1: ('C', 1, None), 2: ('C', 2, None),
+            3: ('O', 0, None), 4: ('O', 1, None)},
+           {frozenset({0, 1}): (2, None), frozenset({1, 2}): (1, None),
+            frozenset({2, 3}): (1, None), frozenset({3, 4}): (1, None)})
+
+    assert graph.functional_groups(rgr) == {
+        'abstractable_hydrogen': ({0: 0}, {0: 1}, {0: 2}, {0: 4}),
+        'alkene': ({0: 0, 1: 1},),
+        'hydroperoxy': ({0: 2, 1: 3, 2: 4},)}
+
+    # hydrogens are matched as counts, whether implicit or explicit
+    assert graph.functional_groups(graph.explicit(rgr), ['hydroperoxy']) == {
+        'hydroperoxy': ({0: 2, 1: 3, 2: 4},)}
+
+    # wildcards and alternatives
+    pat = graph.pattern({0: '*', 1: 'C', 2: {'O', 'N'}}, [{0, 1}, {1, 2}])
+    assert graph.substructure_matches(rgr, pat) == ({0: 1, 1: 2, 2: 3},)
+    assert len(graph.substructure_matches(rgr, pat, unique=False)) == 1
+    pat = graph.pattern({0: 'C', 1: 'C'}, [{0, 1}])
+    assert len(graph.substructure_matches(rgr, pat)) == 2
+    assert len(graph.substructure_matches(rgr, pat, unique=False)) == 4
+    assert not graph.has_substructure(
+        rgr, graph.pattern({0: 'N'}, []))
+
+    assert graph.substructure_matches_batch(
+        [rgr, C8H13O_CGR], {'alkene': graph.FUNCTIONAL_GROUPS['alkene']}) == (
+            {'alkene': ({0: 0, 1: 1},)}, {})
+
+
+def test__dumps():
+    """ test graph.dumps and graph.loads
+    """
+    xgrs = (C8H13O_SGR, graph.explicit(C8H13O_SGR), C2H2CL2F2_CGR, ({}, {}))
+    for xgr in xgrs:
+        assert graph.loads(graph.dumps(xgr)) == xgr
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        file_path = os.path.join(dir_path, 'graphs.bin')
+        assert graph.dump_file(iter(xgrs), file_path) == 4
+        with graph.GraphFile(file_path) as gfl:
+            assert len(gfl) == 4
+            assert gfl[1] == xgrs[1]
+            assert gfl[-1] == xgrs[-1]
+            assert tuple(gfl) == xgrs
+
+    # graphs that wouldn't load back unchanged are refused
+    bad_xgrs = (({0: ('D', 0, None)}, {}),
+                ({0: ('C', 2, None), 1: ('C', 2, None)},
+                 {frozenset({0, 1}): (1.5, None)}))
+    for xgr in bad_xgrs:
+        refused = False
+        try:
+            graph.dumps(xgr)
+        except AssertionError:
+            refused = True
+        assert refused
+
+
 # chemistry library
 def test__atom_element_valences():
     """ test graph.atom_element_valences
@@ -598,6 +852,26 @@ def test__bond_symmetry_numbers():
 
 
 # resonance graph library
+# # analysis
+def test__resonance_analysis():
+    """ test graph.resonance_analysis
+    """
+    res_ana = graph.resonance_analysis(C8H13O_CGR)
+    assert res_ana.dominant_resonances() == graph.dominant_resonances(
+        C8H13O_CGR)
+    assert (res_ana.atom_hybridizations() ==
+            graph.resonance_dominant_atom_hybridizations(C8H13O_CGR))
+    assert res_ana.radical_atom_keys() == frozenset({8})
+    assert (res_ana.bond_orders() ==
+            graph.resonance_dominant_bond_orders(C8H13O_CGR))
+
+    # the properties are kept, but callers can't change them
+    bnd_ords_dct = res_ana.bond_orders()
+    bnd_ords_dct.clear()
+    assert res_ana.bond_orders() == graph.resonance_dominant_bond_orders(
+        C8H13O_CGR)
+
+
 # # atom properties
 def test__resonance_dominant_atom_hybridizations():
     """ test graph.resonance_dominant_atom_hybridizations
@@ -667,6 +941,12 @@ def test__resonances():
     """
     assert graph.resonances(C3H3_CGR) == C3H3_RGRS
 
+    # benzene has one resonance for each matching of its ring bonds
+    c6h6_cgr = ({key: ('C', 1, None) for key in range(6)},
+                {frozenset({key, (key + 1) % 6}): (1, None)
+                 for key in range(6)})
+    assert len(graph.resonances(c6h6_cgr)) == 18
+
 
 def test__subresonances():
     """ test graph.subresonances
@@ -679,6 +959,21 @@ def test__dominant_resonances():
     """
     assert graph.dominant_resonances(C3H3_CGR) == C3H3_RGRS[1:]
 
+    # benzyl radical: the lowest-spin resonances, out of all of them
+    c7h7_cgr = ({0: ('C', 2, None), 1: ('C', 0, None), 2: ('C', 1, None),
+                 3: ('C', 1, None), 4: ('C', 1, None), 5: ('C', 1, None),
+                 6: ('C', 1, None)},
+                {frozenset({0, 1}): (1, None), frozenset({1, 2}): (1, None),
+                 frozenset({2, 3}): (1, None), frozenset({3, 4}): (1, None),
+                 frozenset({4, 5}): (1, None), frozenset({5, 6}): (1, None),
+                 frozenset({6, 1}): (1, None)})
+    rgrs = graph.resonances(c7h7_cgr)
+    mults = list(map(graph.maximum_spin_multiplicity, rgrs))
+    dom_rgrs = graph.dominant_resonances(c7h7_cgr)
+    assert len(dom_rgrs) == 5
+    assert dom_rgrs == tuple(rgr for rgr, mult in zip(rgrs, mults)
+                             if mult == min(mults))
+
 
 def test__dominant_resonance():
     """ test graph.dominant_resonance
@@ -708,7 +1003,86 @@ def test__rotational_bond_keys():
             frozenset({frozenset({2, 3})}))
 
 
+# rotor library
+def test__rotors():
+    """ test graph.rotors
+    """
+    rot_dct = graph.rotors(C8H13O_CGR, with_h_rotors=False)
+    assert set(rot_dct) == {
+        frozenset({4, 6}), frozenset({5, 7}), frozenset({6, 7})}
+    assert rot_dct[frozenset({4, 6})].symmetry_number == 1
+    assert dict(rot_dct[frozenset({4, 6})].branch_atom_keys)[6] == frozenset(
+        {1, 4, 12, 13, 18})
+
+    # a result can't be used to change the cached rotors
+    graph.enable_cache()
+    try:
+        ref_rot_dct = graph.rotors(C8H13O_CGR)
+        rot_dct = graph.rotors(C8H13O_CGR)
+        rot_dct.clear()
+        assert graph.rotors(C8H13O_CGR) == ref_rot_dct != {}
+        assert all(isinstance(bnch_atm_keys, frozenset)
+                   for rot in ref_rot_dct.values()
+                   for _, bnch_atm_keys in rot.branch_atom_keys)
+    finally:
+        graph.disable_cache()
+
+
+def test__rotors_batch():
+    """ test graph.rotors_batch
+    """
+    cgrs = [C8H13O_CGR, C3H3_CGR, C8H13O_CGR]
+    rot_dcts = tuple(map(graph.rotors, cgrs))
+    assert graph.rotors_batch(cgrs, nprocs=1) == rot_dcts
+    assert graph.rotors_batch(cgrs, nprocs=2) == rot_dcts
+
+
 # stereo graph library
+def test__stereo_priority_ranks():
+    """ test graph.stereo_priority_ranks
+    """
+    # branches from C1 of 1-chloro-1-fluoroethane (hydrogens rank lowest and
+    # atoms are compared by symbol, as for the priority vectors)
+    xgr = graph.explicit(
+        ({0: ('C', 3, None), 1: ('C', 1, None), 2: ('F', 0, None),
+          3: ('Cl', 0, None)},
+         {frozenset({0, 1}): (1, None), frozenset({1, 2}): (1, None),
+          frozenset({1, 3}): (1, None)}))
+    atm_ngb_keys = graph.atom_neighbor_keys(xgr)[1]
+    hyd_key, = atm_ngb_keys - {0, 2, 3}
+    assert graph.stereo_priority_ranks(xgr)[(1, hyd_key)] == -1
+    assert graph.stereo_sorted_atom_neighbor_keys(
+        xgr, 1, atm_ngb_keys) == (hyd_key, 0, 3, 2)
+    assert tuple(sorted(
+        atm_ngb_keys, key=lambda atm_ngb_key: graph.stereo_priority_vector(
+            xgr, 1, atm_ngb_key))) == (hyd_key, 0, 3, 2)
+
+    # the two methyl branches of isopropanol tie
+    rnk_dct = graph.stereo_priority_ranks(
+        ({0: ('C', 3, None), 1: ('C', 1, None), 2: ('C', 3, None),
+          3: ('O', 1, None)},
+         {frozenset({0, 1}): (1, None), frozenset({1, 2}): (1, None),
+          frozenset({1, 3}): (1, None)}))
+    assert rnk_dct[(1, 0)] == rnk_dct[(1, 2)] != rnk_dct[(1, 3)]
+
+    # distinct branches keep the order of their priority vectors, so stored
+    # parities keep their meaning (C1 of CH3-CHF-C(F)(CH3)-CHClF)
+    xgr = graph.explicit(
+        ({0: ('C', 1, None), 1: ('C', 0, None), 2: ('C', 1, None),
+          3: ('F', 0, None), 4: ('C', 3, None), 5: ('F', 0, None),
+          6: ('Cl', 0, None), 7: ('F', 0, None), 8: ('C', 3, None)},
+         {frozenset({0, 4}): (1, None), frozenset({0, 3}): (1, None),
+          frozenset({0, 1}): (1, None), frozenset({1, 5}): (1, None),
+          frozenset({1, 8}): (1, None), frozenset({1, 2}): (1, None),
+          frozenset({2, 6}): (1, None), frozenset({2, 7}): (1, None)}))
+    atm_ngb_keys = graph.atom_neighbor_keys(xgr)[1]
+    assert graph.stereo_sorted_atom_neighbor_keys(
+        xgr, 1, atm_ngb_keys) == (2, 0, 8, 5)
+    assert tuple(sorted(
+        atm_ngb_keys, key=lambda atm_ngb_key: graph.stereo_priority_vector(
+            xgr, 1, atm_ngb_key))) == (2, 0, 8, 5)
+
+
 def test__stereogenic_atom_keys():
     """ test graph.stereogenic_atom_keys
     """
@@ -742,6 +1116,26 @@ def test__stereomers():
     assert graph.stereomers(C8H13O_CGR) == C8H13O_SGRS
 
 
+def test__iterate_stereomers():
+    """ test graph.iterate_stereomers
+    """
+    # the two labelings of the meso compound are only yielded once
+    sgrs = tuple(graph.iterate_stereomers(C2H2CL2F2_CGR))
+    assert len(sgrs) == 3
+    assert all(sgr in C2H2CL2F2_SGRS for sgr in sgrs)
+    assert len(tuple(graph.iterate_stereomers(C2H2CL2F2_CGR,
+                                              unique=False))) == 4
+    assert tuple(graph.iterate_stereomers(C8H13O_CGR, limit=2)) == (
+        tuple(graph.iterate_stereomers(C8H13O_CGR))[:2])
+
+    # assigned parities are kept
+    sgr = graph.set_atom_stereo_parities(C2H2CL2F2_CGR, {0: True})
+    sub_sgrs = graph.substereomers(sgr)
+    sgrs = tuple(graph.iterate_stereomers(sgr, unique=False))
+    assert len(sgrs) == len(sub_sgrs) == 2
+    assert all(sgr_ in sub_sgrs for sgr_ in sgrs)
+
+
 def test__atom_stereo_coordinates():
     """ test graph.atom_stereo_coordinates
     """
@@ -770,6 +1164,95 @@ def test__atom_stereo_coordinates():
         assert graph.set_stereo_from_atom_coordinates(cgr, atm_xyz_dct) == sgr
 
 
+def test__embed_atom_coordinates():
+    """ test graph.embed_atom_coordinates
+    """
+    cgr = graph.explicit(C7H12O_CGR)
+    lmat, umat = graph.distance_bounds_matrices(cgr)
+    assert numpy.all(lmat <= umat)
+    assert numpy.allclose(lmat, lmat.T) and numpy.allclose(umat, umat.T)
+
+    atm_xyz_dct = graph.embed_atom_coordinates(cgr)
+    atm_keys = sorted(graph.atoms(cgr))
+    xyzs = numpy.array([atm_xyz_dct[atm_key] for atm_key in atm_keys])
+    dmat = numpy.linalg.norm(xyzs[:, None] - xyzs[None, :], axis=-1)
+    for atm1_key, atm2_key in map(sorted, graph.bond_keys(cgr)):
+        idx1, idx2 = atm_keys.index(atm1_key), atm_keys.index(atm2_key)
+        assert (lmat[idx1, idx2] - 0.1 < dmat[idx1, idx2] <
+                umat[idx1, idx2] + 0.1)
+
+    # polycyclic stereomers are embedded with their stereo in place
+    for sgr in graph.stereomers(cgr):
+        atm_xyz_dct = graph.atom_stereo_coordinates(sgr)
+        assert graph.set_stereo_from_atom_coordinates(cgr, atm_xyz_dct) == sgr
+
+    # (the apex only becomes stereogenic once the ring fusion is assigned;
+    # the read-back never gives it a True parity, so those two stereomers
+    # only come back as one of the others)
+    cgr = graph.explicit(C4H5F_CGR)
+    sgrs = graph.stereomers(cgr)
+    assert len(sgrs) == 6
+    for sgr in sgrs:
+        atm_xyz_dct = graph.atom_stereo_coordinates(sgr)
+        if graph.atom_stereo_parities(sgr)[0] is not True:
+            assert graph.set_stereo_from_atom_coordinates(
+                cgr, atm_xyz_dct) == sgr
+        else:
+            assert graph.set_stereo_from_atom_coordinates(
+                cgr, atm_xyz_dct) in sgrs
+
+
+def test__set_stereo_from_atom_coordinates():
+    """ test graph.set_stereo_from_atom_coordinates
+    """
+    # two disconnected stereomers are assigned independently
+    sgr1, sgr2 = map(graph.explicit, C3H3CL2F3_SGRS[:2])
+    sgr2 = graph.relabel(sgr2, {key: key + 100 for key in graph.atoms(sgr2)})
+    sgr = graph.union(sgr1, sgr2)
+    atm_xyz_dct = graph.atom_stereo_coordinates(sgr1)
+    atm_xyz_dct.update(graph.atom_stereo_coordinates(sgr2))
+    cgr = graph.without_stereo_parities(sgr)
+    assert graph.set_stereo_from_atom_coordinates(cgr, atm_xyz_dct) == sgr
+
+
+def test__conformer_stereo_parities():
+    """ test graph.conformer_stereo_parities
+    """
+    sgrs = tuple(map(graph.explicit, C3H3CL2F3_SGRS))
+    cgr = graph.without_stereo_parities(sgrs[0])
+    atm_keys = sorted(graph.atoms(cgr))
+    xyzs = [[graph.atom_stereo_coordinates(sgr)[atm_key]
+             for atm_key in atm_keys] for sgr in sgrs]
+    atm_par_dct, bnd_par_dct = graph.conformer_stereo_parities(cgr, xyzs)
+    assert not bnd_par_dct
+
+    # (some of these stereomers leave one of the centers unassigned)
+    par_code_dct = {None: -1, False: 0, True: 1}
+    for atm_key, pars in atm_par_dct.items():
+        assert list(pars) == [
+            par_code_dct[graph.atom_stereo_parities(sgr)[atm_key]]
+            for sgr in sgrs]
+
+
+def test__atom_longest_chains():
+    """ test graph.atom_longest_chains
+    """
+    assert graph.atom_longest_chains(C8H13O_CGR) == {
+        0: (0, 3, 5, 7, 6, 4, 1), 1: (1, 4, 6, 7, 5, 3, 0),
+        2: (2, 6, 7, 5, 3, 0), 3: (3, 5, 7, 6, 4, 1),
+        4: (4, 6, 7, 5, 3, 0), 5: (5, 7, 6, 4, 1), 6: (6, 7, 5, 3, 0),
+        7: (7, 5, 3, 0), 8: (8, 7, 5, 3, 0)}
+
+    # with rings
+    assert graph.atom_longest_chains(C5H5N5O_CGR) == {
+        0: (0, 6, 1, 2, 8, 4, 9, 3, 7), 1: (1, 6, 0, 7, 3, 9, 4, 8, 2, 5),
+        2: (2, 8, 4, 9, 3, 1, 6, 0, 7), 3: (3, 9, 4, 8, 2, 1, 6, 0, 7),
+        4: (4, 8, 2, 1, 6, 0, 7, 3, 9), 5: (5, 2, 1, 6, 0, 7, 3, 9, 4, 8),
+        6: (6, 0, 7, 3, 1, 2, 8, 4, 9), 7: (7, 0, 6, 1, 3, 9, 4, 8, 2, 5),
+        8: (8, 2, 1, 6, 0, 7, 3, 9, 4, 10), 9: (9, 3, 7, 0, 6, 1, 2, 8, 4, 10),
+        10: (10, 4, 8, 2, 1, 6, 0, 7, 3, 9)}
+
+
 def test__trans__hydrogen_migration():
     """ test graph.trans.hydrogen_migration
     """
@@ -866,6 +1349,38 @@ def test__trans__hydrogen_abstraction():
     assert graph.backbone_isomorphic(graph.trans.apply(tra, cgr2), cgr1)
 
 
+def test__trans__classify():
+    """ test graph.trans.classify
+    """
+    cgr1 = ({0: ('C', 1, None), 1: ('C', 1, None), 2: ('C', 1, None),
+             3: ('C', 1, None), 4: ('F', 0, None), 5: ('F', 0, None),
+             6: ('O', 1, None)},
+            {frozenset({0, 1}): (1, None), frozenset({0, 2}): (1, None),
+             frozenset({2, 4}): (1, None), frozenset({3, 5}): (1, None),
+             frozenset({1, 3}): (1, None)})
+    cgr2 = ({0: ('C', 1, None), 1: ('C', 1, None), 2: ('C', 1, None),
+             3: ('C', 1, None), 4: ('F', 0, None), 5: ('F', 0, None),
+             6: ('O', 1, None)},
+            {frozenset({0, 1}): (1, None), frozenset({0, 2}): (1, None),
+             frozenset({3, 6}): (1, None), frozenset({2, 4}): (1, None),
+             frozenset({3, 5}): (1, None), frozenset({1, 3}): (1, None)})
+
+    cgr1 = graph.explicit(cgr1)
+    cgr2 = graph.explicit(cgr2)
+
+    cls_dct = graph.trans.classify(cgr1, cgr2)
+    assert set(cls_dct) == {'addition'}
+    assert cls_dct['addition'] == graph.trans.addition(cgr1, cgr2)
+
+    cls_dct = graph.trans.classify(cgr2, cgr1)
+    assert 'beta_scission' in cls_dct
+    tra = cls_dct['beta_scission']
+    assert graph.backbone_isomorphic(graph.trans.apply(tra, cgr2), cgr1)
+
+    # the two sides differ in formula, so nothing is tried
+    assert not graph.trans.classify(cgr1, graph.explicit(C3H3_CGR))
+
+
 def test__trans__form_dummy_bonds():
     """ test graph.trans.from_dummy_bonds
     """
@@ -936,6 +1451,80 @@ def test__trans__is_stereo_compatible():
         print(graph.trans.is_stereo_compatible(tra, sgr1, sgr2))
 
 
+def test__cache():
+    """ test graph.enable_cache
+    """
+    graph.enable_cache(maxsize=2)
+    try:
+        assert graph.cache_enabled()
+        unsat_vlc_dct = graph.atom_unsaturated_valences(C8H13O_CGR)
+        unsat_vlc_dct[0] = None
+        assert graph.atom_unsaturated_valences(C8H13O_CGR) == {
+            0: 0, 1: 1, 2: 0, 3: 1, 4: 1, 5: 1, 6: 0, 7: 0, 8: 1}
+        assert graph.cache_info().hits == 1
+
+        # the ring cache only depends on the connectivity
+        graph.rings_bond_keys(C8H13O_CGR)
+        graph.rings_bond_keys(C8H13O_RGR)
+        assert graph.cache_info().hits == 2
+        assert graph.cache_info().currsize == 2
+
+        graph.connected_components(C8H13O_CGR)
+        assert graph.cache_info().currsize == 2
+
+        graph.clear_cache()
+        assert graph.cache_info() == (0, 0, 2, 0)
+    finally:
+        graph.disable_cache()
+    assert not graph.cache_enabled()
+
+
+def test__array__from_graph():
+    """ test graph.array.from_graph
+    """
+    for sgr in (C8H13O_SGR, graph.explicit(C8H13O_SGR), ({}, {})):
+        agr = graph.array.from_graph(sgr)
+        assert graph.array.to_graph(agr) == sgr
+
+    agr = graph.array.from_graph(C8H13O_SGR)
+    assert graph.array.atom_count(agr) == 9
+    assert graph.array.bond_count(agr) == 8
+    assert list(graph.array.atomic_numbers(agr)) == [6] * 8 + [8]
+    assert list(graph.array.atom_stereo_parities(agr)) == (
+        [-1] * 6 + [0, 0, -1])
+    assert list(graph.array.atom_degrees(agr)) == [1, 1, 1, 2, 2, 2, 3, 3, 1]
+    assert set(graph.array.atom_neighbor_indices(agr, 7)) == {5, 6, 8}
+
+
+def test__array__atom_unsaturated_valences():
+    """ test graph.array.atom_unsaturated_valences
+    """
+    for cgr in (C8H13O_CGR, graph.explicit(C8H13O_CGR)):
+        agr = graph.array.from_graph(cgr)
+        atm_keys = graph.array.atom_keys(agr)
+        assert (dict(zip(atm_keys, graph.array.atom_unsaturated_valences(agr)))
+                == graph.atom_unsaturated_valences(cgr))
+        assert (graph.array.maximum_spin_multiplicity(agr) ==
+                graph.maximum_spin_multiplicity(cgr))
+
+
+def test__array__batch_valences():
+    """ test graph.array.from_graphs
+    """
+    cgrs = (C8H13O_CGR, graph.explicit(C8H13O_CGR), ({}, {}), C2H2CL2F2_CGR)
+    bgr = graph.array.from_graphs(cgrs)
+    assert graph.array.graph_count(bgr) == 4
+    assert (list(graph.array.maximum_spin_multiplicities_batch(bgr)) ==
+            list(map(graph.maximum_spin_multiplicity, cgrs)))
+
+    atm_unsat_vlcs_lst = graph.array.split_atom_values(
+        bgr, graph.array.atom_unsaturated_valences_batch(bgr))
+    for cgr, atm_unsat_vlcs in zip(cgrs, atm_unsat_vlcs_lst):
+        atm_unsat_vlc_dct = graph.atom_unsaturated_valences(cgr)
+        assert (list(atm_unsat_vlcs) ==
+                [atm_unsat_vlc_dct[key] for key in sorted(cgr[0])])
+
+
 if __name__ == '__main__':
     # test__from_data()
     # test__set_atom_implicit_hydrogen_valences()
@@ -354,6 +354,14 @@ def test__torsional_symmetry_numbers():
         1, 1)
 
 
+def test__rotors_batch():
+    """ test zmatrix.rotors_batch
+    """
+    rot_dct, = zmatrix.rotors_batch([CH4O_ZMA], nprocs=1)
+    assert ({bnd_key: rot.symmetry_number
+             for bnd_key, rot in rot_dct.items()} == {frozenset({1, 2}): 3})
+
+
 def test__samples():
     """ test zmatrix.samples
     """
@@ -43,6 +43,7 @@ from automol.zmatrix._zmatrix import almost_equal
 from automol.zmatrix._zmatrix import samples
 # z-matrix torsional degrees of freedom
 from automol.zmatrix._zmatrix import torsional_symmetry_numbers
+from automol.zmatrix._zmatrix import rotors_batch
 from automol.zmatrix._zmatrix import torsional_sampling_ranges
 from automol.zmatrix._zmatrix import torsional_scan_linspaces
 
@@ -155,6 +156,7 @@ __all__ = [
     'samples',
     # z-matrix torsional degrees of freedom
     'torsional_symmetry_numbers',
+    'rotors_batch',
     'torsional_sampling_ranges',
     'torsional_scan_linspaces',
 
@@ -601,6 +601,18 @@ def torsional_symmetry_numbers(zma, tors_names, frm_bnd_key=None, brk_bnd_key=No
     return tors_sym_nums
 
 
+def rotors_batch(zmas, with_h_rotors=True, nprocs=1):
+    """ rotors, by bond, for each z-matrix in a series
+
+    (see `automol.graph.rotors_batch`; bonds are keyed as for
+    `torsional_symmetry_numbers`)
+    """
+    gras = [automol.convert.zmatrix.graph(zma, remove_stereo=True)
+            for zma in zmas]
+    return automol.graph.rotors_batch(gras, with_h_rotors=with_h_rotors,
+                                      nprocs=nprocs)
+
+
 def _dihedral_edge_keys(zma):
     """ dihedral bonds, by name
     """